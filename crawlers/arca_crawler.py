@@ -3,7 +3,6 @@ import re
 import time
 import logging
 import pandas as pd
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
@@ -11,7 +10,17 @@ from selenium.common.exceptions import TimeoutException, WebDriverException
 from datetime import datetime
 
 # .utils 모듈에서 필요한 함수들 임포트
-from .utils import setup_driver, save_to_csv, clean_title, result_csv_data
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import checkpoint
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .html_parser import parse_soup
+from . import dates
+
+# 작성일: 상세 'YYYY-MM-DD HH:MM:SS'(날짜 부분) / 목록 'YYYY.MM.DD', 오늘 글은 'HH:MM'
+ARCA_DATE = dates.DateParser('arca', '%Y-%m-%d', '%Y.%m.%d')
 
 
 def arca_crw(wd, url, search, target_date):
@@ -28,7 +37,7 @@ def arca_crw(wd, url, search, target_date):
         # 본문이 로딩될 때까지 대기
         WebDriverWait(wd, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'article-body')))
         time.sleep(1)
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
+        soup = parse_soup(wd.page_source)
 
         # 리스트 초기화
         search_word_list = []
@@ -76,7 +85,7 @@ def arca_crw(wd, url, search, target_date):
         try:
             date_str = soup.find('div', class_='info-row').find('time').get_text()
             # "2023-10-25 14:30:00" 같은 형식일 경우 앞부분만 자름
-            date_obj = datetime.strptime(date_str.split()[0], '%Y-%m-%d')
+            date_obj = ARCA_DATE.parse(date_str.split()[0])
             date_list.append(date_obj)
             logging.info(f"날짜 추출 성공: {date_str}")
         except Exception as e:
@@ -141,6 +150,9 @@ def arca_main_crw(searchs, start_date, end_date, stop_event):
     # 3. 로그 설정
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
+
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', '아카라이브', f'아카라이브_raw_{target_date}.csv'))
     
     logging.basicConfig(
         filename=os.path.join(log_dir, f'아카라이브_log_{target_date}.txt'),
@@ -154,19 +166,22 @@ def arca_main_crw(searchs, start_date, end_date, stop_event):
     logging.info(f"            아카라이브 크롤링 시작(Date: {target_date})")
     logging.info(f"========================================================")
     
-    wd = setup_driver()
-    wd_dp1 = setup_driver()
+    wd = acquire_driver(role='detail')
+    wd_dp1 = acquire_driver(role='list')
     
     for search in searchs:
         if stop_event.is_set():
             print("🛑 크롤링 중단됨")
             break
-        page_num = 1
-        time.sleep(1)
+        if checkpoint.is_done(search):
+            continue
+        page_num = checkpoint.resume_page(search)
         
+        failed = False
         while True:
             if stop_event.is_set():
                 break
+            checkpoint.advance(search, page_num)
             try:
                 logging.info(f"크롤링 시작-검색어: {search}")
                 # 아카라이브 검색 URL (p=페이지번호)
@@ -176,7 +191,7 @@ def arca_main_crw(searchs, start_date, end_date, stop_event):
                 WebDriverWait(wd_dp1, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'article-list')))
                 time.sleep(1)
 
-                soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
+                soup_dp1 = parse_soup(wd_dp1.page_source)
 
                 # 검색결과 리스트
                 tr_tags = soup_dp1.find('div', class_='list-table table').find_all('a', class_='vrow column')
@@ -191,11 +206,8 @@ def arca_main_crw(searchs, start_date, end_date, stop_event):
                     after_start_date = False 
                     try:
                         date_str = tr.find('span', class_='vcol col-time').find('time').text
-                        # 날짜 처리 (오늘 글 등)
-                        if ':' in date_str: 
-                             date = datetime.now().date()
-                        else:
-                             date = datetime.strptime(date_str, '%Y.%m.%d').date()
+                        # 오늘 글은 'HH:MM'으로 표시 (DateParser가 오늘 날짜로 해석)
+                        date = ARCA_DATE.date(date_str)
                         logging.info(f"날짜 찾음: {date}")
                     except Exception as e:
                         logging.error(f"날짜 오류 발생: {e}")
@@ -211,6 +223,15 @@ def arca_main_crw(searchs, start_date, end_date, stop_event):
                     logging.info(f"url 찾음.")
                     
                     # [핵심] 함수 호출 시 target_date 전달
+                    # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                    if seen_urls.should_skip(url, search):
+                        if seen_urls.reached_known_run(search):
+                            after_start_date = True
+                            break
+                        continue
+                    # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+                    if post_cache.reuse(url, search):
+                        continue
                     arca_crw(wd, url, search, target_date)
 
                 if after_start_date:
@@ -221,20 +242,16 @@ def arca_main_crw(searchs, start_date, end_date, stop_event):
             except Exception as e:
                 print(f"오류 발생: {e}")
                 logging.error(f"오류 발생: {e}")
+                failed = True
                 break
+
+        if failed:
+            checkpoint.pause(search)
+        elif not stop_event.is_set():
+            checkpoint.finish(search)
                 
-    wd.quit()
-    wd_dp1.quit()
-   
-    if not stop_event.is_set():
-        # [핵심] 결과 저장 폴더 절대 경로 생성
-        # data/raw 폴더가 아니라 별도의 '결과' 폴더를 원하신다면 아래 경로를 사용
-        result_dir = os.path.join(project_root, '결과', '아카라이브')
-        os.makedirs(result_dir, exist_ok=True)
-
-        all_data = pd.concat([
-            result_csv_data(search, platform='아카라이브', subdir=f'9.아카라이브/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-
-        all_data.to_csv(os.path.join(result_dir, f'아카라이브_raw_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+    release_driver(wd)
+    release_driver(wd_dp1)
+
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
@@ -3,46 +3,31 @@ import re
 import time
 import logging
 import pandas as pd
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from datetime import datetime
 
-from .utils import setup_driver, save_to_csv, clean_title, result_csv_data
-
-def parse_blind_date(date_str, current_year=2025):
-    from datetime import datetime, timedelta
-    date_str = date_str.strip()
-    date_str = date_str.replace("작성시간", "").replace("작성일", "").strip()
-    if date_str.endswith('.'):
-        date_str = date_str[:-1]
-
-    now = datetime.now()
-    if '시간' in date_str:
-        hours = int(date_str.replace('시간', '').strip())
-        return (now - timedelta(hours=hours)).date()
-    elif '일' in date_str:
-        days = int(date_str.replace('일', '').strip())
-        return (now - timedelta(days=days)).date()
-    elif '주' in date_str:
-        weeks = int(date_str.replace('주', '').strip())
-        return (now - timedelta(weeks=weeks)).date()
-    elif '달' in date_str:
-        months = int(date_str.replace('달', '').strip())
-        return (now - timedelta(days=months * 30)).date()
-    elif date_str.count('.') == 1:
-        try:
-            month, day = date_str.split('.')
-            return datetime.strptime(f"{current_year}-{month.zfill(2)}-{day.zfill(2)}", "%Y-%m-%d").date()
-        except:
-            return None
-    elif date_str.count('.') == 2:
-        try:
-            return datetime.strptime(date_str, '%Y.%m.%d').date()
-        except:
-            return None
-    return None
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import checkpoint
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .dom_extract import IncrementalList
+from .html_parser import parse_soup
+from . import dates
+
+# 목록 작성일: '3시간', '2일', '1주', '1달' (상대 시간) / '01.19' (올해) / '2024.01.19'
+BLIND_DATE = dates.DateParser('blind', '%Y.%m.%d')
+
+# 검색 목록 (스크롤할 때마다 새로 붙은 게시물만 추출)
+BLIND_LIST_ITEMS = 'div.article-list div.article-list-pre'
+BLIND_LIST_FIELDS = {
+    'date': ('div.info_fnc a.past', None),
+    'href': ('div.tit h3 a', 'href'),
+}
+
 
 def blind_crw(wd, url, search, target_date):
     try:
@@ -50,9 +35,8 @@ def blind_crw(wd, url, search, target_date):
         wd.set_page_load_timeout(10)
         wd.get(f'{url}')
         logging.info(f"접속: {url}")
-        time.sleep(2)
         WebDriverWait(wd, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'contents')))
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
+        soup = parse_soup(wd.page_source)
 
         search_word_list = []
         search_plt_list = []
@@ -83,11 +67,9 @@ def blind_crw(wd, url, search, target_date):
         search_word_list.append(search)
 
         date_tag = soup.find('div', class_='wrap-info').find('span', class_='date').text.strip()
-        date_only = date_tag.replace('작성일', '').strip()
-        month, day = date_only.split('.')
-        formatted_date = f"2024-{month.zfill(2)}-{day.zfill(2)}"
-        date_list.append(formatted_date)
-        logging.info(f"날짜 추출 성공: {formatted_date}")
+        date = BLIND_DATE.parse(date_tag.replace('작성일', '').strip().rstrip('.'))
+        date_list.append(date)
+        logging.info(f"날짜 추출 성공: {date}")
 
         writer = soup.find('div', class_='name').text.strip()
         writert_strip = ' '.join(writer.split())
@@ -127,6 +109,9 @@ def blind_main_crw(searchs, start_date, end_date, stop_event):
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
 
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', '블라인드', f'블라인드_raw data_{target_date}.csv'))
+
     logging.basicConfig(
         filename=os.path.join(log_dir, f'블라인드_log_{target_date}.txt'),
         level=logging.INFO,
@@ -139,18 +124,19 @@ def blind_main_crw(searchs, start_date, end_date, stop_event):
     logging.info(f"            블라인드 크롤링 시작 (Date: {target_date})")
     logging.info(f"========================================================")
 
-    wd_dp1 = setup_driver()
-    wd = setup_driver()
+    wd_dp1 = acquire_driver(role='list')
+    wd = acquire_driver(role='detail')
     wd_dp1.maximize_window()
     wd.maximize_window()
 
-    current_year = 2025
     MAX_SCROLL_COUNT = 50
 
     for search in searchs:
         if stop_event.is_set():
             print("🛑 크롤링 중단됨")
             break
+        if checkpoint.is_done(search):
+            continue
         collected_urls = set()
         logging.info(f"[{search}] 크롤링 시작")
 
@@ -171,6 +157,7 @@ def blind_main_crw(searchs, start_date, end_date, stop_event):
 
         scroll_count = 0
         after_start_date = False
+        listing = IncrementalList(wd_dp1, BLIND_LIST_ITEMS, BLIND_LIST_FIELDS)
 
         while scroll_count < MAX_SCROLL_COUNT and not after_start_date:
             if stop_event.is_set():
@@ -178,25 +165,18 @@ def blind_main_crw(searchs, start_date, end_date, stop_event):
             prev_height = wd_dp1.execute_script("return document.body.scrollHeight")
             time.sleep(2)
 
-            soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
-            article_list_div = soup_dp1.find('div', class_='article-list')
-            if not article_list_div:
-                break
-            
-            div_tags = article_list_div.find_all('div', class_=re.compile(r'\barticle-list-pre\b'))
-            if not div_tags:
+            # 지난 스크롤 이후 새로 붙은 게시물만 추출
+            div_tags = listing.new_items()
+            if not listing.total:
                 break
 
             for div in div_tags:
                 if stop_event.is_set():
                     break
-                info_div = div.find('div', class_='info_fnc')
-                if not info_div: continue
-                date_anchor = info_div.find('a', class_='past')
-                if not date_anchor: continue
+                if not div['date']: continue
 
-                date_str = date_anchor.text.strip()
-                parsed_date = parse_blind_date(date_str, current_year)
+                date_str = div['date'].replace("작성시간", "").replace("작성일", "").strip().rstrip('.')
+                parsed_date = BLIND_DATE.date(date_str, default=None)
                 if not parsed_date: continue
                 
                 date_txt = parsed_date
@@ -208,13 +188,20 @@ def blind_main_crw(searchs, start_date, end_date, stop_event):
                     after_start_date = True
                     break
 
-                try:
-                    post_url = div.find('div', class_='tit').find('h3').find('a')['href']
-                    full_url = 'https://www.teamblind.com' + post_url
-                except Exception as e:
-                    logging.warning(f"[{search}] URL 추출 실패: {e}")
+                if not div['href']:
+                    logging.warning(f"[{search}] URL 추출 실패")
                     continue
+                full_url = 'https://www.teamblind.com' + div['href']
 
+                # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                if seen_urls.should_skip(full_url, search):
+                    if seen_urls.reached_known_run(search):
+                        after_start_date = True
+                        break
+                    continue
+                # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+                if post_cache.reuse(full_url, search):
+                    continue
                 if full_url not in collected_urls:
                     collected_urls.add(full_url)
                     blind_crw(wd, full_url, search, target_date)
@@ -226,15 +213,11 @@ def blind_main_crw(searchs, start_date, end_date, stop_event):
                 break
             scroll_count += 1
 
-    wd.quit()
-    wd_dp1.quit()
-    
-    if not stop_event.is_set():
-        result_dir = os.path.join(project_root, '결과', '블라인드')
-        os.makedirs(result_dir, exist_ok=True)
-
-        all_data = pd.concat([
-            result_csv_data(search, platform='블라인드', subdir=f'20.블라인드/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-        all_data.to_csv(os.path.join(result_dir, f'블라인드_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+        if not stop_event.is_set():
+            checkpoint.finish(search)
+
+    release_driver(wd)
+    release_driver(wd_dp1)
+
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
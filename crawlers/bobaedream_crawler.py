@@ -3,14 +3,23 @@ import re
 import time
 import logging
 import pandas as pd
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from datetime import datetime
 
-from .utils import setup_driver, save_to_csv, clean_title, result_csv_data
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import checkpoint
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .html_parser import parse_soup
+from . import dates
+
+# 작성일: 상세 'YYYY.MM.DD' / 검색 목록 'YY. MM. DD'
+BOBAEDREAM_DATE = dates.DateParser('bobaedream', '%Y.%m.%d', '%y. %m. %d')
 
 
 def bobaedream_crw(wd, url, search, target_date):
@@ -19,9 +28,8 @@ def bobaedream_crw(wd, url, search, target_date):
         wd.set_page_load_timeout(10)
         wd.get(f'{url}')
         logging.info(f"접속: {url}")
-        time.sleep(1)
         WebDriverWait(wd, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'content02')))
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
+        soup = parse_soup(wd.page_source)
 
         search_word_list = []
         search_plt_list = []
@@ -48,7 +56,7 @@ def bobaedream_crw(wd, url, search, target_date):
 
         date_str_tag = soup.find('div', class_='writerProfile').find('span', class_='countGroup').text
         date_str = re.search(r'\d{4}\.\d{2}\.\d{2}', date_str_tag).group()
-        date = datetime.strptime(date_str, '%Y.%m.%d')
+        date = BOBAEDREAM_DATE.parse(date_str)
         date_list.append(date)
         logging.info(f"날짜 추출 성공: {date_str}")
 
@@ -89,6 +97,9 @@ def bobaedream_main_crw(searchs, start_date, end_date, stop_event):
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
 
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', '보배드림', f'보배드림_raw data_{target_date}.csv'))
+
     logging.basicConfig(
         filename=os.path.join(log_dir, f'보배드림_log_{target_date}.txt'),
         level=logging.INFO,
@@ -101,14 +112,17 @@ def bobaedream_main_crw(searchs, start_date, end_date, stop_event):
     logging.info(f"            보배드림 크롤링 시작 (Date: {target_date})")
     logging.info(f"========================================================")
     
-    wd = setup_driver()
-    wd_dp1 = setup_driver()
+    wd = acquire_driver(role='detail')
+    wd_dp1 = acquire_driver(role='list')
 
     for search in searchs:
         if stop_event.is_set():
             print("🛑 크롤링 중단됨")
             break
+        if checkpoint.is_done(search):
+            continue
         page_num = 1
+        failed = False
         while True:
             if stop_event.is_set():
                 break
@@ -133,7 +147,7 @@ def bobaedream_main_crw(searchs, start_date, end_date, stop_event):
                 community_btn.click()
                 time.sleep(1)
                 WebDriverWait(wd_dp1, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'search_Community')))
-                soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
+                soup_dp1 = parse_soup(wd_dp1.page_source)
 
                 li_tags = soup_dp1.find('div', class_='search_Community').find_all('li')
                 
@@ -147,8 +161,7 @@ def bobaedream_main_crw(searchs, start_date, end_date, stop_event):
 
                         try:
                             date_str = li.find('dd', class_='path').find_all('span', class_='next')[1].text
-                            date_str = '20' + date_str
-                            date = datetime.strptime(date_str, '%Y. %m. %d').date()
+                            date = BOBAEDREAM_DATE.date(date_str)
                             logging.info(f"날짜 찾음 : {date}")
                         except Exception as e:
                             logging.error(f"날짜 오류 발생: {e}")
@@ -162,6 +175,15 @@ def bobaedream_main_crw(searchs, start_date, end_date, stop_event):
 
                         url = 'https://www.bobaedream.co.kr' + li.find('dt').find('a').get('href')
                         logging.info(f"url 찾음.")
+                        # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                        if seen_urls.should_skip(url, search):
+                            if seen_urls.reached_known_run(search):
+                                after_start_date = True
+                                break
+                            continue
+                        # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+                        if post_cache.reuse(url, search):
+                            continue
                         bobaedream_crw(wd, url, search, target_date)
 
                     if after_start_date:
@@ -171,7 +193,7 @@ def bobaedream_main_crw(searchs, start_date, end_date, stop_event):
                             wd_dp1.find_element(By.CSS_SELECTOR, "a.next").click()
                             time.sleep(1)
                             WebDriverWait(wd_dp1, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'search_Community')))
-                            soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
+                            soup_dp1 = parse_soup(wd_dp1.page_source)
                             li_tags = soup_dp1.find('div', class_='search_Community').find_all('li')
                             logging.info("다음 페이지로 이동 및 파싱 완료")
                         except Exception as e:
@@ -181,17 +203,16 @@ def bobaedream_main_crw(searchs, start_date, end_date, stop_event):
 
             except Exception as e:
                 logging.error(f"오류 발생: {e}")
+                failed = True
                 break
 
-    wd.quit()
-    wd_dp1.quit()
-    
-    if not stop_event.is_set():
-        result_dir = os.path.join(project_root, '결과', '보배드림')
-        os.makedirs(result_dir, exist_ok=True)
-
-        all_data = pd.concat([
-            result_csv_data(search, platform='보배드림', subdir=f'8.보배드림/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-        all_data.to_csv(os.path.join(result_dir, f'보배드림_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+        if failed:
+            checkpoint.pause(search)
+        elif not stop_event.is_set():
+            checkpoint.finish(search)
+
+    release_driver(wd)
+    release_driver(wd_dp1)
+
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
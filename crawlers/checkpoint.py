@@ -0,0 +1,197 @@
+import os
+import json
+import logging
+import threading
+from datetime import datetime
+
+from . import csv_writer
+
+# 사이트별 진행 위치 저장 위치: data/checkpoint/<사이트>_<시작일>_<종료일>.json
+CHECKPOINT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'checkpoint'))
+# [설정] 0이면 체크포인트를 읽지 않고 항상 첫 검색어/1페이지부터 시작 (기록은 계속함)
+RESUME = os.getenv("CRAWL_RESUME", "1") == "1"
+
+
+class CheckpointStore:
+    """
+    같은 수집 기간으로 다시 실행될 때(무응답 감시 종료, Airflow 재시도) 이어서 수집하기 위한 진행 위치
+    - done: 목록 탐색을 끝까지 마친 검색어
+    - cursor: 진행 중인 검색어의 다음에 열 목록 페이지 (+ 검색어 순번, 마지막으로 넘긴 게시물)
+    - paused: 목록 페이지 오류로 중간에 멈춘 검색어 -> 다시 열 페이지 (다음 검색어로 넘어가도 남음)
+    - 저장된 cursor는 기록기가 그 이전 페이지의 행을 디스크에 다 쓴 뒤에만 옮겨짐
+      (기록을 기다리는 위치는 메모리에만 두므로 체크포인트 이전 구간은 항상 디스크에 있고, 페이지마다 강제로 기록하지 않음)
+    """
+
+    def __init__(self, site_name, start_date, end_date, searchs=(), base_dir=CHECKPOINT_DIR):
+        os.makedirs(base_dir, exist_ok=True)
+        self.searchs = [str(search) for search in searchs]
+        self.path = os.path.join(base_dir, f'{site_name}_{start_date:%y%m%d}_{end_date:%y%m%d}.json')
+        self._lock = threading.Lock()
+        self._state = {"done": [], "cursor": {}}
+        self._pending = []  # (기록기 위치, cursor) - 그 위치까지 기록되면 cursor로 저장
+        if RESUME and os.path.isfile(self.path):
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning(f"체크포인트 읽기 실패, 처음부터 수집: {self.path} ({e})")
+
+    def is_done(self, search):
+        with self._lock:
+            return str(search) in self._state["done"]
+
+    def resume_page(self, search, default):
+        with self._lock:
+            cursor = self._state["cursor"]
+            if cursor.get("search") != str(search):
+                return self._state.get("paused", {}).get(str(search), default)
+            return cursor.get("page", default)
+
+    def advance(self, search, page, last_url=None, position=0, flushed=0):
+        search = str(search)
+        cursor = {
+            "search": search,
+            "search_index": self.searchs.index(search) if search in self.searchs else None,
+            "page": page,
+            "last_url": last_url,
+        }
+        with self._lock:
+            self._pending.append((position, cursor))
+            self._commit(flushed)
+
+    def flushed(self, position):
+        with self._lock:
+            self._commit(position)
+
+    def _commit(self, flushed):
+        # 기록이 끝난 위치 중 가장 최근 것만 저장 (그 뒤 위치는 다음 기록을 기다림)
+        ready = [cursor for position, cursor in self._pending if position <= flushed]
+        if not ready:
+            return
+        self._pending = [(position, cursor) for position, cursor in self._pending if position > flushed]
+        self._state["cursor"] = ready[-1]
+        self._save()
+
+    def pause(self, search):
+        with self._lock:
+            cursor = self._state["cursor"]
+            if cursor.get("search") != str(search):
+                return None
+            self._state.setdefault("paused", {})[str(search)] = cursor.get("page")
+            self._save()
+            return cursor.get("page")
+
+    def finish(self, search):
+        with self._lock:
+            if str(search) not in self._state["done"]:
+                self._state["done"].append(str(search))
+            self._state.get("paused", {}).pop(str(search), None)
+            self._pending = [(position, cursor) for position, cursor in self._pending if cursor["search"] != str(search)]
+            if self._state["cursor"].get("search") == str(search):
+                self._state["cursor"] = {}
+            self._save()
+
+    def _save(self):
+        """임시 파일에 쓴 뒤 os.replace로 교체 (중간에 종료돼도 이전 체크포인트가 남음)"""
+        self._state["updated_at"] = datetime.now().isoformat(timespec='seconds')
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        with self._lock:
+            self._state = {"done": [], "cursor": {}}
+            if os.path.isfile(self.path):
+                os.remove(self.path)
+
+
+# 크롤러 프로세스(사이트)당 하나의 체크포인트 (열려있지 않으면 모든 함수가 기본값/아무것도 하지 않음)
+_store = None
+
+
+def open_store(site_name, start_date, end_date, searchs=()):
+    global _store
+    _store = CheckpointStore(site_name, start_date, end_date, searchs)
+    csv_writer.on_flush(_on_flush)
+    return _store
+
+
+def _on_flush(position):
+    if _store is None:
+        return
+    try:
+        _store.flushed(position)
+    except OSError as e:
+        logging.warning(f"체크포인트 저장 실패: {e}")
+
+
+def close_store(completed=False):
+    """completed=True: 사이트 수집을 끝까지 마쳤으므로 체크포인트 삭제 (같은 기간 재실행은 처음부터)"""
+    global _store
+    if _store is not None and completed:
+        _store.clear()
+    _store = None
+
+
+def is_done(search):
+    """이전 실행에서 목록 탐색을 끝낸 검색어면 True"""
+    if _store is None or not _store.is_done(search):
+        return False
+    logging.info(f"[{search}] 이전 실행에서 수집 완료 -> 건너뜀")
+    return True
+
+
+def resume_page(search, default=1):
+    """진행 중이던 검색어면 이어서 열 페이지, 아니면 default"""
+    if _store is None:
+        return default
+    page = _store.resume_page(search, default)
+    if page != default:
+        logging.info(f"[{search}] 체크포인트에서 재개: {page}페이지")
+        print(f"↩️ [{search}] {page}페이지부터 재개")
+    return page
+
+
+def advance(search, page, last_url=None):
+    """
+    진행 위치를 page로 옮김 (목록 페이지를 열기 직전에 호출)
+    - 이전 페이지까지 버퍼에 쌓인 행이 기록기의 행 수/시간 기준으로 디스크에 쓰인 뒤에 위치가 저장됨
+    """
+    if _store is None:
+        return
+    position = csv_writer.position()
+    try:
+        _store.advance(search, page, last_url, position, csv_writer.flushed_position())
+    except OSError as e:
+        logging.warning(f"체크포인트 저장 실패: {e}")
+
+
+def pause(search):
+    """
+    목록 페이지 오류(시간 초과, 캡차 등)로 검색어 탐색을 멈춤
+    - 완료로 표시하지 않고 실패한 페이지를 검색어별로 남겨 다음 실행에서 그 페이지부터 다시 수집
+    """
+    if _store is None:
+        return
+    csv_writer.flush()
+    try:
+        # 남은 행을 모두 기록했으므로 실패한 페이지까지 위치를 옮긴 뒤 멈춤
+        _store.flushed(csv_writer.flushed_position())
+        page = _store.pause(search)
+    except OSError as e:
+        logging.warning(f"체크포인트 저장 실패: {e}")
+        return
+    if page is not None:
+        logging.warning(f"[{search}] 목록 오류로 {page}페이지에서 멈춤 (다음 실행에서 재개)")
+
+
+def finish(search):
+    """검색어 하나의 목록 탐색 완료 (중단/오류로 빠져나온 경우에는 호출하지 않음)"""
+    if _store is None:
+        return
+    csv_writer.flush()
+    try:
+        _store.finish(search)
+    except OSError as e:
+        logging.warning(f"체크포인트 저장 실패: {e}")
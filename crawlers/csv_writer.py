@@ -0,0 +1,273 @@
+import os
+import time
+import logging
+import threading
+
+import pandas as pd
+
+from . import dates
+from . import metrics
+from . import progress
+from . import seen_urls
+from . import post_cache
+from . import raw_lake
+
+# [설정] 버퍼에 쌓인 행이 이 개수 이상이면 디스크에 기록
+FLUSH_ROWS = int(os.getenv("CRAWL_FLUSH_ROWS", "50"))
+# [설정] 마지막 기록 후 이 시간(초)이 지나면 행 수와 관계없이 기록
+FLUSH_SECONDS = float(os.getenv("CRAWL_FLUSH_SECONDS", "30"))
+
+
+def _write_rows(path, df):
+    """
+    배치 한 번을 파일에 기록
+    - 새 파일: 임시 파일에 헤더+행을 쓴 뒤 os.replace로 교체 (헤더만 있는 파일/반쯤 쓴 파일이 보이지 않음)
+    - 기존 파일: 배치 전체를 O_APPEND 한 번의 write로 이어 붙임 (행 중간이 끊긴 상태로 남지 않음)
+    """
+    is_new = not os.path.isfile(path) or os.path.getsize(path) == 0
+    data = df.to_csv(index=False, header=is_new).encode('utf-8')
+
+    if is_new:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return
+
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def normalize_dates(df):
+    """게시물 등록일자를 사이트와 관계없이 ISO-8601 문자열로 통일 (date/datetime/사이트별 문자열 -> 'YYYY-MM-DDTHH:MM:SS')"""
+    if "게시물 등록일자" not in df:
+        return df
+    df = df.copy()
+    df["게시물 등록일자"] = df["게시물 등록일자"].map(dates.to_iso)
+    return df
+
+
+class BatchCsvWriter:
+    """
+    크롤러 프로세스(사이트)당 하나의 CSV 배치 기록기
+    - save_to_csv로 들어온 행을 파일별로 모아 두었다가 행 수/시간 기준으로 한 번에 기록
+    - 검색어별 파일(data/raw/...)과 사이트 통합 결과 파일(결과/<사이트>)을 같은 배치에서 함께 기록하므로
+      크롤링이 끝난 뒤 검색어별 CSV를 다시 읽어 합칠 필요가 없음
+    """
+
+    def __init__(self, flush_rows=FLUSH_ROWS, flush_seconds=FLUSH_SECONDS):
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.result_file = None
+        self._buffers = {}  # 파일 경로 -> DataFrame 목록
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._ticker = None
+        # add() 호출 순번: 지금까지 들어온 위치 / 디스크 기록을 마친 위치 (체크포인트가 기록된 구간까지만 위치를 옮김)
+        self._added = 0
+        self._flushed = 0
+        self._listeners = []
+
+    def open_result(self, result_file):
+        self.flush()
+        with self._lock:
+            self.result_file = result_file
+
+    def _start_ticker(self):
+        # 새 행이 들어오지 않는 동안(긴 목록 탐색, 드라이버 대기)에도 시간 기준으로 기록
+        # - 포크된 사이트 프로세스 안에서 첫 행이 들어올 때 시작 (스레드는 fork로 복제되지 않음)
+        if self._ticker is not None and self._ticker.is_alive():
+            return
+        self._closed.clear()
+        self._ticker = threading.Thread(target=self._tick, name='csv-flush', daemon=True)
+        self._ticker.start()
+
+    def _tick(self):
+        interval = max(1.0, min(self.flush_seconds, 5.0))
+        while not self._closed.wait(interval):
+            with self._lock:
+                due = self._pending and time.monotonic() - self._last_flush >= self.flush_seconds
+            if due:
+                try:
+                    self.flush()
+                except Exception as e:
+                    logging.error(f"주기 기록 오류: {e}")
+
+    def close(self):
+        """남은 버퍼를 기록하고 주기 기록 스레드와 결과 파일 지정을 정리"""
+        self._closed.set()
+        self.open_result(None)
+
+    def position(self):
+        with self._lock:
+            return self._added
+
+    def flushed_position(self):
+        with self._lock:
+            return self._flushed
+
+    def on_flush(self, callback):
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def add(self, df, file_name):
+        if df.empty:
+            return
+        df = normalize_dates(df)
+        # 같은 실행 안에서 다른 검색어가 이 게시물을 재사용할 수 있도록 기록 전에 캐시에 등록
+        post_cache.remember(df, file_name)
+        with self._lock:
+            self._start_ticker()
+            self._buffers.setdefault(file_name, []).append(df)
+            self._pending += len(df)
+            self._added += 1
+            due = (self._pending >= self.flush_rows
+                   or time.monotonic() - self._last_flush >= self.flush_seconds)
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._write_lock:
+            with self._lock:
+                buffers, self._buffers = self._buffers, {}
+                self._pending = 0
+                self._last_flush = time.monotonic()
+                result_file = self.result_file
+                position = self._added
+            if not buffers:
+                return
+
+            # 디스크 기록 시간 (CSV + Parquet + 결과 파일)
+            with metrics.timer('save'):
+                batches = []
+                for file_name, frames in buffers.items():
+                    batch = pd.concat(frames, ignore_index=True)
+                    try:
+                        _write_rows(file_name, batch)
+                    except Exception as e:
+                        logging.error(f"파일 저장 오류 ({file_name}): {e}")
+                        continue
+                    batches.append(batch)
+                    # 같은 배치를 사이트/날짜 파티션 Parquet으로도 기록 (pyarrow가 없으면 건너뜀)
+                    try:
+                        raw_lake.write_batch(batch, file_name)
+                    except Exception as e:
+                        logging.warning(f"Parquet 기록 실패 ({file_name}): {e}")
+                    # CSV에 기록한 행 수는 Parquet 기록 성공 여부와 관계없이 남김 (병합 시 파티션이 빠짐없는지 비교)
+                    try:
+                        raw_lake.record_csv_rows(file_name, len(batch))
+                    except Exception as e:
+                        logging.warning(f"manifest 기록 실패 ({file_name}): {e}")
+                    # 디스크에 기록된 뒤에만 수집 완료로 표시 (중단 시 기록되지 않은 게시물은 다음 실행에서 다시 수집)
+                    progress.posts_saved(len(batch))
+                    metrics.count('posts_saved', len(batch))
+                    seen_urls.mark_saved(batch)
+                    print(f"저장완료 : {file_name} ({len(batch)}건)")
+
+                if result_file and batches:
+                    try:
+                        _write_rows(result_file, pd.concat(batches, ignore_index=True))
+                    except Exception as e:
+                        logging.error(f"결과 파일 저장 오류 ({result_file}): {e}")
+
+            with self._lock:
+                self._flushed = position
+            for callback in self._listeners:
+                try:
+                    callback(position)
+                except Exception as e:
+                    logging.warning(f"기록 완료 알림 오류: {e}")
+
+
+class CaptureWriter:
+    """파일에 쓰지 않고 저장된 행을 메모리에 모으는 기록기 (scripts/replay_parsers.py 리플레이용)"""
+
+    def __init__(self):
+        self.frames = []
+        self._lock = threading.Lock()
+
+    def open_result(self, result_file):
+        pass
+
+    def close(self):
+        pass
+
+    def position(self):
+        return 0
+
+    def flushed_position(self):
+        return 0
+
+    def on_flush(self, callback):
+        pass
+
+    def add(self, df, file_name):
+        if df.empty:
+            return
+        with self._lock:
+            self.frames.append(normalize_dates(df))
+
+    def flush(self):
+        pass
+
+    def take(self):
+        """지금까지 모은 행 목록을 꺼내고 비움"""
+        with self._lock:
+            frames, self.frames = self.frames, []
+        return frames
+
+
+# 크롤러 프로세스(사이트)당 하나의 기록기
+_writer = BatchCsvWriter()
+
+
+def capture():
+    """이 프로세스의 저장을 메모리 수집기로 교체 (CSV/Parquet/seen_urls에 기록하지 않음)"""
+    global _writer
+    _writer = CaptureWriter()
+    return _writer
+
+
+def open_result(result_file):
+    """사이트 통합 결과 파일 지정 (이후 저장되는 모든 행이 이 파일에도 이어서 기록됨)"""
+    _writer.open_result(result_file)
+
+
+def add(df, file_name):
+    _writer.add(df, file_name)
+
+
+def flush():
+    _writer.flush()
+
+
+def position():
+    """지금까지 add된 위치 (flushed_position()이 이 값 이상이 되면 그 전 행은 모두 디스크에 있음)"""
+    return _writer.position()
+
+
+def flushed_position():
+    return _writer.flushed_position()
+
+
+def on_flush(callback):
+    """기록을 마칠 때마다 callback(기록된 위치) 호출 (기록 스레드에서 호출됨)"""
+    _writer.on_flush(callback)
+
+
+def close():
+    """남은 버퍼를 기록하고 결과 파일 지정을 해제"""
+    _writer.close()
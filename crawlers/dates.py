@@ -0,0 +1,149 @@
+import re
+import threading
+from functools import lru_cache
+from datetime import datetime, date, timedelta
+
+from dateutil.relativedelta import relativedelta
+
+# 게시물 등록일자 저장 형식 (ISO-8601, 날짜만 있는 사이트는 00:00:00)
+# - process_data.py는 이 형식을 고정 포맷으로 먼저 읽고, 나머지(이전 수집분)만 format='mixed'로 읽음
+ISO_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+# 문자열로 들어온 등록일자를 ISO로 바꿀 때 시도하는 형식 (사이트별 상세 페이지 형식 모음)
+COMMON_FORMATS = (
+    ISO_FORMAT,
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%d',
+    '%Y.%m.%d %H:%M:%S',
+    '%Y.%m.%d %H:%M',
+    '%Y.%m.%d',
+    '%Y/%m/%d',
+    '%Y. %m. %d',
+    '%y.%m.%d',
+)
+
+# 상대 시간 표현 (블라인드 '3시간', 인스티즈 '3시간 전', '어제' 등)
+_RELATIVE = [
+    (re.compile(r'^(\d+)\s*분(?:\s*전)?$'), lambda n: timedelta(minutes=n)),
+    (re.compile(r'^(\d+)\s*시간(?:\s*전)?$'), lambda n: timedelta(hours=n)),
+    (re.compile(r'^(\d+)\s*일(?:\s*전)?$'), lambda n: timedelta(days=n)),
+    (re.compile(r'^(\d+)\s*주(?:\s*전)?$'), lambda n: timedelta(weeks=n)),
+    (re.compile(r'^(\d+)\s*(?:달|개월)(?:\s*전)?$'), lambda n: relativedelta(months=n)),
+]
+_JUST_NOW = {'방금', '방금 전'}
+_YESTERDAY = {'어제'}
+# 오늘 글은 시각만 ('14:05'), 올해 글은 월.일만 ('01.19') 표시하는 목록
+_TIME_ONLY = re.compile(r'^(\d{1,2}):(\d{2})(?::(\d{2}))?$')
+_MONTH_DAY = re.compile(r'^(\d{1,2})\.(\d{1,2})$')
+
+
+@lru_cache(maxsize=8192)
+def _strptime(text, fmt):
+    # 목록 페이지마다 같은 날짜 문자열이 반복되므로 (문자열, 형식) 단위로 결과 캐시 (실패는 None)
+    try:
+        return datetime.strptime(text, fmt)
+    except ValueError:
+        return None
+
+
+def parse_relative(text, now=None):
+    """'3시간 전', '어제', '14:05', '01.19' 같은 표현 -> datetime (해당 없으면 None)"""
+    now = now or datetime.now()
+    if text in _JUST_NOW:
+        return now
+    if text in _YESTERDAY:
+        return now - timedelta(days=1)
+    for pattern, delta in _RELATIVE:
+        m = pattern.match(text)
+        if m:
+            return now - delta(int(m.group(1)))
+    m = _TIME_ONLY.match(text)
+    if m:
+        return now.replace(hour=int(m.group(1)), minute=int(m.group(2)), second=int(m.group(3) or 0), microsecond=0)
+    m = _MONTH_DAY.match(text)
+    if m:
+        try:
+            value = datetime(now.year, int(m.group(1)), int(m.group(2)))
+            # 연초에 보이는 작년 12월 글처럼 미래가 되면 작년으로
+            return value if value <= now else value.replace(year=now.year - 1)
+        except ValueError:
+            return None
+    return None
+
+
+class DateParser:
+    """
+    사이트별 날짜 파서
+    - formats: 사이트가 쓰는 strptime 형식들 (마지막으로 성공한 형식부터 시도)
+    - relative: 형식에 맞지 않으면 상대 시간 표현도 해석
+    - parse(text) -> datetime, date(text) -> date (둘 다 해석 실패 시 ValueError, default를 주면 default 반환)
+    """
+
+    _RAISE = object()
+
+    def __init__(self, name, *formats, relative=True):
+        self.name = name
+        self.formats = [fmt.strip() for fmt in formats]
+        self.relative = relative
+        self._last = 0
+        self._lock = threading.Lock()
+
+    def _ordered(self):
+        with self._lock:
+            last = self._last
+        return [self.formats[last]] + self.formats[:last] + self.formats[last + 1:]
+
+    def _remember(self, fmt):
+        with self._lock:
+            self._last = self.formats.index(fmt)
+
+    def parse(self, text, default=_RAISE, now=None):
+        text = ' '.join(str(text).split())
+        if self.formats:
+            for fmt in self._ordered():
+                value = _strptime(text, fmt)
+                if value is not None:
+                    if fmt != self.formats[self._last]:
+                        self._remember(fmt)
+                    return value
+        if self.relative:
+            value = parse_relative(text, now)
+            if value is not None:
+                return value
+        if default is not self._RAISE:
+            return default
+        raise ValueError(f"[{self.name}] 날짜 형식 인식 불가: {text!r}")
+
+    def date(self, text, default=_RAISE, now=None):
+        if default is self._RAISE:
+            return self.parse(text, now=now).date()
+        value = self.parse(text, None, now)
+        return default if value is None else value.date()
+
+
+# 형식을 모르는 값(이전 수집분 문자열 등)을 ISO로 바꿀 때 쓰는 공용 파서
+_COMMON = DateParser('common', *COMMON_FORMATS)
+
+
+def to_iso(value):
+    """
+    게시물 등록일자 -> ISO-8601 문자열 (저장 직전 csv_writer에서 호출)
+    - date/datetime/Timestamp는 바로 변환, 문자열은 공용 형식으로 해석
+    - 비어 있으면 None, 해석할 수 없는 문자열은 원문 유지 (데이터를 버리지 않음)
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if value != value:  # NaT
+            return None
+        return value.strftime(ISO_FORMAT)
+    if isinstance(value, date):
+        return f'{value.isoformat()}T00:00:00'
+    if isinstance(value, float) and value != value:  # NaN
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    parsed = _COMMON.parse(text, default=None)
+    return parsed.strftime(ISO_FORMAT) if parsed is not None else text
@@ -1,26 +1,58 @@
 import os
 import re
-import time
-import random
 import logging
 import pandas as pd
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from datetime import datetime
 
-from .utils import setup_driver, save_to_csv, clean_title, result_csv_data
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import checkpoint
+from . import rate_limiter
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .detail_fetcher import DetailFetcher, is_driver_error
+from .html_parser import compile_selectors
+from .page_seek import seek_window
+from .js_extract import ExtractScript, field, STRIP_TEXT_LINKS
+from . import dates
+
+# 작성일: 상세 'YYYY.MM.DD HH:MM:SS' / 검색 목록 'YYYY.MM.DD HH:MM'
+DC_DATE = dates.DateParser('dc', '%Y.%m.%d %H:%M:%S', '%Y.%m.%d %H:%M')
+
+# 사이트 셀렉터 (import 시 한 번만 컴파일)
+DC_LIST = compile_selectors(
+    'dc_list',
+    result_list='ul.sch_result_list',
+    # 검색 결과가 0건일 때 결과 목록 대신 표시되는 안내
+    no_result='div.search_no_data, p.search_no_data, div.no_result',
+    items='li',
+    date='span.date_time',
+    link='a.tit_txt',
+)
+# 상세 페이지는 브라우저 안에서 필드만 추출 (og 링크 박스와 미디어 없는 링크는 DOM에서 제거)
+DC_DETAIL = ExtractScript(
+    'dc_detail',
+    title=field('h3.title.ub-word span.title_subject'),
+    content=field('div.write_div', separator='\n', strip=True, remove=['a.og-wrap'], strip_links=STRIP_TEXT_LINKS),
+    date=field('span.gall_date'),
+    nickname=field('span.nickname'),
+    ip=field('span.ip'),
+)
+DC_LIST_URL = 'https://search.dcinside.com/post/p/{page}/sort/latest/q/{search}'
+# 통합검색 최신순 목록은 120페이지까지만 순회
+DC_MAX_PAGES = 120
 
 
 def dc_crw(wd, url, search, target_date):
     try:
         wd.get(f'{url}')
-        sleep_random_time = random.uniform(2, 4)
-        time.sleep(sleep_random_time)
         WebDriverWait(wd, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, ".view_content_wrap")))
 
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
+        detail = DC_DETAIL.extract(wd)
 
         search_word_list = []
         search_plt_list = []
@@ -30,35 +62,24 @@ def dc_crw(wd, url, search, target_date):
         content_list = []
         date_list = []
 
-        raw_title = soup.find('h3', class_='title ub-word').find('span', class_='title_subject').get_text()
+        raw_title = detail['title']
         cleaned_title = clean_title(raw_title)
         title_list.append(cleaned_title)
         logging.info(f"제목 추출 성공: {cleaned_title}")
 
-        content_div = soup.find('div', class_='write_div')
-        for og_tag in content_div.find_all('a', class_='og-wrap'):
-            og_tag.decompose()
-
-        for a_tag in content_div.find_all('a'):
-            if (not a_tag.find('img') and not a_tag.find('span', class_='scrap_img') and
-                not a_tag.find('video') and not (a_tag.find('iframe') and 'youtube.com' in a_tag.decode_contents())):
-                a_tag.decompose()
-
-        post_content = content_div.get_text(separator='\n', strip=True)
-        post_content = re.sub(r'http[s]?://\S+', '', post_content)
+        post_content = re.sub(r'http[s]?://\S+', '', detail['content'])
         content_list.append(post_content)
 
         search_plt_list.append('웹페이지(dcinside)')
         url_list.append(url)
         search_word_list.append(search)
 
-        date_str = soup.find('span', class_='gall_date').text
-        date = datetime.strptime(date_str, '%Y.%m.%d %H:%M:%S').date()
+        date_str = detail['date']
+        date = DC_DATE.date(date_str)
         date_list.append(date)
 
-        nickname = soup.find('span', class_='nickname').get_text()
-        ip_tag = soup.find('span', class_='ip')
-        ip_address = ip_tag.get_text() if ip_tag else ''
+        nickname = detail['nickname']
+        ip_address = detail['ip'] or ''
         writer = f"{nickname}{ip_address}"
         writer_list.append(writer)
 
@@ -84,10 +105,24 @@ def dc_crw(wd, url, search, target_date):
         logging.info(f"저장완료: {file_name}")
 
     except Exception as e:
+        # 시간 초과/드라이버 오류는 DetailFetcher가 처리
+        if is_driver_error(e):
+            raise
         logging.error(f"오류 발생: {e}")
         return pd.DataFrame()
 
 
+def load_list_page(wd, page_num, search):
+    wd.get(DC_LIST_URL.format(page=page_num, search=search))
+    return DC_LIST.parse(wd.page_source)
+
+
+def list_dates(page):
+    """목록 페이지 게시물들의 작성일 (페이지 탐색용, 결과 목록이 없으면 빈 목록)"""
+    return [DC_DATE.date(page.text(page.select_one('date', li)), default=None)
+            for li in page.select('items', page.select_one('result_list'))]
+
+
 def dc_main_crw(searchs, start_date, end_date, stop_event):
     target_date = start_date.strftime("%y%m%d")
     
@@ -97,6 +132,9 @@ def dc_main_crw(searchs, start_date, end_date, stop_event):
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
 
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', '디시인사이드', f'디시인사이드_raw data_{target_date}.csv'))
+
     logging.basicConfig(
         filename=os.path.join(log_dir, f'디시인사이드_log_{target_date}.txt'),
         level=logging.INFO,
@@ -109,27 +147,55 @@ def dc_main_crw(searchs, start_date, end_date, stop_event):
     logging.info(f"                 디시인사이드 크롤링 시작 (Date: {target_date})")
     logging.info(f"========================================================")
     
-    wd = setup_driver()
-    wd_dp1 = setup_driver()
+    wd_dp1 = acquire_driver(role='list')
+    fetcher = DetailFetcher()
     
     for search in searchs:
-        page_num = 1
         if stop_event.is_set():
             print("🛑 크롤링 중단됨")
             break
-        while True:
+        if checkpoint.is_done(search):
+            continue
+
+        # 탐색하며 연 목록 페이지는 순회 때 다시 열지 않음
+        probed_pages = {}
+
+        def probe(page_num):
+            probed_pages[page_num] = load_list_page(wd_dp1, page_num, search)
+            return list_dates(probed_pages[page_num])
+
+        # 이전 실행에서 진행 중이던 검색어는 탐색 없이 체크포인트 페이지부터 이어서 순회
+        resume_page = checkpoint.resume_page(search)
+        if resume_page > 1:
+            window = (resume_page, DC_MAX_PAGES)
+        else:
+            window = seek_window(probe, start_date, end_date, DC_MAX_PAGES, label=search)
+        page_num, last_page = window if window else (1, 0)
+        last_url = None
+
+        failed = False
+        while page_num <= last_page:
             if stop_event.is_set():
                 break
+            checkpoint.advance(search, page_num, last_url)
             try:
-                if page_num == 121:
+                url_dp1 = DC_LIST_URL.format(page=page_num, search=search)
+                page_dp1 = probed_pages.pop(page_num, None)
+                if page_dp1 is None:
+                    page_dp1 = load_list_page(wd_dp1, page_num, search)
+
+                result_list = page_dp1.select_one('result_list')
+                if result_list is None:
+                    if page_dp1.select_one('no_result') is not None:
+                        logging.info(f"검색 결과 없음: {url_dp1}")
+                        break
+                    # 결과 목록도 '결과 없음' 안내도 없으면 차단/캡차 페이지 -> 완료로 표시하지 않고 이 페이지에서 멈춤
+                    logging.error(f"검색 결과 목록 없음 (차단 의심): {url_dp1}")
+                    rate_limiter.backoff(url_dp1, 'captcha')
+                    failed = True
                     break
-                url_dp1 = f'https://search.dcinside.com/post/p/{page_num}/sort/latest/q/{search}'
-                wd_dp1.get(url_dp1)
-                sleep_random_time = random.uniform(2, 4)
-                time.sleep(sleep_random_time)
-                soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
-
-                li_tags = soup_dp1.find('ul', class_='sch_result_list').find_all('li')
+                li_tags = page_dp1.select('items', result_list)
+                page_urls = []
 
                 for li in li_tags:
                     if stop_event.is_set():
@@ -137,8 +203,8 @@ def dc_main_crw(searchs, start_date, end_date, stop_event):
                     after_start_date = False
 
                     try:
-                        date_str = li.find('span', class_='date_time').text
-                        date = datetime.strptime(date_str, '%Y.%m.%d %H:%M').date()
+                        date_str = page_dp1.text(page_dp1.select_one('date', li))
+                        date = DC_DATE.date(date_str)
                     except Exception as e:
                         logging.error(f"날짜 오류 발생: {e}")
                         continue
@@ -149,9 +215,23 @@ def dc_main_crw(searchs, start_date, end_date, stop_event):
                         after_start_date = True
                         break
 
-                    url = li.find('a', class_='tit_txt').get('href')
+                    url = page_dp1.attr(page_dp1.select_one('link', li), 'href')
                     logging.info(f"url 찾음.")
-                    dc_crw(wd, url, search, target_date)
+                    # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                    if seen_urls.should_skip(url, search):
+                        if seen_urls.reached_known_run(search):
+                            after_start_date = True
+                            break
+                        continue
+                    # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+                    if post_cache.reuse(url, search):
+                        continue
+                    page_urls.append(url)
+
+                # 목록 페이지에서 찾은 상세 페이지들을 동시 수집
+                fetcher.run(page_urls, dc_crw, search, target_date, stop_event=stop_event)
+                if page_urls:
+                    last_url = page_urls[-1]
 
                 if after_start_date:
                     break
@@ -160,17 +240,15 @@ def dc_main_crw(searchs, start_date, end_date, stop_event):
 
             except Exception as e:
                 logging.error(f"오류 발생: {e}")
+                failed = True
                 break
 
-    wd.quit()
-    wd_dp1.quit()
+        if failed:
+            checkpoint.pause(search)
+        elif not stop_event.is_set():
+            checkpoint.finish(search)
 
-    if not stop_event.is_set():
-        result_dir = os.path.join(project_root, '결과', '디시인사이드')
-        os.makedirs(result_dir, exist_ok=True)
+    release_driver(wd_dp1)
 
-        all_data = pd.concat([
-            result_csv_data(search, platform='디시인사이드', subdir=f'22.디시인사이드/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-        all_data.to_csv(os.path.join(result_dir, f'디시인사이드_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
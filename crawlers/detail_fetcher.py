@@ -0,0 +1,105 @@
+import logging
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from selenium.common.exceptions import WebDriverException, TimeoutException, InvalidSessionIdException, NoSuchWindowException
+
+from .driver_pool import acquire_driver, release_driver, DETAIL_CONCURRENCY
+from . import rate_limiter
+
+# [설정] 도메인별 동시 수집 수 상한 (차단이 잦은 사이트는 1로 제한)
+DOMAIN_CONCURRENCY = {
+    "mlbpark.donga.com": 1,
+    "www.teamblind.com": 1,
+}
+
+
+def is_driver_error(e):
+    """
+    수집 함수가 삼키지 말고 DetailFetcher로 다시 던져야 하는 오류
+    - 대기 시간 초과: 도메인 속도를 낮춤
+    - 세션/창이 사라졌거나 브라우저와 연결이 끊긴 경우(WebDriverException 그 자체): 드라이버 교체
+    - 요소 없음/stale 요소 등 하위 예외는 페이지 내용 문제이므로 제외
+    """
+    return (isinstance(e, (TimeoutException, InvalidSessionIdException, NoSuchWindowException))
+            or type(e) is WebDriverException)
+
+
+class _DomainSlot:
+    """도메인별 동시 실행 수 제한 (요청 간격은 rate_limiter가 페이지 로드마다 조절)"""
+
+    def __init__(self, limit):
+        self._sem = threading.Semaphore(limit)
+
+    def __enter__(self):
+        self._sem.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._sem.release()
+        return False
+
+
+class DetailFetcher:
+    """
+    목록 페이지에서 찾은 상세 URL들을 스레드 풀로 동시에 수집
+    - 각 작업은 풀에서 드라이버를 대여해 기존 사이트별 수집 함수(*_crw(wd, url, ...))를 그대로 호출
+    - 도메인별 동시 실행 수를 지킴 (요청 간격은 드라이버/HTTP 요청마다 rate_limiter가 적용)
+    """
+
+    def __init__(self, max_workers=DETAIL_CONCURRENCY, domain_limits=None):
+        self.max_workers = max_workers
+        self.domain_limits = dict(DOMAIN_CONCURRENCY)
+        if domain_limits:
+            self.domain_limits.update(domain_limits)
+        self._slots = {}
+        self._slots_lock = threading.Lock()
+
+    def _slot(self, url):
+        domain = urlparse(url).netloc
+        with self._slots_lock:
+            if domain not in self._slots:
+                limit = min(self.domain_limits.get(domain, self.max_workers), self.max_workers)
+                self._slots[domain] = _DomainSlot(limit)
+            return self._slots[domain]
+
+    def _run_one(self, crawl_func, url, args, stop_event):
+        if stop_event is not None and stop_event.is_set():
+            return None
+        with self._slot(url):
+            wd = acquire_driver(role='detail')
+            broken = False
+            try:
+                return crawl_func(wd, url, *args)
+            except TimeoutException as e:
+                # 기다린 요소가 끝내 뜨지 않음 -> 차단/과부하 신호로 보고 해당 도메인 속도를 낮춤
+                rate_limiter.backoff(url, 'empty')
+                logging.error(f"상세 페이지 대기 시간 초과: {url} ({e})")
+            except WebDriverException as e:
+                broken = True
+                logging.error(f"상세 수집 드라이버 오류: {url} ({e})")
+            except Exception as e:
+                logging.error(f"상세 수집 오류: {url} ({e})")
+            finally:
+                release_driver(wd, broken=broken)
+        return None
+
+    def run(self, urls, crawl_func, *args, stop_event=None):
+        """
+        urls의 각 URL에 대해 crawl_func(wd, url, *args)를 동시에 실행하고 결과를 입력 순서대로 반환
+        """
+        if not urls:
+            return []
+        if self.max_workers <= 1 or len(urls) == 1:
+            return [self._run_one(crawl_func, url, args, stop_event) for url in urls]
+
+        results = [None] * len(urls)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as executor:
+            futures = {
+                executor.submit(self._run_one, crawl_func, url, args, stop_event): i
+                for i, url in enumerate(urls)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        return results
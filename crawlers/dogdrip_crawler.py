@@ -3,14 +3,36 @@ import re
 import time
 import logging
 import pandas as pd
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from datetime import datetime
 
-from .utils import setup_driver, save_to_csv, clean_title, result_csv_data
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import checkpoint
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .js_extract import ExtractScript, field, STRIP_ALL_LINKS
+from .html_parser import parse_soup
+from . import dates
+
+# 작성일: 'YYYY.MM.DD'
+DOGDRIP_DATE = dates.DateParser('dogdrip', '%Y.%m.%d')
+
+# 상세 페이지는 브라우저 안에서 필드만 추출 (추천 버튼/본문 링크는 DOM에서 제거)
+# - class 속성 전체 일치 셀렉터: BeautifulSoup의 class_='a b c' 문자열 비교와 같은 요소를 고름
+DOGDRIP_TOOLBAR = 'div[class="ed flex flex-wrap flex-left flex-middle title-toolbar"]'
+DOGDRIP_DETAIL = ExtractScript(
+    'dogdrip_detail',
+    title=field('a[class="ed link text-bold"]', within='h4[class="ed margin-bottom-xsmall"]'),
+    content=field('div[class="ed clearfix margin-vertical-large"]', separator=' ', strip=True,
+                  remove=['div[class="wgtRv addon_addvote"]'], strip_links=STRIP_ALL_LINKS),
+    date=field('span[class="ed text-xsmall text-muted"]', within=DOGDRIP_TOOLBAR, index=1),
+    writer=field('span[class="ed margin-right-small"]', within=DOGDRIP_TOOLBAR),
+)
 
 
 def dogdrip_crw(wd, url, search, target_date):
@@ -19,9 +41,8 @@ def dogdrip_crw(wd, url, search, target_date):
         wd.set_page_load_timeout(10)
         wd.get(f'{url}')
         logging.info(f"접속: {url}")
-        time.sleep(1)
         WebDriverWait(wd, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'ed')))
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
+        detail = DOGDRIP_DETAIL.extract(wd)
 
         search_word_list = []
         search_plt_list = []
@@ -31,22 +52,12 @@ def dogdrip_crw(wd, url, search, target_date):
         content_list = []
         date_list = []
 
-        content_div = soup.find('div', class_='ed clearfix margin-vertical-large')
-        raw_title = soup.find('h4', class_='ed margin-bottom-xsmall').find('a', class_='ed link text-bold').text
+        raw_title = detail['title']
         cleaned_title = clean_title(raw_title)
         title_list.append(cleaned_title)
         logging.info(f"제목 추출 성공: {cleaned_title}")
 
-        content = soup.find('div', class_='ed clearfix margin-vertical-large')
-        recom_btn = content.find('div', class_='wgtRv addon_addvote')
-        if recom_btn:
-            recom_btn.extract()
-
-        for a_tag in content_div.find_all('a'):
-            a_tag.decompose()
-
-        post_content = content_div.get_text(separator=' ', strip=True)
-        post_content = re.sub(r'https?://[^\s]+', '', post_content)
+        post_content = re.sub(r'https?://[^\s]+', '', detail['content'])
         content_list.append(post_content)
         logging.info(f"내용 추출 성공: {post_content}")
 
@@ -54,13 +65,12 @@ def dogdrip_crw(wd, url, search, target_date):
         url_list.append(url)
         search_word_list.append(search)
 
-        div_tag = soup.find('div', class_='ed flex flex-wrap flex-left flex-middle title-toolbar')
-        date_str = div_tag.find_all('span', class_='ed text-xsmall text-muted')[1].text
-        date = datetime.strptime(date_str, '%Y.%m.%d')
+        date_str = detail['date']
+        date = DOGDRIP_DATE.parse(date_str)
         date_list.append(date)
         logging.info(f"날짜 추출 성공: {date_str}")
 
-        writer_list.append(div_tag.find_all('span', class_='ed margin-right-small')[0].text.strip())
+        writer_list.append(detail['writer'].strip())
         now_time = datetime.now().strftime('%Y-%m-%d ')
         main_temp = pd.DataFrame({
             "검색어": search_word_list,
@@ -96,6 +106,9 @@ def dogdrip_main_crw(searchs, start_date, end_date, stop_event):
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
 
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', '개드립', f'개드립_raw data_{target_date}.csv'))
+
     logging.basicConfig(
         filename=os.path.join(log_dir, f'개드립_log_{target_date}.txt'),
         level=logging.INFO,
@@ -108,8 +121,8 @@ def dogdrip_main_crw(searchs, start_date, end_date, stop_event):
     logging.info(f"            개드립 크롤링 시작 (Date: {target_date})")
     logging.info(f"========================================================")
     
-    wd = setup_driver()
-    wd_dp1 = setup_driver()
+    wd = acquire_driver(role='detail')
+    wd_dp1 = acquire_driver(role='list')
 
     category = ['dogdrip', 'userdog', 'stock', 'coin', 'free', 'sports', 'politics', 'genderissue']
     for cate in category:
@@ -118,17 +131,21 @@ def dogdrip_main_crw(searchs, start_date, end_date, stop_event):
         for search in searchs:
             if stop_event.is_set():
                 break
-            page_num = 1
+            if checkpoint.is_done(f'{cate}:{search}'):
+                continue
+            page_num = checkpoint.resume_page(f'{cate}:{search}')
+            failed = False
             while True:
                 if stop_event.is_set():
                     break
+                checkpoint.advance(f'{cate}:{search}', page_num)
                 try:
                     logging.info(f"크롤링 시작-검색어: {search} / 카테고리: {cate}")
                     url = f'https://www.dogdrip.net/?_filter=search&act=&vid=&mid={cate}&category=&search_target=title_content&search_keyword={search}&page={page_num}'
                     wd_dp1.get(url)
                     WebDriverWait(wd_dp1, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'ed.board-list')))
                     time.sleep(1)
-                    soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
+                    soup_dp1 = parse_soup(wd_dp1.page_source)
 
                     ul_tag = soup_dp1.find('ul', class_='ed list')
                     if not ul_tag:
@@ -145,7 +162,7 @@ def dogdrip_main_crw(searchs, start_date, end_date, stop_event):
 
                         try:
                             date_str = li.find('span', class_='ed text-muted text-xxsmall margin-right-xsmall').text.strip().replace('  ', '')
-                            date = datetime.strptime(date_str, '%Y.%m.%d').date()
+                            date = DOGDRIP_DATE.date(date_str)
                             logging.info(f"날짜 찾음 : {date_str}")
                         except Exception as e:
                             logging.error(f"날짜 오류 발생: {e}")
@@ -159,6 +176,15 @@ def dogdrip_main_crw(searchs, start_date, end_date, stop_event):
 
                         url = 'https://www.dogdrip.net' + li.find('a', class_='ed overlay overlay-fill overlay-top').get('href')
                         logging.info(f"url 찾음.")
+                        # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                        if seen_urls.should_skip(url, search):
+                            if seen_urls.reached_known_run(search):
+                                after_start_date = True
+                                break
+                            continue
+                        # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+                        if post_cache.reuse(url, search):
+                            continue
                         dogdrip_crw(wd, url, search, target_date)
 
                     if after_start_date:
@@ -168,16 +194,16 @@ def dogdrip_main_crw(searchs, start_date, end_date, stop_event):
 
                 except Exception as e:
                     logging.error(f"오류 발생: {e}")
+                    failed = True
                     break
-    wd.quit()
-    wd_dp1.quit()
-    
-    if not stop_event.is_set():
-        result_dir = os.path.join(project_root, '결과', '개드립')
-        os.makedirs(result_dir, exist_ok=True)
-
-        all_data = pd.concat([
-            result_csv_data(search, platform='개드립', subdir=f'14.개드립/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-        all_data.to_csv(os.path.join(result_dir, f'개드립_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+
+            if failed:
+                checkpoint.pause(f'{cate}:{search}')
+            elif not stop_event.is_set():
+                checkpoint.finish(f'{cate}:{search}')
+
+    release_driver(wd)
+    release_driver(wd_dp1)
+
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
@@ -0,0 +1,53 @@
+import logging
+
+from . import metrics
+from . import fixtures
+
+# 브라우저 안에서 아직 넘기지 않은 항목만 골라 필드를 뽑고, 넘긴 항목에는 표시를 남김
+# - 무한 스크롤/더보기로 뒤에 붙은 항목, 다음 페이지로 통째로 바뀐 항목 모두 표시가 없으므로 새 항목으로 잡힘
+# - 반환값은 WebDriver가 JSON으로 넘겨주는 {total, items: [{필드명: 값}]}
+EXTRACT_SCRIPT = """
+const [itemCss, fields, mark] = arguments;
+const nodes = document.querySelectorAll(itemCss);
+const items = [];
+for (const node of nodes) {
+    if (node.hasAttribute(mark)) continue;
+    node.setAttribute(mark, '1');
+    const item = {};
+    for (const [name, css, attr] of fields) {
+        const el = css ? node.querySelector(css) : node;
+        item[name] = el ? (attr ? el.getAttribute(attr) : el.textContent) : null;
+    }
+    items.push(item);
+}
+return {total: nodes.length, items: items};
+"""
+
+# 이미 넘긴 항목 표시용 속성
+SEEN_MARK = 'data-crawl-seen'
+
+
+class IncrementalList:
+    """
+    무한 스크롤 / 더보기 목록에서 새로 붙은 항목만 꺼내는 추출기
+    - 매번 page_source 전체를 BeautifulSoup으로 다시 파싱하지 않고, 새 항목의 필드만 JSON으로 받음
+    - fields: {필드명: (항목 안 CSS 셀렉터 또는 None(항목 자신), 속성명 또는 None(텍스트))}
+    """
+
+    def __init__(self, wd, items_css, fields):
+        self.wd = wd
+        self.items_css = items_css
+        self.fields = [[name, css, attr] for name, (css, attr) in fields.items()]
+        self.total = 0
+        self.last_count = 0
+
+    def new_items(self):
+        """지난 호출 이후 새로 나타난 항목 목록 (문서 순서)"""
+        fixtures.snapshot(self.wd)
+        with metrics.timer('parse'):
+            result = self.wd.execute_script(EXTRACT_SCRIPT, self.items_css, self.fields, SEEN_MARK) or {}
+        items = result.get('items', [])
+        self.total = result.get('total', 0)
+        self.last_count = len(items)
+        logging.info(f"목록 새 항목 {len(items)}개 (누적 {self.total}개)")
+        return items
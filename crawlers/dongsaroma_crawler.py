@@ -4,13 +4,22 @@ import time
 import sys
 import logging
 import pandas as pd
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from datetime import datetime
 
-from .utils import setup_driver, save_to_csv, clean_title, result_csv_data
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import checkpoint
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .html_parser import parse_soup
+from . import dates
+
+# 작성일: 'YYYY-MM-DD'
+DONGSAROMA_DATE = dates.DateParser('dongsaroma', '%Y-%m-%d')
 
 
 def dongsaroma_crw(wd, url, search, target_date):
@@ -19,9 +28,8 @@ def dongsaroma_crw(wd, url, search, target_date):
         wd.set_page_load_timeout(10)
         wd.get(f'{url}')
         logging.info(f"접속: {url}")
-        time.sleep(1)
         WebDriverWait(wd, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'py-8.w-full')))
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
+        soup = parse_soup(wd.page_source)
 
         search_word_list = []
         search_plt_list = []
@@ -52,7 +60,7 @@ def dongsaroma_crw(wd, url, search, target_date):
         search_word_list.append(search)
 
         date_str = '2024-' + soup.find('div', class_='flex justify-between w-full').find('div', class_='flex gap-2 items-center text-sm').find('span').text
-        date = datetime.strptime(date_str, '%Y-%m-%d')
+        date = DONGSAROMA_DATE.parse(date_str)
         date_list.append(date)
         logging.info(f"날짜 추출 성공: {date_str}")
         writer_list.append('')
@@ -91,6 +99,9 @@ def dongsaroma_main_crw(searchs, start_date, end_date, stop_event):
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
 
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', '동사로마닷컴', f'동사로마닷컴_raw data_{target_date}.csv'))
+
     logging.basicConfig(
         filename=os.path.join(log_dir, f'동사로마닷컴_log_{target_date}.txt'),
         level=logging.INFO,
@@ -103,24 +114,28 @@ def dongsaroma_main_crw(searchs, start_date, end_date, stop_event):
     logging.info(f"            동사로마닷컴 크롤링 시작 (Date: {target_date})")
     logging.info(f"========================================================")
     
-    wd = setup_driver()
-    wd_dp1 = setup_driver()
+    wd = acquire_driver(role='detail')
+    wd_dp1 = acquire_driver(role='list')
     
     for search in searchs:
-        page_num = 1
+        if checkpoint.is_done(search):
+            continue
+        page_num = checkpoint.resume_page(search)
         if stop_event.is_set():
             print("🛑 크롤링 중단됨")
             break
+        failed = False
         while True:
             if stop_event.is_set():
                 break
+            checkpoint.advance(search, page_num)
             try:
                 logging.info(f"크롤링 시작-검색어: {search}")
                 url = f'https://www.dongsaroma.com/search?q={search}&page={page_num}'
                 wd_dp1.get(url)
                 WebDriverWait(wd_dp1, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'flex.flex-col.w-full')))
                 time.sleep(1)
-                soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
+                soup_dp1 = parse_soup(wd_dp1.page_source)
 
                 a_tags = soup_dp1.find_all('a', class_=re.compile(r'grid w-full font-normal p-2'))
                 if not a_tags:
@@ -132,7 +147,7 @@ def dongsaroma_main_crw(searchs, start_date, end_date, stop_event):
 
                     try:
                         date_str = '2024-' + a.find('span', class_='text-neutral-400 shrink-0 max-md:hidden').text.strip()
-                        date = datetime.strptime(date_str, '%Y-%m-%d').date()
+                        date = DONGSAROMA_DATE.date(date_str)
                         logging.info(f"날짜 찾음")
                     except Exception as e:
                         logging.error(f"날짜 오류 발생: {e}")
@@ -146,6 +161,15 @@ def dongsaroma_main_crw(searchs, start_date, end_date, stop_event):
 
                     url = 'https://www.dongsaroma.com' + a.get('href')
                     logging.info(f"url 찾음.")
+                    # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                    if seen_urls.should_skip(url, search):
+                        if seen_urls.reached_known_run(search):
+                            after_start_date = True
+                            break
+                        continue
+                    # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+                    if post_cache.reuse(url, search):
+                        continue
                     dongsaroma_crw(wd, url, search, target_date)
 
                 if after_start_date:
@@ -155,17 +179,16 @@ def dongsaroma_main_crw(searchs, start_date, end_date, stop_event):
 
             except Exception as e:
                 logging.error(f"오류 발생: {e}")
+                failed = True
                 break
 
-    wd.quit()
-    wd_dp1.quit()
+        if failed:
+            checkpoint.pause(search)
+        elif not stop_event.is_set():
+            checkpoint.finish(search)
 
-    if not stop_event.is_set():
-        result_dir = os.path.join(project_root, '결과', '동사로마닷컴')
-        os.makedirs(result_dir, exist_ok=True)
+    release_driver(wd)
+    release_driver(wd_dp1)
 
-        all_data = pd.concat([
-            result_csv_data(search, platform='동사로마닷컴', subdir=f'16.동사로마닷컴/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-        all_data.to_csv(os.path.join(result_dir, f'동사로마닷컴_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
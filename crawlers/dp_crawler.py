@@ -3,14 +3,23 @@ import re
 import time
 import logging
 import pandas as pd
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from datetime import datetime
 
-from .utils import setup_driver, save_to_csv, clean_title, result_csv_data
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import checkpoint
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .html_parser import parse_soup
+from . import dates
+
+# 작성일: 상세 'YYYY-MM-DD' / 목록 'YY-MM-DD'
+DP_DATE = dates.DateParser('dp', '%Y-%m-%d', '%y-%m-%d')
 
 
 def dp_crw(wd, url, search, target_date):
@@ -19,9 +28,8 @@ def dp_crw(wd, url, search, target_date):
         wd.set_page_load_timeout(10)
         wd.get(f'{url}')
         logging.info(f"접속: {url}")
-        time.sleep(1)
         WebDriverWait(wd, 10).until(EC.presence_of_element_located((By.ID, 'resContents')))
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
+        soup = parse_soup(wd.page_source)
 
         search_word_list = []
         search_plt_list = []
@@ -54,7 +62,7 @@ def dp_crw(wd, url, search, target_date):
         search_word_list.append(search)
 
         date_str = soup.find('div', id='view_datetime').get_text(strip=True).split(' ')[0]
-        date = datetime.strptime(date_str, '%Y-%m-%d')
+        date = DP_DATE.parse(date_str)
         date_list.append(date)
         logging.info(f"날짜 추출 성공: {date_str}")
 
@@ -94,6 +102,9 @@ def dp_main_crw(searchs, start_date, end_date, stop_event):
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
 
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', 'DVD프라임', f'DVD프라임_raw data_{target_date}.csv'))
+
     logging.basicConfig(
         filename=os.path.join(log_dir, f'DVD프라임_log_{target_date}.txt'),
         level=logging.INFO,
@@ -106,15 +117,18 @@ def dp_main_crw(searchs, start_date, end_date, stop_event):
     logging.info(f"            DVD프라임 크롤링 시작 (Date: {target_date})")
     logging.info(f"========================================================")
     
-    wd = setup_driver()
-    wd_dp1 = setup_driver()
+    wd = acquire_driver(role='detail')
+    wd_dp1 = acquire_driver(role='list')
 
     category = ['sisa', 'comm', 'humor']
     for cate in category:
         for search in searchs:
             if stop_event.is_set():
                 break
+            if checkpoint.is_done(f'{cate}:{search}'):
+                continue
             page_num = 1
+            failed = False
             while True:
                 if stop_event.is_set():
                     break
@@ -124,7 +138,7 @@ def dp_main_crw(searchs, start_date, end_date, stop_event):
                     wd_dp1.get(url)
                     WebDriverWait(wd_dp1, 10).until(EC.presence_of_element_located((By.ID, 'list_table')))
                     time.sleep(1)
-                    soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
+                    soup_dp1 = parse_soup(wd_dp1.page_source)
 
                     div_tags = soup_dp1.find('div', id='list_table').find_all('div', attrs={'class': ['relative', 'list_table_row']})
                     
@@ -134,8 +148,8 @@ def dp_main_crw(searchs, start_date, end_date, stop_event):
                         after_start_date = False
 
                         try:
-                            date_str = '20' + div.find('span', class_='list_table_dates').text.strip()
-                            date = datetime.strptime(date_str, '%Y-%m-%d').date()
+                            date_str = div.find('span', class_='list_table_dates').text.strip()
+                            date = DP_DATE.date(date_str)
                             logging.info(f"날짜 찾음")
                         except Exception as e:
                             logging.error(f"날짜 오류 발생: {e}")
@@ -149,6 +163,15 @@ def dp_main_crw(searchs, start_date, end_date, stop_event):
 
                         url = 'https://dprime.kr' + div.find('a', class_='list_subject_a').get('href')
                         logging.info(f"url 찾음.")
+                        # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                        if seen_urls.should_skip(url, search):
+                            if seen_urls.reached_known_run(search):
+                                after_start_date = True
+                                break
+                            continue
+                        # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+                        if post_cache.reuse(url, search):
+                            continue
                         dp_crw(wd, url, search, target_date)
 
                     if after_start_date:
@@ -156,6 +179,7 @@ def dp_main_crw(searchs, start_date, end_date, stop_event):
 
                 except Exception as e:
                     logging.error(f"오류 발생: {e}")
+                    failed = True
                     break
 
                 page_num += 1
@@ -182,15 +206,13 @@ def dp_main_crw(searchs, start_date, end_date, stop_event):
                         logging.error(f"'더 검색' 버튼 클릭 오류: {e}")
                         break
 
-    wd.quit()
-    wd_dp1.quit()
-    
-    if not stop_event.is_set():
-        result_dir = os.path.join(project_root, '결과', 'DVD프라임')
-        os.makedirs(result_dir, exist_ok=True)
-
-        all_data = pd.concat([
-            result_csv_data(search, platform='DVD프라임', subdir=f'15.DVD프라임/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-        all_data.to_csv(os.path.join(result_dir, f'DVD프라임_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+            if failed:
+                checkpoint.pause(f'{cate}:{search}')
+            elif not stop_event.is_set():
+                checkpoint.finish(f'{cate}:{search}')
+
+    release_driver(wd)
+    release_driver(wd_dp1)
+
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
@@ -1,59 +1,75 @@
 import os
 import re
-import time
-import random
 import logging
 import pandas as pd
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import WebDriverException
-from datetime import datetime, date
+from datetime import datetime
+
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import checkpoint
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from .detail_fetcher import DetailFetcher, is_driver_error
+from .html_parser import compile_selectors
+from .page_seek import seek_window
+from . import dates
+
+# 작성일: 상세 'YYYY.MM.DD' / 목록 'YY.MM.DD', 올해 글은 'MM.DD', 오늘 글은 'HH:MM' (상대 시간으로 해석)
+DQ_DATE = dates.DateParser('dq', '%Y.%m.%d', '%y.%m.%d')
+
+# 사이트 셀렉터 (import 시 한 번만 컴파일)
+DQ_LIST = compile_selectors(
+    'dq_list',
+    rows='tbody.hide_notice tr:not(.notice)',
+    time='.time',
+    title='td.title > a:not(.replyNum)',
+)
+DQ_DETAIL = compile_selectors(
+    'dq_detail',
+    article='article[itemprop="articleBody"]',
+    content='div.rhymix_content.xe_content',
+    date='div.side.fr > span',
+    writer='div.side',
+)
+DQ_LIST_URL = 'https://theqoo.net/square/category/512000849?page={page}'
+
+def load_list_page(wd, page_num):
+    wd.get(DQ_LIST_URL.format(page=page_num))
+    WebDriverWait(wd, 10).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, 'tbody.hide_notice tr'))
+    )
+    return DQ_LIST.parse(wd.page_source)
 
-from .utils import setup_driver, save_to_csv, clean_title, result_csv_data
 
-def parse_theqoo_date(raw_text):
-    today = date.today()
-    try:
-        # 1. "HH:MM" → 오늘 날짜
-        if re.match(r"^\d{2}:\d{2}$", raw_text):
-            return today
-        # 2. "MM.DD" → 올해 날짜
-        elif re.match(r"^\d{2}\.\d{2}$", raw_text):
-            month, day = map(int, raw_text.split('.'))
-            return date(today.year, month, day)
-        # 3. "YY.MM.DD" → 연도 포함
-        elif re.match(r"^\d{2}\.\d{2}\.\d{2}$", raw_text):
-            return datetime.strptime(raw_text, "%y.%m.%d").date()
-        else:
-            logging.warning(f"날짜 형식 인식 불가: {raw_text}")
-            return None
-    except Exception as e:
-        logging.error(f"날짜 파싱 오류: {raw_text}, 오류: {e}")
-        return None
+def list_dates(page):
+    """목록 페이지 게시물들의 작성일 (페이지 탐색용)"""
+    return [DQ_DATE.date(page.text(page.select_one('time', post), strip=True), default=None) for post in page.select('rows')]
+
 
 def dq_crw(wd, url, searchs, target_date):
     try:
         logging.info(f"더쿠 크롤링 시작: {url}")
         wd.get(url)
-        time.sleep(2)
         WebDriverWait(wd, 10).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, "div.theqoo_document_header > span.title"))
         )
 
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
+        page = DQ_DETAIL.parse(wd.page_source)
 
         raw_title = wd.find_element(By.CSS_SELECTOR, "div.theqoo_document_header > span.title").text.strip()
         cleaned_title = clean_title(raw_title)
 
-        article_tag = soup.find('article', attrs={"itemprop": "articleBody"})
-        if not article_tag:
+        article_tag = page.select_one('article')
+        if article_tag is None:
             print("본문 <article> 태그가 없음")
             return
 
-        content_div = article_tag.find('div', class_=lambda x: x and 'rhymix_content' in x and 'xe_content' in x)
-        if not content_div:
+        content_div = page.select_one('content', article_tag)
+        if content_div is None:
             print("본문 내용 div를 찾을 수 없음")
             return
 
@@ -61,20 +77,20 @@ def dq_crw(wd, url, searchs, target_date):
         post_content = re.sub(r'http[s]?://\S+', '', post_content).strip()
 
         # 날짜 파싱
-        date_tag = soup.select_one('div.side.fr > span')
-        if not date_tag:
+        date_tag = page.select_one('date')
+        if date_tag is None:
             logging.warning(f"날짜 정보가 없습니다: {url}")
             return
-        date_str = date_tag.get_text(strip=True)
+        date_str = page.text(date_tag, strip=True)
         try:
-            date = datetime.strptime(date_str.split()[0], '%Y.%m.%d').date()
+            date = DQ_DATE.date(date_str.split()[0])
         except Exception as e:
             logging.error(f"날짜 파싱 오류: {date_str}, 오류: {e}")
             return
 
-        writer_tag = soup.select_one('div.side')
-        if writer_tag:
-            writer = ''.join([t for t in writer_tag.contents if isinstance(t, str)]).strip()
+        writer_tag = page.select_one('writer')
+        if writer_tag is not None:
+            writer = page.own_text(writer_tag).strip()
             if writer == "무명의 더쿠":
                 writer = "익명"
         else:
@@ -88,6 +104,7 @@ def dq_crw(wd, url, searchs, target_date):
         os.makedirs(save_path, exist_ok=True)
 
         # 매칭되는 검색어가 있을 때마다 저장
+        matched = False
         for search in searchs:
             if search.lower() in cleaned_title.lower() or search.lower() in post_content.lower():
                 df = pd.DataFrame({
@@ -104,8 +121,16 @@ def dq_crw(wd, url, searchs, target_date):
                 file_name = os.path.join(save_path, f'더쿠_{search}.csv')
                 save_to_csv(df, file_name)
                 logging.info(f'저장 완료: {file_name}')
+                matched = True
+
+        # 일치하는 검색어가 없는 게시물은 저장할 행이 없으므로 바로 수집 완료로 기록 (다음 실행에서 재방문 방지)
+        # - 저장한 게시물은 CSV에 기록된 뒤 csv_writer가 ALL_KEYWORDS로도 기록
+        if not matched:
+            seen_urls.mark(url, seen_urls.ALL_KEYWORDS)
 
     except Exception as e:
+        if is_driver_error(e):
+            raise
         logging.error(f"상세 페이지 오류: {e}")
         print(f"상세 페이지 오류: {e}")
 
@@ -119,6 +144,9 @@ def dq_main_crw(searchs, start_date, end_date, stop_event, max_pages=1400):
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
 
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', '더쿠', f'더쿠_raw data_{target_date}.csv'))
+
     logging.basicConfig(
         filename=os.path.join(log_dir, f'더쿠_log_{target_date}.txt'),
         level=logging.INFO,
@@ -131,41 +159,60 @@ def dq_main_crw(searchs, start_date, end_date, stop_event, max_pages=1400):
     logging.info(f"             더쿠 크롤링 시작 (Date: {target_date})")
     logging.info(f"========================================================")
     
-    wd = setup_driver()
-    wd_detail = setup_driver()
-
-    page_num = 1
+    # 저장된 게시물은 기록 후 ALL_KEYWORDS로도 표시 (목록 순회는 검색어 구분 없이 ALL_KEYWORDS로 스킵 판단)
+    seen_urls.track_all_keywords()
+
+    wd = acquire_driver(role='list')
+    fetcher = DetailFetcher()
+
+    # 탐색하며 연 목록 페이지는 순회 때 다시 열지 않음
+    probed_pages = {}
+
+    def probe(page_num):
+        probed_pages[page_num] = load_list_page(wd, page_num)
+        return list_dates(probed_pages[page_num])
+
+    # 게시판 전체를 한 번 훑으므로 체크포인트는 ALL_KEYWORDS 하나로 관리
+    resume_page = checkpoint.resume_page(seen_urls.ALL_KEYWORDS)
+    if checkpoint.is_done(seen_urls.ALL_KEYWORDS):
+        window = None
+    elif resume_page > 1:
+        window = (resume_page, max_pages)
+    else:
+        window = seek_window(probe, start_date, end_date, max_pages, label='더쿠')
+    page_num, last_page = window if window else (1, 0)
     visited_urls = set()
+    last_url = None
+    retried_page = None
+    failed = False
 
-    while page_num <= max_pages:
+    while page_num <= last_page:
         if stop_event.is_set():
             print("🛑 크롤링 중단됨")
             break
-        url_list_page = f'https://theqoo.net/square/category/512000849?page={page_num}'
+        checkpoint.advance(seen_urls.ALL_KEYWORDS, page_num, last_url)
+        url_list_page = DQ_LIST_URL.format(page=page_num)
         logging.info(f"[{page_num}페이지] 접속: {url_list_page}")
         print(f"[{page_num}페이지] 접근 중...")
 
         try:
-            wd.get(url_list_page)
-            time.sleep(random.uniform(2, 3))
-
-            WebDriverWait(wd, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'tbody.hide_notice tr'))
-            )
-
-            soup = BeautifulSoup(wd.page_source, 'html.parser')
-            post_list = soup.select('tbody.hide_notice tr:not(.notice)')
+            page = probed_pages.pop(page_num, None)
+            if page is None:
+                page = load_list_page(wd, page_num)
+            post_list = page.select('rows')
 
             all_old = True
             stop_flag = False
+            page_urls = []
 
             for post in post_list:
                 if stop_event.is_set():
                     break
                 try:
-                    date_str = post.select_one('.time').get_text(strip=True)
-                    post_date = parse_theqoo_date(date_str)
+                    date_str = page.text(page.select_one('time', post), strip=True)
+                    post_date = DQ_DATE.date(date_str, default=None)
                     if not post_date:
+                        logging.warning(f"날짜 형식 인식 불가: {date_str}")
                         continue
 
                     if post_date >= start_date:
@@ -176,22 +223,32 @@ def dq_main_crw(searchs, start_date, end_date, stop_event, max_pages=1400):
                         stop_flag = True
                         continue
 
-                    title_tag = post.select_one('td.title > a:not(.replyNum)')
-                    if not title_tag:
+                    title_tag = page.select_one('title', post)
+                    if title_tag is None:
                         continue
 
-                    post_url = 'https://theqoo.net' + title_tag.get('href')
+                    post_url = 'https://theqoo.net' + page.attr(title_tag, 'href')
                     if post_url in visited_urls:
                         continue
                     visited_urls.add(post_url)
 
-                    # [수정] target_date 전달
-                    dq_crw(wd_detail, post_url, searchs, target_date)
+                    # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                    if seen_urls.should_skip(post_url, seen_urls.ALL_KEYWORDS):
+                        if seen_urls.reached_known_run(seen_urls.ALL_KEYWORDS):
+                            stop_flag = True
+                            break
+                        continue
+                    page_urls.append(post_url)
 
                 except Exception as e:
                     logging.error(f"리스트 처리 중 오류: {e}")
                     continue
 
+            # 목록 페이지에서 찾은 상세 페이지들을 동시 수집
+            fetcher.run(page_urls, dq_crw, searchs, target_date, stop_event=stop_event)
+            if page_urls:
+                last_url = page_urls[-1]
+
             if all_old:
                 page_num += 1
                 continue
@@ -204,20 +261,21 @@ def dq_main_crw(searchs, start_date, end_date, stop_event, max_pages=1400):
         except WebDriverException as e:
             logging.error(f"{page_num}페이지 WebDriver 예외 발생: {e}")
             print(f"❌ WebDriver 예외 발생! 드라이버 재시작 중...")
-            wd.quit()
-            wd = setup_driver()
-            page_num += 1
+            release_driver(wd, broken=True)
+            wd = acquire_driver(role='list')
+            # 같은 페이지를 한 번 더 시도하고, 또 실패하면 커서를 남겨 두고 멈춤 (건너뛰면 그 페이지 게시물이 빠짐)
+            if retried_page == page_num:
+                failed = True
+                break
+            retried_page = page_num
             continue
 
-    wd.quit()
-    wd_detail.quit()
+    if failed:
+        checkpoint.pause(seen_urls.ALL_KEYWORDS)
+    elif window and not stop_event.is_set():
+        checkpoint.finish(seen_urls.ALL_KEYWORDS)
 
-    if not stop_event.is_set():
-        result_dir = os.path.join(project_root, '결과', '더쿠')
-        os.makedirs(result_dir, exist_ok=True)
+    release_driver(wd)
 
-        all_data = pd.concat([
-            result_csv_data(search, platform='더쿠', subdir=f'24.더쿠/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-        all_data.to_csv(os.path.join(result_dir, f'더쿠_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
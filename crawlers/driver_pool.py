@@ -0,0 +1,297 @@
+import os
+import atexit
+import logging
+import threading
+import psutil
+
+from . import metrics
+from . import fixtures
+from . import progress
+from . import net_block
+from . import rate_limiter
+from .utils import setup_driver
+from .http_fetch import is_http_first
+
+# [설정] 상세 페이지 동시 수집 수 (detail_fetcher.DetailFetcher 기본값)
+DETAIL_CONCURRENCY = max(1, int(os.getenv("CRAWL_DETAIL_CONCURRENCY", "2")))
+# [설정] 프로세스당 동시에 띄울 수 있는 Chromium 수 (목록용 1 + 상세용 N, 최소 2)
+POOL_SIZE = max(2, int(os.getenv("CRAWL_DRIVER_POOL_SIZE", str(DETAIL_CONCURRENCY + 1))))
+# [설정] 드라이버 1개당 최대 페이지 로드 수 (초과 시 재시작)
+MAX_PAGES_PER_DRIVER = int(os.getenv("CRAWL_DRIVER_MAX_PAGES", "300"))
+# [설정] 드라이버 1개(chromedriver + chromium 자식 프로세스)의 최대 메모리 (MB)
+MAX_RSS_MB = int(os.getenv("CRAWL_DRIVER_MAX_RSS_MB", "1024"))
+# [설정] 대여 중인 드라이버의 메모리를 확인하는 간격 (페이지 로드 수, 프로세스 트리 조회 비용 때문에 매번 하지 않음)
+RSS_CHECK_PAGES = max(1, int(os.getenv("CRAWL_DRIVER_RSS_CHECK_PAGES", "20")))
+# [설정] 대여 대기 최대 시간 (초) - 반납 누락 시 무한 대기 방지
+ACQUIRE_TIMEOUT = 300
+
+
+class PooledDriver:
+    """
+    풀에서 대여한 웹드라이버 래퍼
+    - get() 호출 횟수를 세어 재활용 시점을 판단하고, 나머지 속성은 원본 드라이버로 위임
+    - 실행 내내 대여하는 목록용 드라이버도 한도를 넘으면 get() 시점에 원본 드라이버를 교체
+    - role('list'/'detail')에 따라 supervisor로 진행 상황(heartbeat/카운터) 보고
+    """
+
+    def __init__(self, driver, pool=None):
+        self._driver = driver
+        self._pool = pool
+        self.page_count = 0
+        self.role = None
+        self.url = None
+
+    def get(self, url):
+        if self._pool is not None:
+            self._pool.recycle(self)
+        self.page_count += 1
+        self.url = url
+        # 도메인별 현재 속도에 맞춰 대기 후, 차단 적용 상태로 열고 전송량/로드 시간 기록
+        rate_limiter.wait(url)
+        with metrics.timer(metrics.fetch_phase(self.role)):
+            result = net_block.load(self._driver, url)
+        rate_limiter.success(url)
+        progress.page_loaded(self.role)
+        return result
+
+    @property
+    def page_source(self):
+        # 녹화 모드면 크롤러가 읽은 HTML(렌더링 대기 후)을 그대로 fixture로 저장
+        html = self._driver.page_source
+        fixtures.record(self.role, self.url, html)
+        return html
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+    @property
+    def raw(self):
+        return self._driver
+
+
+class LazyDriver:
+    """
+    HTTP 우선 모드용 지연 대여 래퍼
+    - 드라이버 폴백이 실제로 필요해지는 첫 속성 접근 시점에만 풀에서 대여
+    """
+
+    def __init__(self, pool, role=None):
+        self._pool = pool
+        self._drv = None
+        self.role = role
+
+    def __getattr__(self, name):
+        if self._drv is None:
+            logging.info("HTTP 수집 실패 -> 드라이버 폴백을 위해 Chromium 대여")
+            self._drv = self._pool.acquire(role=self.role)
+        return getattr(self._drv, name)
+
+
+def _driver_rss_mb(driver):
+    # chromedriver 프로세스와 그 자식(chromium 렌더러 등)의 RSS 합계
+    try:
+        pid = driver.service.process.pid
+        parent = psutil.Process(pid)
+        procs = [parent] + parent.children(recursive=True)
+        total = 0
+        for proc in procs:
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                continue
+        return total / (1024 * 1024)
+    except Exception:
+        return 0
+
+
+def _quit_driver(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+    # quit 실패 시 남는 좀비 chromium 정리 (extraction.core_utils.kill_driver와 동일한 방식)
+    try:
+        if hasattr(driver, 'service') and driver.service.process:
+            pid = driver.service.process.pid
+            if psutil.pid_exists(pid):
+                parent = psutil.Process(pid)
+                for child in parent.children(recursive=True):
+                    child.kill()
+                parent.kill()
+    except Exception:
+        pass
+
+
+class DriverPool:
+    """
+    대여/반납 방식의 Chromium 드라이버 풀
+    - acquire(): 유휴 드라이버가 있으면 헬스체크 후 재사용, 없으면 새로 생성 (최대 size개)
+    - release(): 페이지 수/메모리 한도를 넘었거나 고장난 드라이버는 종료, 나머지는 유휴 목록으로 반환
+    """
+
+    def __init__(self, size=POOL_SIZE, max_pages=MAX_PAGES_PER_DRIVER, max_rss_mb=MAX_RSS_MB):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self._idle = []
+        self._leased = {}
+        self._created = 0
+        self._cond = threading.Condition()
+
+    def _create(self):
+        return PooledDriver(setup_driver(), pool=self)
+
+    def _over_limit(self, drv, check_rss=True):
+        """재시작이 필요하면 사유, 아니면 None"""
+        if drv.page_count >= self.max_pages:
+            return f"페이지 한도 {self.max_pages}"
+        if check_rss:
+            rss_mb = _driver_rss_mb(drv.raw)
+            if rss_mb > self.max_rss_mb:
+                return f"메모리 {rss_mb:.0f}MB > {self.max_rss_mb}MB"
+        return None
+
+    def recycle(self, drv):
+        """
+        대여 중인 드라이버가 한도를 넘었으면 원본 드라이버만 새로 띄워 교체 (PooledDriver.get에서 페이지를 열기 전에 호출)
+        - 반납하지 않으므로 대여 수/풀 크기는 그대로
+        """
+        check_rss = drv.page_count > 0 and drv.page_count % RSS_CHECK_PAGES == 0
+        reason = self._over_limit(drv, check_rss=check_rss)
+        if reason is None:
+            return
+        logging.info(f"♻️ 대여 중 드라이버 교체 ({reason}, 로드 페이지 {drv.page_count}개)")
+        _quit_driver(drv.raw)
+        drv._driver = setup_driver()
+        drv.page_count = 0
+
+    def _is_healthy(self, drv):
+        try:
+            drv.execute_script("return 1")
+            return bool(drv.window_handles)
+        except Exception:
+            return False
+
+    def _lease(self, drv, role):
+        drv.role = role
+        with self._cond:
+            self._leased[id(drv)] = drv
+        return drv
+
+    def _retire(self, drv, reason):
+        logging.info(f"♻️ 드라이버 재시작 ({reason}, 로드 페이지 {drv.page_count}개)")
+        _quit_driver(drv.raw)
+        with self._cond:
+            self._leased.pop(id(drv), None)
+            self._created -= 1
+            self._cond.notify()
+
+    def acquire(self, role=None, timeout=ACQUIRE_TIMEOUT):
+        while True:
+            with self._cond:
+                while not self._idle and self._created >= self.size:
+                    if not self._cond.wait(timeout):
+                        raise TimeoutError(f"드라이버 대여 대기 시간 초과 ({timeout}초)")
+                if self._idle:
+                    drv = self._idle.pop()
+                else:
+                    drv = None
+                    self._created += 1
+
+            if drv is None:
+                # 크롬 기동은 느리므로 락 밖에서 생성
+                try:
+                    return self._lease(self._create(), role)
+                except Exception:
+                    with self._cond:
+                        self._created -= 1
+                        self._cond.notify()
+                    raise
+
+            if self._is_healthy(drv):
+                return self._lease(drv, role)
+            self._retire(drv, "헬스체크 실패")
+
+    def release(self, drv, broken=False):
+        if drv is None:
+            return
+        if broken:
+            self._retire(drv, "오류 보고")
+            return
+        reason = self._over_limit(drv)
+        if reason is not None:
+            self._retire(drv, reason)
+            return
+
+        with self._cond:
+            self._leased.pop(id(drv), None)
+            self._idle.append(drv)
+            self._cond.notify()
+
+    def warm_up(self, count=None):
+        """
+        크롤러가 드라이버를 요청하기 전에 백그라운드 스레드로 미리 기동 (병렬 기동)
+        """
+        count = self.size if count is None else min(count, self.size)
+
+        def _worker():
+            with self._cond:
+                if self._created >= self.size:
+                    return
+                self._created += 1
+            try:
+                drv = self._create()
+            except Exception as e:
+                logging.error(f"❌ 드라이버 예열 실패: {e}")
+                with self._cond:
+                    self._created -= 1
+                    self._cond.notify()
+                return
+            with self._cond:
+                self._idle.append(drv)
+                self._cond.notify()
+
+        threads = [threading.Thread(target=_worker, daemon=True) for _ in range(count)]
+        for t in threads:
+            t.start()
+        return threads
+
+    def close_all(self):
+        # 반납되지 않은(크롤러 예외로 끝난) 드라이버까지 모두 종료
+        with self._cond:
+            drivers = self._idle + list(self._leased.values())
+            self._idle = []
+            self._leased = {}
+            self._created -= len(drivers)
+        for drv in drivers:
+            _quit_driver(drv.raw)
+
+
+# 프로세스(사이트)당 하나의 풀
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.close_all)
+        return _pool
+
+
+def acquire_driver(role=None):
+    """
+    role: 'list'(목록 페이지용) / 'detail'(상세 페이지용) - 진행 상황 카운터 구분에 사용
+    """
+    if is_http_first():
+        return LazyDriver(get_pool(), role=role)
+    return get_pool().acquire(role=role)
+
+
+def release_driver(drv, broken=False):
+    if isinstance(drv, LazyDriver):
+        drv = drv._drv
+    get_pool().release(drv, broken=broken)
@@ -0,0 +1,204 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+
+from bs4 import BeautifulSoup
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from . import js_extract
+
+# 녹화한 페이지 위치: data/fixtures/pages/<사이트>/<list|detail>/<URL 해시>.html (+ <사이트>/index.json)
+FIXTURE_DIR = os.getenv(
+    "CRAWL_FIXTURE_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'fixtures', 'pages')),
+)
+# [설정] 1이면 크롤링하면서 목록/상세 HTML을 녹화 (파서 리플레이 벤치마크용)
+RECORD = os.getenv("CRAWL_RECORD_FIXTURES", "0") == "1"
+# [설정] 사이트/역할별 최대 녹화 페이지 수
+RECORD_LIMIT = int(os.getenv("CRAWL_RECORD_LIMIT", "30"))
+
+ROLES = ("list", "detail")
+
+
+def _file_name(url):
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()[:16] + '.html'
+
+
+def _index_path(site_dir):
+    return os.path.join(site_dir, 'index.json')
+
+
+def _read_index(site_dir):
+    path = _index_path(site_dir)
+    if not os.path.isfile(path):
+        return {role: {} for role in ROLES}
+    with open(path, encoding='utf-8') as f:
+        index = json.load(f)
+    for role in ROLES:
+        index.setdefault(role, {})
+    return index
+
+
+class FixtureRecorder:
+    """
+    크롤링 중 드라이버/HTTP로 연 페이지의 HTML을 사이트별로 저장
+    - index.json: 역할 -> {URL: 파일명} (리플레이 시 URL로 페이지를 찾음)
+    - 같은 URL은 마지막으로 읽은 HTML로 덮어씀 (렌더링 대기 후 읽은 page_source가 남음)
+    """
+
+    def __init__(self, site_name, base_dir=FIXTURE_DIR, limit=RECORD_LIMIT):
+        self.site_dir = os.path.join(base_dir, site_name)
+        self.limit = limit
+        self._lock = threading.Lock()
+        for role in ROLES:
+            os.makedirs(os.path.join(self.site_dir, role), exist_ok=True)
+        self._index = _read_index(self.site_dir)
+
+    def record(self, role, url, html):
+        if role not in ROLES or not url or not html:
+            return
+        with self._lock:
+            pages = self._index[role]
+            if url not in pages and len(pages) >= self.limit:
+                return
+            pages[url] = _file_name(url)
+            with open(os.path.join(self.site_dir, role, pages[url]), 'w', encoding='utf-8') as f:
+                f.write(html)
+            tmp_path = f'{_index_path(self.site_dir)}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, _index_path(self.site_dir))
+
+
+# 크롤러 프로세스(사이트)당 하나의 녹화기 (RECORD가 꺼져 있으면 None)
+_recorder = None
+
+
+def configure(site_name):
+    global _recorder
+    if RECORD:
+        _recorder = FixtureRecorder(site_name)
+        logging.info(f"[페이지 녹화] {site_name} -> {_recorder.site_dir}")
+
+
+def recording():
+    return _recorder is not None
+
+
+def record(role, url, html):
+    if _recorder is None:
+        return
+    try:
+        _recorder.record(role, url, html)
+    except OSError as e:
+        logging.warning(f"페이지 녹화 실패: {url} ({e})")
+
+
+def snapshot(wd):
+    """브라우저 안에서 DOM을 바꾸는 추출 전에 현재 페이지를 녹화 (PooledDriver.page_source가 기록)"""
+    if _recorder is not None:
+        wd.page_source
+
+
+def sites(base_dir=FIXTURE_DIR):
+    if not os.path.isdir(base_dir):
+        return []
+    return sorted(name for name in os.listdir(base_dir) if os.path.isfile(_index_path(os.path.join(base_dir, name))))
+
+
+def load(site_name, role, base_dir=FIXTURE_DIR):
+    """녹화한 페이지 {URL: HTML}"""
+    site_dir = os.path.join(base_dir, site_name)
+    pages = {}
+    for url, file_name in _read_index(site_dir)[role].items():
+        with open(os.path.join(site_dir, role, file_name), encoding='utf-8') as f:
+            pages[url] = f.read()
+    return pages
+
+
+# find_element 위치 지정 방식 -> CSS 셀렉터 (Selenium이 내부에서 바꾸는 규칙과 같음)
+_LOCATORS = {
+    By.CSS_SELECTOR: lambda value: value,
+    By.CLASS_NAME: lambda value: f'.{value}',
+    By.ID: lambda value: f'[id="{value}"]',
+    By.NAME: lambda value: f'[name="{value}"]',
+    By.TAG_NAME: lambda value: value,
+}
+
+
+class ReplayElement:
+    def __init__(self, tag):
+        self._tag = tag
+
+    @property
+    def text(self):
+        # 브라우저의 렌더링 텍스트 근사 (줄 단위로 공백 정리)
+        return self._tag.get_text('\n', strip=True)
+
+    def get_attribute(self, name):
+        value = self._tag.get(name)
+        return ' '.join(value) if isinstance(value, list) else value
+
+    def click(self):
+        raise WebDriverException("리플레이 드라이버는 클릭을 지원하지 않음")
+
+
+class ReplayDriver:
+    """
+    녹화한 HTML을 돌려주는 드라이버 대역 (브라우저/네트워크 없이 상세 수집 함수 *_crw를 그대로 실행)
+    - get(url): 녹화된 페이지로 교체 (없으면 TimeoutException)
+    - find_element: 요소가 없으면 WebDriverWait가 시간 초과까지 다시 시도하지 않도록 바로 TimeoutException
+    - execute_script: js_extract.DETAIL_SCRIPT만 파이썬 구현으로 실행
+    """
+
+    def __init__(self, pages, role='detail'):
+        self.pages = pages
+        self.role = role
+        self.current_url = None
+        self._html = None
+        self._soup = None
+
+    def get(self, url):
+        if url not in self.pages:
+            raise TimeoutException(f"녹화된 페이지 없음: {url}")
+        self.current_url = url
+        self._html = self.pages[url]
+        self._soup = None
+
+    @property
+    def page_source(self):
+        return self._html
+
+    def _dom(self):
+        if self._soup is None:
+            self._soup = BeautifulSoup(self._html or '', 'html.parser')
+        return self._soup
+
+    def _css(self, by, value):
+        to_css = _LOCATORS.get(by)
+        if to_css is None:
+            raise TimeoutException(f"리플레이 드라이버가 지원하지 않는 위치 지정 방식: {by}")
+        return to_css(value)
+
+    def find_element(self, by=By.ID, value=None):
+        tag = self._dom().select_one(self._css(by, value))
+        if tag is None:
+            raise TimeoutException(f"요소 없음: {by}={value}")
+        return ReplayElement(tag)
+
+    def find_elements(self, by=By.ID, value=None):
+        return [ReplayElement(tag) for tag in self._dom().select(self._css(by, value))]
+
+    def execute_script(self, script, *args):
+        if script == js_extract.DETAIL_SCRIPT:
+            return js_extract.extract_soup(self._dom(), args[0])
+        return None
+
+    def set_page_load_timeout(self, timeout):
+        pass
+
+    def maximize_window(self):
+        pass
@@ -1,18 +1,28 @@
 import os
 import re
-import time
 import logging
 import pandas as pd
-from bs4 import BeautifulSoup
 from datetime import datetime
 
 # 안정적인 로딩을 위한 Selenium 모듈
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 
 # utils.py에서 필요한 함수들 가져오기
-from .utils import setup_driver, save_to_csv, clean_title, result_csv_data
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import checkpoint
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .detail_fetcher import DetailFetcher, is_driver_error
+from .html_parser import parse_soup
+from . import dates
+
+# 검색 목록 작성일: 'YYYY-MM-DD'
+FM_DATE = dates.DateParser('fm', '%Y-%m-%d')
 
 # [상세 페이지 크롤링 함수]
 def fm_crw(wd, url, search, target_date):
@@ -24,11 +34,12 @@ def fm_crw(wd, url, search, target_date):
             WebDriverWait(wd, 10).until(
                 EC.presence_of_element_located((By.CLASS_NAME, "xe_content"))
             )
-        except:
+        except TimeoutException:
+            # DetailFetcher가 도메인 속도를 낮추도록 다시 던짐
             logging.error(f"❌ 페이지 로딩 타임아웃 또는 차단됨: {url}")
-            return
+            raise
 
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
+        soup = parse_soup(wd.page_source)
 
         # 데이터 담을 리스트 초기화
         writer_list = []
@@ -111,6 +122,8 @@ def fm_crw(wd, url, search, target_date):
         logging.info(f"✅ 수집 성공: {cleaned_title[:15]}...")
         
     except Exception as e:
+        if is_driver_error(e):
+            raise
         logging.error(f"상세 페이지 파싱 오류: {e}")
 
 
@@ -123,6 +136,9 @@ def fm_main_crw(searchs, start_date, end_date, stop_event):
     project_root = os.path.abspath(os.path.join(current_dir, '..'))
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
+
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', '에펨코리아', f'에펨코리아_raw data_{target_date}.csv'))
     
     logging.basicConfig(
         filename=os.path.join(log_dir, f'에펨코리아_log_{target_date}.txt'),
@@ -134,15 +150,19 @@ def fm_main_crw(searchs, start_date, end_date, stop_event):
 
     logging.info(f"🚀 에펨코리아 크롤링 시작 (Date: {target_date})")
     
-    wd = setup_driver()     # 목록 탐색용
-    wd_dp1 = setup_driver() # 상세 페이지용
+    wd = acquire_driver(role='list')     # 목록 탐색용
+    fetcher = DetailFetcher() # 상세 페이지 동시 수집용
 
     for search in searchs:
         if stop_event.is_set():
             break
             
-        page_num = 1
+        if checkpoint.is_done(search):
+            continue
+        page_num = checkpoint.resume_page(search)
+        failed = False
         while True:
+            checkpoint.advance(search, page_num)
             try:
                 # https://m.kpedia.jp/w/7006 통합검색(문서 탭) URL 구조 (where=document 필수)
                 url_list_page = (
@@ -161,7 +181,7 @@ def fm_main_crw(searchs, start_date, end_date, stop_event):
                     logging.info("검색 결과 없음 또는 페이지 로딩 실패")
                     break
 
-                soup = BeautifulSoup(wd.page_source, 'html.parser')
+                soup = parse_soup(wd.page_source)
                 
                 # [중요] 게시글 목록(ul.searchResult) 가져오기
                 # 주의: 'comment' 클래스가 포함된 ul은 댓글 검색 결과이므로 제외해야 함
@@ -183,6 +203,7 @@ def fm_main_crw(searchs, start_date, end_date, stop_event):
                     break
 
                 stop_crawling = False
+                page_urls = []
 
                 for li in li_tags:
                     try:
@@ -193,7 +214,7 @@ def fm_main_crw(searchs, start_date, end_date, stop_event):
                             
                         date_str = time_span.get_text().strip()
                         post_date_str = date_str.split(' ')[0] 
-                        post_date = datetime.strptime(post_date_str, '%Y-%m-%d').date()
+                        post_date = FM_DATE.date(post_date_str)
 
                         # 날짜 필터링
                         if post_date > end_date:
@@ -215,33 +236,41 @@ def fm_main_crw(searchs, start_date, end_date, stop_event):
                                 full_url = link_part
                             
                             logging.info(f"url 찾음: {full_url}")
-                            fm_crw(wd_dp1, full_url, search, target_date)
+                            # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                            if seen_urls.should_skip(full_url, search):
+                                if seen_urls.reached_known_run(search):
+                                    stop_crawling = True
+                                    break
+                                continue
+                            # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+                            if post_cache.reuse(full_url, search):
+                                continue
+                            page_urls.append(full_url)
                             
                     except Exception as e:
                         logging.error(f"리스트 아이템 파싱 에러: {e}")
                         continue
 
+                # 목록 페이지에서 찾은 상세 페이지들을 동시 수집
+                fetcher.run(page_urls, fm_crw, search, target_date, stop_event=stop_event)
+
                 if stop_crawling:
                     logging.info(f"설정 기간({start_date}) 이전 데이터 도달. 다음 검색어로 이동.")
                     break
                 
                 page_num += 1
-                time.sleep(1) # 과부하 방지
 
             except Exception as e:
                 logging.error(f"페이지 순회 중 치명적 오류: {e}")
+                failed = True
                 break
 
-    wd.quit()
-    wd_dp1.quit()
+        if failed:
+            checkpoint.pause(search)
+        elif not stop_event.is_set():
+            checkpoint.finish(search)
+
+    release_driver(wd)
     
-    # 결과 병합
-    if not stop_event.is_set():
-            result_dir = os.path.join(project_root, '결과', '에펨코리아')
-            os.makedirs(result_dir, exist_ok=True)
-
-            all_data = pd.concat([
-                result_csv_data(search, platform='에펨코리아', subdir=f'23.에펨코리아/{target_date}', base_path='data/raw')
-                for search in searchs
-            ])
-            all_data.to_csv(os.path.join(result_dir, f'에펨코리아_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
@@ -3,13 +3,32 @@ import re
 import time
 import logging
 import pandas as pd
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from datetime import datetime
 
-from .utils import setup_driver, save_to_csv, clean_title, result_csv_data
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import checkpoint
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .js_extract import ExtractScript, field, STRIP_TEXT_LINKS
+from .html_parser import parse_soup
+from . import dates
+
+# 작성일: 'YYYY-MM-DD'
+FOMOS_DATE = dates.DateParser('fomos', '%Y-%m-%d')
+
+# 상세 페이지는 브라우저 안에서 필드만 추출 (이미지/영상이 없는 링크는 DOM에서 제거)
+FOMOS_DETAIL = ExtractScript(
+    'fomos_detail',
+    title=field('h3', within='div.board_area.common_view'),
+    content=field('div.view_text', separator='\n', strip=True, strip_links=STRIP_TEXT_LINKS),
+    date=field('span', within='p.sub_tit', index=1),
+    writer=field('span', within='p.sub_tit'),
+)
 
 # 한페이지 크롤링
 def fomos_crw(wd, url, search, target_date):
@@ -18,9 +37,8 @@ def fomos_crw(wd, url, search, target_date):
         wd.set_page_load_timeout(10)
         wd.get(f'{url}')
         logging.info(f"접속: {url}")
-        time.sleep(1)
         WebDriverWait(wd, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'view_area')))
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
+        detail = FOMOS_DETAIL.extract(wd)
 
         search_word_list = []
         search_plt_list = []
@@ -30,25 +48,12 @@ def fomos_crw(wd, url, search, target_date):
         content_list = []
         date_list = []
 
-        content_div = soup.find('div', class_='view_text')
-
-        raw_title = soup.find('div', class_='board_area common_view').find('h3').get_text()
+        raw_title = detail['title']
         cleaned_title = clean_title(raw_title)
         title_list.append(cleaned_title)
         logging.info(f"제목 추출 성공: {cleaned_title}")
 
-        # <a> 태그 중 이미지가 없는 경우에만 삭제
-        for a_tag in content_div.find_all('a'):
-            if (
-                    not a_tag.find('img') and
-                    not a_tag.find('span', class_='scrap_img') and
-                    not a_tag.find('video') and
-                    not (a_tag.find('iframe') and 'youtube.com' in a_tag.decode_contents())
-            ):
-                a_tag.decompose()
-
-        post_content = content_div.get_text(separator='\n', strip=True)
-        post_content = re.sub(r'http[s]?://\S+', '', post_content)
+        post_content = re.sub(r'http[s]?://\S+', '', detail['content'])
         post_content = re.sub(r'\n{2,}', '\n', post_content).strip()
 
         content_list.append(post_content)
@@ -58,12 +63,12 @@ def fomos_crw(wd, url, search, target_date):
         url_list.append(url)
         search_word_list.append(search)
 
-        date_str = soup.find('p', class_='sub_tit').find_all('span')[1].text.split(' ')[0]
-        date = datetime.strptime(date_str, '%Y-%m-%d')
+        date_str = detail['date'].split(' ')[0]
+        date = FOMOS_DATE.parse(date_str)
         date_list.append(date)
         logging.info(f"날짜 추출 성공: {date_str}")
 
-        writer_list.append(soup.find('p', class_='sub_tit').find_all('span')[0].text)
+        writer_list.append(detail['writer'])
         now_time = datetime.now().strftime('%Y-%m-%d ')
         
         main_temp = pd.DataFrame({
@@ -100,6 +105,9 @@ def fomos_main_crw(searchs, start_date, end_date, stop_event):
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
 
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', '포모스', f'포모스_raw data_{target_date}.csv'))
+
     logging.basicConfig(
         filename=os.path.join(log_dir, f'포모스_log_{target_date}.txt'),
         level=logging.INFO,
@@ -112,19 +120,23 @@ def fomos_main_crw(searchs, start_date, end_date, stop_event):
     logging.info(f"                    포모스 크롤링 시작 (Date: {target_date})")
     logging.info(f"========================================================")
     
-    wd = setup_driver()
-    wd_dp1 = setup_driver()
+    wd = acquire_driver(role='detail')
+    wd_dp1 = acquire_driver(role='list')
     
     for search in searchs:
         if stop_event.is_set():
             print("🛑 크롤링 중단됨")
             break
 
-        page_num = 1
+        if checkpoint.is_done(search):
+            continue
+        page_num = checkpoint.resume_page(search)
 
+        failed = False
         while True:
             if stop_event.is_set():
                 break
+            checkpoint.advance(search, page_num)
 
             try:
                 logging.info(f"크롤링 시작-검색어: {search}")
@@ -134,7 +146,7 @@ def fomos_main_crw(searchs, start_date, end_date, stop_event):
                 WebDriverWait(wd_dp1, 10).until(
                     EC.presence_of_element_located((By.CLASS_NAME, 'result_section.r_esports')))
                 time.sleep(2)
-                soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
+                soup_dp1 = parse_soup(wd_dp1.page_source)
 
                 # 검색결과 리스트
                 li_tags = soup_dp1.find('ul', class_='webzine').find_all('li')
@@ -148,25 +160,31 @@ def fomos_main_crw(searchs, start_date, end_date, stop_event):
                     url_str = li.find('p', class_='tit').find('a').get('href')
                     url = 'https://www.fomos.kr' + url_str
                     logging.info(f"url 찾음.")
+                    # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                    if seen_urls.should_skip(url, search):
+                        continue
+                    # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+                    if post_cache.reuse(url, search):
+                        continue
                     fomos_crw(wd, url, search, target_date)
 
             except Exception as e:
                 logging.error(f"오류 발생: {e}")
+                failed = True
                 break
 
             page_num += 1
 
             if page_num == 15:
                 break
-    wd.quit()
-    wd_dp1.quit()
-    
-    if not stop_event.is_set():
-        result_dir = os.path.join(project_root, '결과', '포모스')
-        os.makedirs(result_dir, exist_ok=True)
-
-        all_data = pd.concat([
-            result_csv_data(search, platform='포모스', subdir=f'18.포모스/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-        all_data.to_csv(os.path.join(result_dir, f'포모스_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+
+        if failed:
+            checkpoint.pause(search)
+        elif not stop_event.is_set():
+            checkpoint.finish(search)
+
+    release_driver(wd)
+    release_driver(wd_dp1)
+
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
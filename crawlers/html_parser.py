@@ -0,0 +1,145 @@
+import os
+import logging
+
+from bs4 import BeautifulSoup
+import soupsieve
+
+from . import metrics
+
+# lxml(+cssselect)이 있으면 C 기반 파서/셀렉터 사용, 없으면 기존 BeautifulSoup(html.parser)로 동작
+try:
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    lxml = None
+
+# [설정] 파서 백엔드 선택: lxml / bs4 (기본: lxml 사용 가능하면 lxml)
+BACKEND = os.getenv("CRAWL_HTML_PARSER", "lxml" if lxml is not None else "bs4")
+if BACKEND == "lxml" and lxml is None:
+    logging.warning("lxml/cssselect가 없어 BeautifulSoup 파서로 동작합니다.")
+    BACKEND = "bs4"
+
+if lxml is not None:
+    _UTF8_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+# select/select_one에서 node를 생략하면 페이지 전체에서 찾음 (None을 넘기면 빈 결과)
+_ROOT = object()
+
+# compile_selectors로 만든 사이트별 셀렉터 묶음 (벤치마크에서 이름으로 찾음)
+REGISTRY = {}
+
+# 텍스트에 넣지 않는 태그 (js_extract의 DETAIL_SCRIPT와 같은 목록)
+_SKIP_TAGS = {'script', 'style', 'template', 'noscript'}
+
+
+def _iter_text(node):
+    """lxml 요소의 텍스트 조각 (itertext와 같은 순서, 주석과 script/style 등 하위 트리는 제외하고 꼬리 텍스트는 포함)"""
+    if not isinstance(node.tag, str) or node.tag.lower() in _SKIP_TAGS:
+        return
+    if node.text:
+        yield node.text
+    for child in node:
+        yield from _iter_text(child)
+        if child.tail:
+            yield child.tail
+
+
+class Page:
+    """파싱된 페이지 + 미리 컴파일된 셀렉터로 요소 찾기 (백엔드와 관계없이 같은 사용법)"""
+
+    def __init__(self, root, selectors, backend):
+        self.root = root
+        self._selectors = selectors
+        self._backend = backend
+
+    def select(self, key, node=_ROOT):
+        if node is None:
+            return []
+        node = self.root if node is _ROOT else node
+        selector = self._selectors[key]
+        if self._backend == "lxml":
+            return selector(node)
+        return selector.select(node)
+
+    def select_one(self, key, node=_ROOT):
+        if node is None:
+            return None
+        node = self.root if node is _ROOT else node
+        selector = self._selectors[key]
+        if self._backend == "lxml":
+            found = selector(node)
+            return found[0] if found else None
+        return selector.select_one(node)
+
+    def text(self, node, separator='', strip=False):
+        """BeautifulSoup의 get_text(separator, strip)과 같은 결과"""
+        if node is None:
+            return None
+        if self._backend != "lxml":
+            return node.get_text(separator=separator, strip=strip)
+        parts = _iter_text(node)
+        if strip:
+            parts = (p.strip() for p in parts)
+            parts = (p for p in parts if p)
+        return separator.join(parts)
+
+    def attr(self, node, name):
+        if node is None:
+            return None
+        return node.get(name)
+
+    def own_text(self, node):
+        """자식 태그를 제외한 요소 바로 아래 텍스트만"""
+        if self._backend != "lxml":
+            return ''.join(t for t in node.contents if isinstance(t, str))
+        texts = [node.text or '']
+        texts.extend(child.tail or '' for child in node)
+        return ''.join(texts)
+
+    def remove(self, node):
+        """요소 제거 (뒤에 이어지는 텍스트는 유지)"""
+        if self._backend == "lxml":
+            node.drop_tree()
+        else:
+            node.decompose()
+
+
+class SelectorSet:
+    """
+    사이트별 CSS 셀렉터 묶음 (모듈 import 시 한 번만 컴파일)
+    - lxml: cssselect로 XPath 변환 후 컴파일 (libxml2에서 실행)
+    - bs4: soupsieve로 컴파일
+    """
+
+    def __init__(self, name, backend=None, **css):
+        self.name = name
+        self.css = css
+        self.backend = backend or BACKEND
+        if self.backend == "lxml":
+            self._compiled = {key: CSSSelector(sel) for key, sel in css.items()}
+        else:
+            self._compiled = {key: soupsieve.compile(sel) for key, sel in css.items()}
+
+    def parse(self, html):
+        with metrics.timer('parse'):
+            if self.backend == "lxml":
+                try:
+                    root = lxml.html.document_fromstring(html)
+                except ValueError:
+                    # <?xml encoding=...?> 선언이 있는 문자열은 lxml이 거부하므로 바이트로 파싱
+                    root = lxml.html.document_fromstring(html.encode('utf-8'), parser=_UTF8_PARSER)
+            else:
+                root = BeautifulSoup(html, 'html.parser')
+        return Page(root, self._compiled, self.backend)
+
+
+def parse_soup(html):
+    """기존 크롤러용 BeautifulSoup(html.parser) 파싱 (파싱 시간을 지표에 기록)"""
+    with metrics.timer('parse'):
+        return BeautifulSoup(html, 'html.parser')
+
+
+def compile_selectors(name, **css):
+    selector_set = SelectorSet(name, **css)
+    REGISTRY[name] = selector_set
+    return selector_set
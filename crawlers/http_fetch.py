@@ -0,0 +1,139 @@
+import os
+import time
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+from . import metrics
+from . import fixtures
+from . import progress
+from . import rate_limiter
+from .html_parser import parse_soup
+
+# [설정] HTTP 우선 모드 (crawl_all_sites.py의 사이트별 http_first 플래그로 설정됨)
+_http_first = os.getenv("CRAWL_HTTP_FIRST", "0") == "1"
+
+# 봇 차단/캡차 페이지 판별용 문구
+BOT_WALL_MARKERS = [
+    'captcha_wrapper',
+    'g-recaptcha',
+    'cf-browser-verification',
+    'challenge-platform',
+    'Just a moment...',
+    '자동입력 방지',
+    '비정상적인 접근',
+]
+
+# setup_driver와 동일한 브라우저 헤더 (봇 의심 방지)
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+
+
+def _build_session():
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    retry = Retry(total=2, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# 프로세스(사이트)당 하나의 커넥션 풀 세션 (Keep-Alive 재사용)
+session = _build_session()
+
+
+def set_http_first(enabled):
+    global _http_first
+    _http_first = bool(enabled)
+
+
+def is_http_first():
+    return _http_first
+
+
+def is_bot_wall(html):
+    return any(marker in html for marker in BOT_WALL_MARKERS)
+
+
+def fetch_html(url, timeout=10, role=None):
+    """
+    requests로 HTML 가져오기 (실패/차단 시 None)
+    - role: 요청 시간을 기록할 구간 ('list' -> list_fetch, 'detail' -> detail_fetch)
+    """
+    rate_limiter.wait(url)
+    try:
+        with metrics.timer(metrics.fetch_phase(role)):
+            res = session.get(url, timeout=timeout)
+    except requests.RequestException as e:
+        logging.warning(f"HTTP 요청 실패: {url} ({e})")
+        return None
+
+    if res.status_code == 429:
+        rate_limiter.backoff(url, '429')
+        logging.warning(f"HTTP 429 (요청 과다): {url}")
+        return None
+    if res.status_code != 200:
+        logging.warning(f"HTTP 응답 코드 {res.status_code}: {url}")
+        return None
+
+    # charset 헤더가 없으면 requests가 ISO-8859-1로 가정하므로 본문 기준으로 재추정 (euc-kr 사이트 대응)
+    if res.encoding is None or res.encoding.lower() == 'iso-8859-1':
+        res.encoding = res.apparent_encoding
+
+    html = res.text
+    if is_bot_wall(html):
+        rate_limiter.backoff(url, 'captcha')
+        logging.warning(f"봇 차단 페이지 감지: {url}")
+        return None
+    rate_limiter.success(url)
+    fixtures.record(role, url, html)
+    return html
+
+
+def fetch_soup(url, selector, timeout=10, role=None):
+    """
+    HTTP 우선 모드일 때만 requests로 파싱 (셀렉터가 없거나 차단되면 None -> 드라이버로 폴백)
+    """
+    if not _http_first:
+        return None
+
+    html = fetch_html(url, timeout=timeout, role=role)
+    if html is None:
+        return None
+
+    soup = parse_soup(html)
+    if soup.select_one(selector) is None:
+        logging.info(f"HTTP 응답에 '{selector}' 없음 -> 드라이버로 재시도: {url}")
+        return None
+    progress.page_loaded(role)
+    return soup
+
+
+def load_page(wd, url, selector, timeout=10, render_wait=1):
+    """
+    페이지를 BeautifulSoup으로 반환
+    - HTTP 우선 모드: requests로 먼저 시도
+    - 실패 시(또는 HTTP 모드가 아닐 때): 기존처럼 드라이버로 열고 selector가 뜰 때까지 대기
+    """
+    soup = fetch_soup(url, selector, timeout=timeout, role=getattr(wd, 'role', None))
+    if soup is not None:
+        return soup
+
+    wd.get(url)
+    try:
+        WebDriverWait(wd, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+    except TimeoutException:
+        rate_limiter.backoff(url, 'empty')
+        raise
+    if render_wait:
+        time.sleep(render_wait)
+    return parse_soup(wd.page_source)
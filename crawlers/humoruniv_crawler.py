@@ -3,13 +3,31 @@ import re
 import time
 import logging
 import pandas as pd
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from datetime import datetime
 
-from .utils import setup_driver, save_to_csv, clean_title, result_csv_data
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import checkpoint
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .dom_extract import IncrementalList
+from .html_parser import parse_soup
+from . import dates
+
+# 작성일: 'YYYY-MM-DD'
+HUMORUNIV_DATE = dates.DateParser('humoruniv', '%Y-%m-%d')
+
+# 검색 결과 테이블 (페이지를 넘길 때마다 새로 나타난 결과만 추출)
+HUMORUNIV_LIST_ITEMS = ('table[width="100%"][border="0"][cellspacing="0"][cellpadding="5"]'
+                        '[bordercolor="#666666"][style="border-collapse:collapse;"]')
+HUMORUNIV_LIST_FIELDS = {
+    'date': ('font.gray', None),
+    'href': ('a', 'href'),
+}
 
 # 한페이지 크롤링
 def humoruniv_crw(wd, url, search, target_date):
@@ -18,9 +36,8 @@ def humoruniv_crw(wd, url, search, target_date):
         wd.set_page_load_timeout(10)
         wd.get(f'{url}')
         logging.info(f"접속: {url}")
-        time.sleep(1)
         WebDriverWait(wd, 10).until(EC.presence_of_element_located((By.ID, 'cnts')))
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
+        soup = parse_soup(wd.page_source)
 
         search_word_list = []
         search_plt_list = []
@@ -52,7 +69,7 @@ def humoruniv_crw(wd, url, search, target_date):
         search_word_list.append(search)
 
         date_str = tb.find('div', id='content_info').find_all('span')[4].get_text().strip().split(' ')[0]
-        date = datetime.strptime(date_str, '%Y-%m-%d')
+        date = HUMORUNIV_DATE.parse(date_str)
         date_list.append(date)
         logging.info(f"날짜 추출 성공: {date_str}")
 
@@ -93,6 +110,9 @@ def humoruniv_main_crw(searchs, start_date, end_date, stop_event):
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
 
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', '웃긴대학', f'웃긴대학_raw data_{target_date}.csv'))
+
     logging.basicConfig(
         filename=os.path.join(log_dir, f'웃긴대학_log_{target_date}.txt'),
         level=logging.INFO,
@@ -105,13 +125,16 @@ def humoruniv_main_crw(searchs, start_date, end_date, stop_event):
     logging.info(f"             웃긴대학 크롤링 시작 (Date: {target_date})")
     logging.info(f"========================================================")
     
-    wd = setup_driver()
-    wd_dp1 = setup_driver()
+    wd = acquire_driver(role='detail')
+    wd_dp1 = acquire_driver(role='list')
     
     for search in searchs:
         if stop_event.is_set():
             print("🛑 크롤링 중단됨")
             break
+        if checkpoint.is_done(search):
+            continue
+        failed = False
         while True:
             if stop_event.is_set():
                 break
@@ -133,19 +156,12 @@ def humoruniv_main_crw(searchs, start_date, end_date, stop_event):
                     logging.error(f"검색 실패: {e}")
                 time.sleep(3)
 
-                soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
+                listing = IncrementalList(wd_dp1, HUMORUNIV_LIST_ITEMS, HUMORUNIV_LIST_FIELDS)
 
                 date_flag = False
                 after_start_date = False
 
-                tables = soup_dp1.find_all('table', {
-                    'width': '100%',
-                    'border': '0',
-                    'cellspacing': '0',
-                    'cellpadding': '5',
-                    'bordercolor': '#666666',
-                    'style': 'border-collapse:collapse;'
-                })
+                tables = listing.new_items()
                 logging.info(f"검색목록 찾음.")
                 
                 while True:
@@ -158,8 +174,8 @@ def humoruniv_main_crw(searchs, start_date, end_date, stop_event):
                         date_flag = False
 
                         try:
-                            date_str = tb.find('font', class_='gray').text.split(' ')[0]
-                            date = datetime.strptime(date_str, '%Y-%m-%d').date()
+                            date_str = tb['date'].split(' ')[0]
+                            date = HUMORUNIV_DATE.date(date_str)
                         except:
                             continue
 
@@ -168,8 +184,14 @@ def humoruniv_main_crw(searchs, start_date, end_date, stop_event):
 
                         if start_date <= date <= end_date:
                             date_flag = True
-                            url = 'https:' + tb.find('a').get('href')
+                            url = 'https:' + tb['href']
                             logging.info(f"url 찾음.")
+                            # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                            if seen_urls.should_skip(url, search):
+                                continue
+                            # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+                            if post_cache.reuse(url, search):
+                                continue
                             humoruniv_crw(wd, url, search, target_date)
 
                     if not after_start_date and not date_flag:
@@ -179,15 +201,8 @@ def humoruniv_main_crw(searchs, start_date, end_date, stop_event):
                     try:
                         wd_dp1.find_element(By.CSS_SELECTOR, "def arrow").click()
                         time.sleep(3)
-                        soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
-                        tables = soup_dp1.find_all('table', {
-                            'width': '100%',
-                            'border': '0',
-                            'cellspacing': '0',
-                            'cellpadding': '5',
-                            'bordercolor': '#666666',
-                            'style': 'border-collapse:collapse;'
-                        })
+                        # 다음 페이지로 바뀐 결과 (이전 페이지 항목은 이미 표시돼 있어 제외됨)
+                        tables = listing.new_items()
                         logging.info("다음 페이지로 이동 및 파싱 완료")
                     except Exception as e:
                         logging.error(f"페이징 오류 발생: {e}")
@@ -195,20 +210,19 @@ def humoruniv_main_crw(searchs, start_date, end_date, stop_event):
 
             except Exception as e:
                 logging.error(f"오류 발생: {e}")
+                failed = True
                 break
 
             if not after_start_date and not date_flag:
                 break
 
-    wd.quit()
-    wd_dp1.quit()
+        if failed:
+            checkpoint.pause(search)
+        elif not stop_event.is_set():
+            checkpoint.finish(search)
 
-    if not stop_event.is_set():
-        result_dir = os.path.join(project_root, '결과', '웃긴대학')
-        os.makedirs(result_dir, exist_ok=True)
+    release_driver(wd)
+    release_driver(wd_dp1)
 
-        all_data = pd.concat([
-            result_csv_data(search, platform='웃긴대학', subdir=f'11.웃긴대학/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-        all_data.to_csv(os.path.join(result_dir, f'웃긴대학_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
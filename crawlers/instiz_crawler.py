@@ -1,49 +1,34 @@
 import os
 import re
-import random
 import time
 import logging
 import pandas as pd
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
-from dateutil.relativedelta import relativedelta
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, WebDriverException
-from datetime import datetime, timedelta
+from datetime import datetime
 
-from .utils import setup_driver, save_to_csv, result_csv_data
+from .utils import save_to_csv
+from . import csv_writer
+from . import checkpoint
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .dom_extract import IncrementalList
+from .html_parser import parse_soup
+from . import dates
 
+# 검색 결과 작성일: ' - 2024/01/19', ' - 2024. 01. 19' 또는 '3시간 전', '어제', '2개월 전' (상대 시간)
+INSTIZ_DATE = dates.DateParser('instiz', '%Y/%m/%d', '%Y. %m. %d')
 
-def parse_date(date_str):
-    try:
-        if "어제" in date_str:
-            return (datetime.now() - timedelta(days=1)).date()
-        if "일 전" in date_str:
-            days_ago = int(date_str.split("일 전")[0].strip())
-            return (datetime.now() - timedelta(days=days_ago)).date()
-        if "시간 전" in date_str:
-            hours_ago = int(date_str.split("시간 전")[0].strip())
-            return (datetime.now() - timedelta(hours=hours_ago)).date()
-        if "분 전" in date_str:
-            minutes_ago = int(date_str.split("분 전")[0].strip())
-            return (datetime.now() - timedelta(minutes=minutes_ago)).date()
-        if "개월 전" in date_str:
-            months_ago = int(date_str.split("개월 전")[0].strip())
-            return (datetime.now() - relativedelta(months=months_ago)).date()
-        if "/" in date_str:
-            return datetime.strptime(date_str.replace(" - ", "").strip(), '%Y/%m/%d').date()
-        return datetime.strptime(date_str.replace(" - ", "").strip(), '%Y. %m. %d').date()
-    except Exception as e:
-        logging.error(f"날짜 파싱 오류: {e} :: 원본 날짜: {date_str}")
-        return None
-
-
-def random_sleep(min_time=1, max_time=3):
-    sleep_time = random.uniform(min_time, max_time)
-    logging.info(f"랜덤 대기 시간: {sleep_time:.2f}초")
-    time.sleep(sleep_time)
+# 검색 결과 (더보기로 새로 붙은 결과만 추출)
+INSTIZ_LIST_ITEMS = 'div.result_search'
+INSTIZ_LIST_FIELDS = {
+    'date': ('span.search_content span.minitext3', None),
+    'href': ('a', 'href'),
+}
 
 
 # 한페이지 크롤링
@@ -54,10 +39,10 @@ def instiz_crw(wd, url, search, date, target_date):
         wd.get(f'{url}')
         logging.info(f"접속: {url}")
 
+        # 요청 간격은 PooledDriver.get의 도메인별 rate_limiter가 맞춤
         WebDriverWait(wd, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'memo_content')))
-        random_sleep(2, 5)
 
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
+        soup = parse_soup(wd.page_source)
 
         search_word_list = []
         search_plt_list = []
@@ -138,9 +123,9 @@ def instiz_crw(wd, url, search, date, target_date):
         return None
 
 
-def result_soup(wd, wd_dp1, start_date, end_date, search, collected_urls, stop_event, target_date):
-    soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
-    div_tags = soup_dp1.find_all('div', class_='result_search')
+def result_list(wd, listing, start_date, end_date, search, collected_urls, stop_event, target_date):
+    """더보기로 새로 붙은 검색 결과만 처리 (시작일 이전 게시물을 만나면 True)"""
+    div_tags = listing.new_items()
     logging.info(f"검색목록 찾음.")
     
     after_start_date = False
@@ -151,8 +136,8 @@ def result_soup(wd, wd_dp1, start_date, end_date, search, collected_urls, stop_e
         after_start_date = False
 
         try:
-            date_str = div.find('span', class_='search_content').find('span', class_='minitext3').text
-            date = parse_date(date_str)
+            date_str = div['date']
+            date = INSTIZ_DATE.date(date_str.replace(" - ", "").strip(" -"), default=None)
             if date is None:
                 logging.info(f"날짜 파싱 실패: {date_str}")
                 continue
@@ -167,12 +152,21 @@ def result_soup(wd, wd_dp1, start_date, end_date, search, collected_urls, stop_e
             after_start_date = True
             break
 
-        url = div.find('a').get('href')
+        url = div['href']
         if url not in collected_urls:
             if stop_event.is_set():
                 break
             logging.info(f"url 찾음: {url}")
             collected_urls.add(url)
+            # 이전 실행에서 이미 저장한 게시물은 건너뜀
+            if seen_urls.should_skip(url, search):
+                if seen_urls.reached_known_run(search):
+                    after_start_date = True
+                    break
+                continue
+            # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+            if post_cache.reuse(url, search):
+                continue
             instiz_crw(wd, url, search, date, target_date)
 
     return after_start_date
@@ -187,6 +181,9 @@ def instiz_main_crw(searchs, start_date, end_date, stop_event):
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
 
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', '인스티즈', f'인스티즈_raw data_{target_date}.csv'))
+
     logging.basicConfig(
         filename=os.path.join(log_dir, f'인스티즈_log_{target_date}.txt'),
         level=logging.INFO,
@@ -199,8 +196,8 @@ def instiz_main_crw(searchs, start_date, end_date, stop_event):
     logging.info(f"                    인스티즈 크롤링 시작 (Date: {target_date})")
     logging.info(f"========================================================")
     
-    wd = setup_driver()
-    wd_dp1 = setup_driver()
+    wd = acquire_driver(role='detail')
+    wd_dp1 = acquire_driver(role='list')
 
     category = ['pt', 'name', 'name_enter']
     
@@ -208,6 +205,9 @@ def instiz_main_crw(searchs, start_date, end_date, stop_event):
         if stop_event.is_set():
             print("🛑 크롤링 중단됨")
             break
+        if checkpoint.is_done(search):
+            continue
+        failed = False
         for cate in category:
             if stop_event.is_set():
                 break
@@ -220,40 +220,46 @@ def instiz_main_crw(searchs, start_date, end_date, stop_event):
                 WebDriverWait(wd_dp1, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'search_container')))
                 time.sleep(1)
 
+                listing = IncrementalList(wd_dp1, INSTIZ_LIST_ITEMS, INSTIZ_LIST_FIELDS)
+
                 while True:
                     if stop_event.is_set():
                         break
                     
-                    after_start_date = result_soup(wd, wd_dp1, start_date, end_date, search, collected_urls, stop_event, target_date)
+                    after_start_date = result_list(wd, listing, start_date, end_date, search, collected_urls, stop_event, target_date)
 
-                    if after_start_date:
+                    # 시작일 이전에 도달했거나 더보기를 눌러도 새 결과가 없으면 종료
+                    if after_start_date or not listing.last_count:
+                        break
+                    try:
+                        logging.info("더보기 버튼 클릭.")
+                        more_button = wd_dp1.find_element(By.CSS_SELECTOR, "div.morebutton a")
+                        actions = ActionChains(wd_dp1)
+                        actions.move_to_element(more_button).perform()
+                        more_button.click()
+                    except Exception as e:
+                        logging.error(f"더보기 버튼 오류 :: 검색어: {search}, 오류: {e}")
                         break
-                    else:
-                        try:
-                            logging.info("더보기 버튼 클릭.")
-                            more_button = wd_dp1.find_element(By.CSS_SELECTOR, "div.morebutton a")
-                            actions = ActionChains(wd_dp1)
-                            actions.move_to_element(more_button).perform()
-                            more_button.click()
-                            random_sleep(2, 5)
-                            result_soup(wd, wd_dp1, start_date, end_date, search, collected_urls, stop_event, target_date)
-                        except Exception as e:
-                            logging.error(f"더보기 버튼 오류 :: 검색어: {search}, 오류: {e}")
-                            break
+                    # 고정 대기 대신 새 결과 행이 붙을 때까지만 대기 (안 붙으면 다음 추출에서 새 항목 0개 -> 종료)
+                    try:
+                        WebDriverWait(wd_dp1, 5).until(
+                            lambda d: len(d.find_elements(By.CSS_SELECTOR, INSTIZ_LIST_ITEMS)) > listing.total
+                        )
+                    except TimeoutException:
+                        logging.info(f"더보기 후 새 결과 없음 :: 검색어: {search}")
 
             except Exception as e:
                 logging.error(f"오류 발생: {e}")
+                failed = True
                 break
+
+        if failed:
+            checkpoint.pause(search)
+        elif not stop_event.is_set():
+            checkpoint.finish(search)
                 
-    wd.quit()
-    wd_dp1.quit()
-    
-    if not stop_event.is_set():
-        result_dir = os.path.join(project_root, '결과', '인스티즈')
-        os.makedirs(result_dir, exist_ok=True)
-
-        all_data = pd.concat([
-            result_csv_data(search, platform='인스티즈', subdir=f'7.인스티즈/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-        all_data.to_csv(os.path.join(result_dir, f'인스티즈_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+    release_driver(wd)
+    release_driver(wd_dp1)
+
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
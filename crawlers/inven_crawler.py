@@ -1,16 +1,23 @@
 import re
 import os
-import time
 import logging
-import random
 import pandas as pd
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from datetime import datetime
 
-from .utils import setup_driver, save_to_csv, clean_title, result_csv_data
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import checkpoint
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .html_parser import parse_soup
+from . import dates
+
+# 작성일: 'YYYY-MM-DD HH:MM'
+INVEN_DATE = dates.DateParser('inven', '%Y-%m-%d %H:%M')
 
 
 def inven_crw(wd, url, search, target_date):
@@ -18,9 +25,7 @@ def inven_crw(wd, url, search, target_date):
         logging.info(f"크롤링 시작:{search}: {url}")
         wd.get(f'{url}')
         WebDriverWait(wd, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'articleTitle')))
-        sleep_random_time = random.uniform(2, 4)
-        time.sleep(sleep_random_time)
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
+        soup = parse_soup(wd.page_source)
 
         writer_list = []
         title_list = []
@@ -47,7 +52,7 @@ def inven_crw(wd, url, search, target_date):
         search_word_list.append(search)
 
         date_str = soup.find('div', class_='articleDate').get_text()
-        date = datetime.strptime(date_str, '%Y-%m-%d %H:%M')
+        date = INVEN_DATE.parse(date_str)
         date_list.append(date)
         
         writer_list.append(soup.find('div', class_="articleWriter").get_text().strip())
@@ -87,6 +92,9 @@ def inven_main_crw(searchs, start_date, end_date, stop_event):
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
 
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', '인벤', f'인벤_raw data_{target_date}.csv'))
+
     logging.basicConfig(
         filename=os.path.join(log_dir, f'인벤_log_{target_date}.txt'),
         level=logging.INFO,
@@ -99,28 +107,30 @@ def inven_main_crw(searchs, start_date, end_date, stop_event):
     logging.info(f"                    인벤 크롤링 시작 (Date: {target_date})")
     logging.info(f"========================================================")
     
-    wd = setup_driver()
-    wd_dp1 = setup_driver()
+    wd = acquire_driver(role='detail')
+    wd_dp1 = acquire_driver(role='list')
     
     for search in searchs:
         if stop_event.is_set():
             print("🛑 크롤링 중단됨")
             break
-        page_num = 1
+        if checkpoint.is_done(search):
+            continue
+        page_num = checkpoint.resume_page(search)
         start_date_str = start_date.strftime('%Y%m%d')
         end_date_str = end_date.strftime('%Y%m%d')
         
+        failed = False
         while True:
             if stop_event.is_set():
                 break
+            checkpoint.advance(search, page_num)
             try:
                 url_dp1 = f'https://www.inven.co.kr/search/webzine/article/{search}/{page_num}?sDate={start_date_str}&eDate={end_date_str}&dt=s'
                 logging.info(f"접속: {url_dp1}")
                 wd_dp1.get(url_dp1)
                 WebDriverWait(wd_dp1, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'section_body')))
-                sleep_random_time = random.uniform(1, 3)
-                time.sleep(sleep_random_time)
-                soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
+                soup_dp1 = parse_soup(wd_dp1.page_source)
 
                 noresult = soup_dp1.find('ul', class_='noresult')
                 if noresult:
@@ -138,6 +148,12 @@ def inven_main_crw(searchs, start_date, end_date, stop_event):
                         break
                     url = li.find('a', class_='name').get('href')
                     logging.info(f"url 찾음 : {url}")
+                    # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                    if seen_urls.should_skip(url, search):
+                        continue
+                    # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+                    if post_cache.reuse(url, search):
+                        continue
                     inven_crw(wd, url, search, target_date)
 
                 if page_num >= max_page_num:
@@ -145,18 +161,17 @@ def inven_main_crw(searchs, start_date, end_date, stop_event):
 
             except Exception as e:
                 logging.error(f"오류 발생: {e}")
+                failed = True
                 break
             page_num += 1
+
+        if failed:
+            checkpoint.pause(search)
+        elif not stop_event.is_set():
+            checkpoint.finish(search)
             
-    wd.quit()
-    wd_dp1.quit()
-
-    if not stop_event.is_set():
-        result_dir = os.path.join(project_root, '결과', '인벤')
-        os.makedirs(result_dir, exist_ok=True)
-
-        all_data = pd.concat([
-            result_csv_data(search, platform='인벤', subdir=f'3.인벤/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-        all_data.to_csv(os.path.join(result_dir, f'인벤_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+    release_driver(wd)
+    release_driver(wd_dp1)
+
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
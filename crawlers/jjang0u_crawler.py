@@ -3,13 +3,32 @@ import re
 import time
 import logging
 import pandas as pd
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from datetime import datetime
 
-from .utils import setup_driver, save_to_csv, clean_title, result_csv_data
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import checkpoint
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .js_extract import ExtractScript, field, STRIP_ALL_LINKS
+from .html_parser import parse_soup
+from . import dates
+
+# 작성일: 상세 '작성일 YY.MM.DD' / 목록 'YYYY-MM-DD'
+JJANG0U_DATE = dates.DateParser('jjang0u', '%y.%m.%d', '%Y-%m-%d')
+
+# 상세 페이지는 브라우저 안에서 필드만 추출 (본문 링크는 DOM에서 제거)
+JJANG0U_DETAIL = ExtractScript(
+    'jjang0u_detail',
+    title=field('h2#view_title'),
+    content=field('section#post_content', separator='\n', strip=True, strip_links=STRIP_ALL_LINKS),
+    date=field('span.date', within='div.left'),
+    writer=field('span.global-nick a', within='div.left'),
+)
 
 
 def jjang0u_crw(wd, url, search, target_date):
@@ -18,9 +37,8 @@ def jjang0u_crw(wd, url, search, target_date):
         wd.set_page_load_timeout(10)
         wd.get(f'{url}')
         logging.info(f"접속: {url}")
-        time.sleep(1)
         WebDriverWait(wd, 10).until(EC.presence_of_element_located((By.ID, 'container')))
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
+        detail = JJANG0U_DETAIL.extract(wd)
 
         search_word_list = []
         search_plt_list = []
@@ -30,18 +48,12 @@ def jjang0u_crw(wd, url, search, target_date):
         content_list = []
         date_list = []
 
-        content_div = soup.find('section', id='post_content')
-
-        raw_title = soup.find('h2', id='view_title').get_text()
+        raw_title = detail['title']
         cleaned_title = clean_title(raw_title)
         title_list.append(cleaned_title)
         logging.info(f"제목 추출 성공: {cleaned_title}")
 
-        for a_tag in content_div.find_all('a'):
-            a_tag.decompose()
-
-        post_content = content_div.get_text(separator='\n', strip=True)
-        post_content = re.sub(r'https?://\S+', '', post_content)
+        post_content = re.sub(r'https?://\S+', '', detail['content'])
         post_content = re.sub(r'\n{2,}', '\n', post_content).strip()
 
         content_list.append(post_content)
@@ -51,14 +63,14 @@ def jjang0u_crw(wd, url, search, target_date):
         url_list.append(url)
         search_word_list.append(search)
 
-        date_str = soup.find('div', class_='left').find('span', class_='date').text
+        date_str = detail['date']
         date_re_str = re.search(r'작성일 (\d{2}\.\d{2}\.\d{2})', date_str)
         original_date = date_re_str.group(1)
-        formatted_date = datetime.strptime(original_date, '%y.%m.%d').strftime('%Y-%m-%d')
-        date_list.append(formatted_date)
-        logging.info(f"날짜 추출 성공: {formatted_date}")
+        date = JJANG0U_DATE.parse(original_date)
+        date_list.append(date)
+        logging.info(f"날짜 추출 성공: {date:%Y-%m-%d}")
 
-        writer_list.append(soup.find('div', class_='left').find('span', class_='global-nick').find('a').text)
+        writer_list.append(detail['writer'])
         now_time = datetime.now().strftime('%Y-%m-%d ')
         main_temp = pd.DataFrame({
             "검색어": search_word_list,
@@ -94,6 +106,9 @@ def jjang0u_main_crw(searchs, start_date, end_date, stop_event):
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
 
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', '짱공유닷컴', f'짱공유닷컴_raw data_{target_date}.csv'))
+
     logging.basicConfig(
         filename=os.path.join(log_dir, f'짱공유닷컴_log_{target_date}.txt'),
         level=logging.INFO,
@@ -106,18 +121,22 @@ def jjang0u_main_crw(searchs, start_date, end_date, stop_event):
     logging.info(f"                    짱공유닷컴 크롤링 시작 (Date: {target_date})")
     logging.info(f"========================================================")
     
-    wd = setup_driver()
-    wd_dp1 = setup_driver()
+    wd = acquire_driver(role='detail')
+    wd_dp1 = acquire_driver(role='list')
     
     for search in searchs:
         if stop_event.is_set():
             print("🛑 크롤링 중단됨")
             break
-        page_num = 1
+        if checkpoint.is_done(search):
+            continue
+        page_num = checkpoint.resume_page(search)
 
+        failed = False
         while True:
             if stop_event.is_set():
                 break
+            checkpoint.advance(search, page_num)
             after_start_date = False
             try:
                 logging.info(f"크롤링 시작-검색어: {search}")
@@ -126,7 +145,7 @@ def jjang0u_main_crw(searchs, start_date, end_date, stop_event):
                 WebDriverWait(wd_dp1, 10).until(EC.presence_of_element_located((By.ID, 'search-container')))
                 time.sleep(1)
 
-                soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
+                soup_dp1 = parse_soup(wd_dp1.page_source)
                 li_tags = soup_dp1.find('ul', class_='search-result__list search-result__document').find_all('li')
                 logging.info(f"검색목록 찾음.")
 
@@ -142,7 +161,7 @@ def jjang0u_main_crw(searchs, start_date, end_date, stop_event):
 
                         if match:
                             original_date = match.group(1)
-                            date = datetime.strptime(original_date, '%Y-%m-%d').date()
+                            date = JJANG0U_DATE.date(original_date)
                             logging.info(f"[{search}] 파싱된 날짜: {date}")
                         else:
                             logging.warning(f"[{search}] 날짜 매칭 실패: {date_str}")
@@ -160,6 +179,15 @@ def jjang0u_main_crw(searchs, start_date, end_date, stop_event):
 
                     url = 'https://www.jjang0u.com' + li.find('a', class_='title').get('href')
                     logging.info(f"url 찾음.")
+                    # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                    if seen_urls.should_skip(url, search):
+                        if seen_urls.reached_known_run(search):
+                            after_start_date = True
+                            break
+                        continue
+                    # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+                    if post_cache.reuse(url, search):
+                        continue
                     jjang0u_crw(wd, url, search, target_date)
 
                 if after_start_date:
@@ -170,18 +198,16 @@ def jjang0u_main_crw(searchs, start_date, end_date, stop_event):
             except Exception as e:
                 print(f"오류 발생: {e}")
                 logging.error(f"오류 발생: {e}")
+                failed = True
                 break
 
-    wd.quit()
-    wd_dp1.quit()
-    
-    if not stop_event.is_set():
-        result_dir = os.path.join(project_root, '결과', '짱공유닷컴')
-        os.makedirs(result_dir, exist_ok=True)
-
-        all_data = pd.concat([
-            result_csv_data(search, platform='짱공유닷컴', subdir=f'19.짱공유닷컴/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-        
-        all_data.to_csv(os.path.join(result_dir, f'짱공유닷컴_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+        if failed:
+            checkpoint.pause(search)
+        elif not stop_event.is_set():
+            checkpoint.finish(search)
+
+    release_driver(wd)
+    release_driver(wd_dp1)
+
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
@@ -0,0 +1,166 @@
+import logging
+
+from bs4.element import NavigableString, PreformattedString
+
+from . import metrics
+from . import fixtures
+
+# 본문 링크 처리 방식
+STRIP_ALL_LINKS = 'all'          # 모든 <a> 제거
+STRIP_TEXT_LINKS = 'text_only'   # 이미지/영상/유튜브가 없는 <a>만 제거
+MEDIA_CSS = 'img, span.scrap_img, video, iframe[src*="youtube.com"]'
+
+# 상세 페이지 필드를 브라우저 안에서 뽑아 {필드명: 문자열 또는 null}로 반환
+# - 텍스트는 BeautifulSoup get_text(separator, strip)과 같은 규칙 (script/style 내용 제외)
+# - 링크/스크랩 박스 제거도 브라우저 DOM에서 처리하므로 page_source 전체를 넘겨받아 다시 파싱하지 않음
+DETAIL_SCRIPT = """
+const fields = arguments[0];
+const SKIP = new Set(['SCRIPT', 'STYLE', 'TEMPLATE', 'NOSCRIPT']);
+
+function textOf(node, separator, strip) {
+    const walker = document.createTreeWalker(node, NodeFilter.SHOW_TEXT);
+    const parts = [];
+    while (walker.nextNode()) {
+        const text = walker.currentNode;
+        if (SKIP.has(text.parentNode.nodeName)) continue;
+        let value = text.nodeValue;
+        if (strip) {
+            value = value.trim();
+            if (!value) continue;
+        }
+        parts.push(value);
+    }
+    return parts.join(separator);
+}
+
+function pick(spec) {
+    let root = document;
+    if (spec.within) {
+        root = document.querySelector(spec.within);
+        if (!root) return null;
+    }
+    const node = spec.index ? root.querySelectorAll(spec.css)[spec.index] : root.querySelector(spec.css);
+    if (!node) return null;
+    for (const css of spec.remove) {
+        node.querySelectorAll(css).forEach(el => el.remove());
+    }
+    if (spec.strip_links) {
+        node.querySelectorAll('a').forEach(a => {
+            if (spec.strip_links === 'all' || !a.querySelector(spec.media)) a.remove();
+        });
+    }
+    if (spec.attr) return node.getAttribute(spec.attr);
+    if (spec.own_text) {
+        return Array.from(node.childNodes).filter(n => n.nodeType === Node.TEXT_NODE).map(n => n.nodeValue).join('');
+    }
+    return textOf(node, spec.separator, spec.strip);
+}
+
+const result = {};
+for (const [name, spec] of Object.entries(fields)) {
+    result[name] = pick(spec);
+}
+return result;
+"""
+
+
+def field(css, attr=None, index=0, within=None, separator='', strip=False, own_text=False,
+          remove=(), strip_links=None, media=MEDIA_CSS):
+    """
+    추출할 필드 1개
+    - css: 필드 요소 셀렉터 (within이 있으면 within 요소 안에서, index번째 일치 요소)
+    - attr: 텍스트 대신 읽을 속성 / own_text: 자식 태그를 제외한 바로 아래 텍스트만
+    - remove: 텍스트를 읽기 전에 지울 하위 요소 셀렉터 목록
+    - strip_links: STRIP_ALL_LINKS / STRIP_TEXT_LINKS (media가 없는 링크만 제거)
+    """
+    return {
+        'css': css,
+        'attr': attr,
+        'index': index,
+        'within': within,
+        'separator': separator,
+        'strip': strip,
+        'own_text': own_text,
+        'remove': list(remove),
+        'strip_links': strip_links,
+        'media': media,
+    }
+
+
+# DETAIL_SCRIPT에서 텍스트를 읽지 않는 태그 (소문자: BeautifulSoup 태그 이름)
+_SKIP_TAGS = {'script', 'style', 'template', 'noscript'}
+
+
+def _is_text(node):
+    # TreeWalker(SHOW_TEXT)와 같이 주석/선언 등은 제외
+    return isinstance(node, NavigableString) and not isinstance(node, PreformattedString)
+
+
+def _text_of(node, separator, strip):
+    parts = []
+    for text in node.descendants:
+        if not _is_text(text) or text.parent.name in _SKIP_TAGS:
+            continue
+        value = str(text)
+        if strip:
+            value = value.strip()
+            if not value:
+                continue
+        parts.append(value)
+    return separator.join(parts)
+
+
+def _pick(soup, spec):
+    root = soup
+    if spec['within']:
+        root = soup.select_one(spec['within'])
+        if root is None:
+            return None
+    if spec['index']:
+        nodes = root.select(spec['css'])
+        node = nodes[spec['index']] if spec['index'] < len(nodes) else None
+    else:
+        node = root.select_one(spec['css'])
+    if node is None:
+        return None
+    for css in spec['remove']:
+        for tag in node.select(css):
+            tag.decompose()
+    if spec['strip_links']:
+        for a_tag in node.select('a'):
+            if a_tag.decomposed:
+                continue
+            if spec['strip_links'] == STRIP_ALL_LINKS or a_tag.select_one(spec['media']) is None:
+                a_tag.decompose()
+    if spec['attr']:
+        value = node.get(spec['attr'])
+        # class처럼 여러 값을 갖는 속성은 getAttribute와 같이 공백으로 이은 문자열
+        return ' '.join(value) if isinstance(value, list) else value
+    if spec['own_text']:
+        return ''.join(str(child) for child in node.children if _is_text(child))
+    return _text_of(node, spec['separator'], spec['strip'])
+
+
+def extract_soup(soup, fields):
+    """
+    DETAIL_SCRIPT를 파이썬으로 옮긴 것 (브라우저 없이 녹화한 HTML에서 같은 필드를 뽑을 때 사용)
+    - 브라우저와 마찬가지로 remove/strip_links가 soup를 직접 변경하므로 뒤 필드는 변경된 문서에서 찾음
+    """
+    return {name: _pick(soup, spec) for name, spec in fields.items()}
+
+
+class ExtractScript:
+    """사이트별 상세 페이지 추출 규칙 (execute_script 한 번으로 모든 필드를 JSON으로 받음)"""
+
+    def __init__(self, name, **fields):
+        self.name = name
+        self.fields = fields
+
+    def extract(self, wd):
+        fixtures.snapshot(wd)
+        with metrics.timer('parse'):
+            result = wd.execute_script(DETAIL_SCRIPT, self.fields) or {}
+        missing = [name for name in self.fields if result.get(name) is None]
+        if missing:
+            logging.warning(f"[{self.name}] 브라우저 추출 실패 필드: {', '.join(missing)}")
+        return result
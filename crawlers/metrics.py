@@ -0,0 +1,232 @@
+import os
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+
+# 사이트 실행별 지표 저장 위치: data/metrics/<사이트>_<시작일>.json (+ Prometheus textfile <사이트>.prom)
+METRICS_DIR = os.getenv(
+    "CRAWL_METRICS_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'metrics')),
+)
+# [설정] 실행 중에도 이 간격(초)마다 파일을 갱신 (무응답/시간 초과로 강제 종료된 사이트도 마지막 값이 남음)
+WRITE_INTERVAL = float(os.getenv("CRAWL_METRICS_WRITE_INTERVAL", "60"))
+
+# 드라이버 역할별 페이지 로드 구간 이름
+ROLE_PHASES = {
+    "list": "list_fetch",
+    "detail": "detail_fetch",
+}
+# 요약 출력 순서 (그 외 구간은 뒤에 이름순)
+PHASE_ORDER = ["list_fetch", "detail_fetch", "parse", "save"]
+
+
+def fetch_phase(role):
+    return ROLE_PHASES.get(role, "other_fetch")
+
+
+class RunMetrics:
+    """
+    크롤러 프로세스(사이트) 1회 실행의 구간별 시간과 이벤트 수
+    - timers: 구간 -> [호출 수, 누적 초, 최대 초] (상세 수집 스레드들의 시간이 합산되므로 합이 실행 시간보다 클 수 있음)
+    - counters: posts_saved / errors 등 이벤트 수, blocks: 차단 신호 종류별 수
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.site_name = None
+        self.start_date = None
+        self.started_at = time.time()
+        self.timers = {}
+        self.counters = {}
+        self.blocks = {}
+        self._last_write = time.monotonic()
+
+    def start(self, site_name, start_date):
+        with self._lock:
+            self.site_name = site_name
+            self.start_date = start_date
+            self.started_at = time.time()
+            self._last_write = time.monotonic()
+
+    def observe(self, phase, seconds):
+        with self._lock:
+            timer = self.timers.setdefault(phase, [0, 0.0, 0.0])
+            timer[0] += 1
+            timer[1] += seconds
+            timer[2] = max(timer[2], seconds)
+        self._maybe_write()
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def block(self, reason):
+        with self._lock:
+            self.blocks[reason] = self.blocks.get(reason, 0) + 1
+
+    def seconds(self, phase):
+        with self._lock:
+            timer = self.timers.get(phase)
+            return timer[1] if timer else 0.0
+
+    def summary(self, status):
+        with self._lock:
+            elapsed = time.time() - self.started_at
+            phases = {
+                phase: {"calls": calls, "seconds": round(total, 3), "max_seconds": round(longest, 3),
+                        "avg_seconds": round(total / calls, 3) if calls else 0}
+                for phase, (calls, total, longest) in self.timers.items()
+            }
+            return {
+                "site": self.site_name,
+                "start_date": str(self.start_date) if self.start_date else None,
+                "status": status,
+                "started_at": datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+                "elapsed_seconds": round(elapsed, 3),
+                "phases": phases,
+                "counters": dict(self.counters),
+                "blocks": dict(self.blocks),
+            }
+
+    def _maybe_write(self):
+        if self.site_name is None or time.monotonic() - self._last_write < WRITE_INTERVAL:
+            return
+        self._last_write = time.monotonic()
+        try:
+            write(self.summary("running"))
+        except OSError as e:
+            logging.warning(f"지표 파일 저장 실패: {e}")
+
+
+class _Timer:
+    def __init__(self, phase):
+        self.phase = phase
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _metrics.observe(self.phase, time.perf_counter() - self._start)
+        return False
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text(summary):
+    """Prometheus textfile collector 형식 (node_exporter --collector.textfile.directory)"""
+    site = f'site="{_label(summary["site"])}"'
+    lines = [
+        "# HELP crawl_phase_seconds_total 구간별 누적 소요 시간 (초)",
+        "# TYPE crawl_phase_seconds_total counter",
+    ]
+    lines += [f'crawl_phase_seconds_total{{{site},phase="{_label(phase)}"}} {values["seconds"]}'
+              for phase, values in summary["phases"].items()]
+    lines += [
+        "# HELP crawl_phase_calls_total 구간별 호출 수",
+        "# TYPE crawl_phase_calls_total counter",
+    ]
+    lines += [f'crawl_phase_calls_total{{{site},phase="{_label(phase)}"}} {values["calls"]}'
+              for phase, values in summary["phases"].items()]
+    lines += [
+        "# HELP crawl_phase_max_seconds 구간별 최대 1회 소요 시간 (초)",
+        "# TYPE crawl_phase_max_seconds gauge",
+    ]
+    lines += [f'crawl_phase_max_seconds{{{site},phase="{_label(phase)}"}} {values["max_seconds"]}'
+              for phase, values in summary["phases"].items()]
+    lines += [
+        "# HELP crawl_events_total 저장 게시물/오류 등 이벤트 수",
+        "# TYPE crawl_events_total counter",
+    ]
+    lines += [f'crawl_events_total{{{site},event="{_label(name)}"}} {value}'
+              for name, value in summary["counters"].items()]
+    lines += [
+        "# HELP crawl_blocks_total 차단 신호 수 (429 / captcha / empty)",
+        "# TYPE crawl_blocks_total counter",
+    ]
+    lines += [f'crawl_blocks_total{{{site},reason="{_label(reason)}"}} {value}'
+              for reason, value in summary["blocks"].items()]
+    lines += [
+        "# HELP crawl_run_seconds 사이트 실행 시간 (초)",
+        "# TYPE crawl_run_seconds gauge",
+        f'crawl_run_seconds{{{site}}} {summary["elapsed_seconds"]}',
+        "# HELP crawl_run_completed 끝까지 수집했으면 1",
+        "# TYPE crawl_run_completed gauge",
+        f'crawl_run_completed{{{site}}} {1 if summary["status"] == "completed" else 0}',
+        "# HELP crawl_run_timestamp_seconds 지표를 기록한 시각",
+        "# TYPE crawl_run_timestamp_seconds gauge",
+        f'crawl_run_timestamp_seconds{{{site}}} {time.time():.0f}',
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _replace(path, text):
+    # 수집기가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def write(summary, base_dir=METRICS_DIR):
+    """JSON 요약(실행별)과 Prometheus textfile(사이트별 최신 1개) 기록"""
+    os.makedirs(base_dir, exist_ok=True)
+    start = summary["start_date"].replace('-', '')[2:] if summary["start_date"] else 'unknown'
+    json_path = os.path.join(base_dir, f'{summary["site"]}_{start}.json')
+    _replace(json_path, json.dumps(summary, ensure_ascii=False, indent=2))
+    _replace(os.path.join(base_dir, f'{summary["site"]}.prom'), prometheus_text(summary))
+    return json_path
+
+
+# 크롤러 프로세스(사이트)당 하나의 지표 (start 전에는 집계만 하고 파일은 쓰지 않음)
+_metrics = RunMetrics()
+
+
+def start(site_name, start_date):
+    _metrics.start(site_name, start_date)
+
+
+def timer(phase):
+    """with metrics.timer('parse'): ... -> 구간 시간 기록"""
+    return _Timer(phase)
+
+
+def count(name, n=1):
+    _metrics.count(name, n)
+
+
+def block(reason):
+    _metrics.block(reason)
+
+
+def phase_seconds(phase):
+    """지금까지 누적된 구간 시간 (초)"""
+    return _metrics.seconds(phase)
+
+
+def report(completed=False):
+    """사이트 실행 종료 시 지표 파일 기록 + 구간별 소요 시간 요약 출력"""
+    summary = _metrics.summary("completed" if completed else "stopped")
+    if summary["site"] is None:
+        return summary
+    try:
+        path = write(summary)
+    except OSError as e:
+        logging.warning(f"지표 파일 저장 실패: {e}")
+        path = None
+
+    phases = summary["phases"]
+    names = [p for p in PHASE_ORDER if p in phases] + sorted(p for p in phases if p not in PHASE_ORDER)
+    parts = [f"{name} {phases[name]['seconds']:.0f}초/{phases[name]['calls']}회" for name in names]
+    line = (f"[구간 시간] {summary['site']}: 전체 {summary['elapsed_seconds']:.0f}초 | " + ", ".join(parts)
+            + f" | 저장 {summary['counters'].get('posts_saved', 0)}건, 오류 {summary['counters'].get('errors', 0)}건, "
+            f"차단 {sum(summary['blocks'].values())}회")
+    print(line)
+    logging.info(line)
+    if path:
+        logging.info(f"지표 기록: {path}")
+    return summary
@@ -1,26 +1,31 @@
 import os
 import re
-import random
-import time
 import logging
 import pandas as pd
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from datetime import datetime
 
-from .utils import setup_driver, save_to_csv, clean_title, result_csv_data
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import checkpoint
+from . import rate_limiter
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .http_fetch import load_page, fetch_soup
+from .html_parser import parse_soup
+from . import dates
+
+# 작성일: 상세 'YYYY-MM-DD HH:MM:SS' / 목록 'YYYY-MM-DD'
+MLB_DATE = dates.DateParser('mlb', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d')
 
 
 def mlb_crw(wd, url, search, target_date):
     try:
         logging.info(f"크롤링 시작:{search}: {url}")
-        wd.get(f'{url}')
-        sleep_random_time = random.uniform(2, 4)
-        time.sleep(sleep_random_time)
-        WebDriverWait(wd, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'ar_txt')))
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
+        soup = load_page(wd, url, '.ar_txt', render_wait=0)
 
         writer_list = []
         title_list = []
@@ -47,7 +52,7 @@ def mlb_crw(wd, url, search, target_date):
         search_word_list.append(search)
 
         date_str = soup.find('div', class_='val').find('span').get_text()
-        date = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
+        date = MLB_DATE.parse(date_str)
         date_list.append(date)
 
         writer_list.append(soup.find('strong', class_="nick").get_text().strip())
@@ -87,6 +92,9 @@ def mlb_main_crw(searchs, start_date, end_date, stop_event):
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
 
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', '엠엘비파크', f'엠엘비파크_raw data_{target_date}.csv'))
+
     logging.basicConfig(
         filename=os.path.join(log_dir, f'엠엘비파크_log_{target_date}.txt'),
         level=logging.INFO,
@@ -99,35 +107,42 @@ def mlb_main_crw(searchs, start_date, end_date, stop_event):
     logging.info(f"                  엠엘비파크 크롤링 시작 (Date: {target_date})")
     logging.info(f"========================================================")
     
-    wd = setup_driver()
-    wd_dp1 = setup_driver()
+    wd = acquire_driver(role='detail')
+    wd_dp1 = acquire_driver(role='list')
     
     for search in searchs:
         if stop_event.is_set():
             print("🛑 크롤링 중단됨")
             break
-        page_num = 1
+        if checkpoint.is_done(search):
+            continue
+        page_num = checkpoint.resume_page(search)
         
+        failed = False
         while True:
             if stop_event.is_set():
                 break
+            checkpoint.advance(search, page_num)
             try:
                 url_dp1 = f'https://mlbpark.donga.com/mp/b.php?p={page_num}&m=search&b=bullpen&query={search}&select=sct&user='
                 logging.info(f"접속: {url_dp1}")
-                wd_dp1.get(url_dp1)
-                
-                # captcha 우회
-                try:
-                    WebDriverWait(wd_dp1, 2).until(EC.presence_of_element_located((By.ID, 'captcha_wrapper')))
-                    logging.warning("reCAPTCHA detected. Please solve it manually.")
-                    time.sleep(60) 
-                except:
-                    pass
-
-                WebDriverWait(wd_dp1, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'tbl_type01')))
-                sleep_random_time = random.uniform(2, 4)
-                time.sleep(sleep_random_time)
-                soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
+                soup_dp1 = fetch_soup(url_dp1, '.tbl_type01', role='list')
+
+                # HTTP 실패/캡차 감지 시 드라이버로 폴백
+                if soup_dp1 is None:
+                    wd_dp1.get(url_dp1)
+
+                    # captcha 우회
+                    try:
+                        WebDriverWait(wd_dp1, 2).until(EC.presence_of_element_located((By.ID, 'captcha_wrapper')))
+                        logging.warning("reCAPTCHA detected. Please solve it manually.")
+                        rate_limiter.backoff(url_dp1, 'captcha')
+                        rate_limiter.wait(url_dp1)
+                    except:
+                        pass
+
+                    WebDriverWait(wd_dp1, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'tbl_type01')))
+                    soup_dp1 = parse_soup(wd_dp1.page_source)
 
                 tr_tags = soup_dp1.find('table', class_='tbl_type01').find('tbody').find_all('tr')
                 
@@ -141,7 +156,7 @@ def mlb_main_crw(searchs, start_date, end_date, stop_event):
                     
                     try:
                         date_str = tr.find('span', class_='date').text
-                        date = datetime.strptime(date_str, '%Y-%m-%d').date()
+                        date = MLB_DATE.date(date_str)
                     except Exception as e:
                         logging.error(f"날짜 오류 발생: {e}")
                         continue
@@ -154,6 +169,15 @@ def mlb_main_crw(searchs, start_date, end_date, stop_event):
 
                     url = tr.find('div', class_='tit').find('a', class_='txt').get('href')
                     logging.info(f"url 찾음.")
+                    # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                    if seen_urls.should_skip(url, search):
+                        if seen_urls.reached_known_run(search):
+                            after_start_date = True
+                            break
+                        continue
+                    # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+                    if post_cache.reuse(url, search):
+                        continue
                     mlb_crw(wd, url, search, target_date)
 
                 if after_start_date:
@@ -163,17 +187,16 @@ def mlb_main_crw(searchs, start_date, end_date, stop_event):
 
             except Exception as e:
                 logging.error(f"오류 발생: {e}")
+                failed = True
                 break
 
-    wd.quit()
-    wd_dp1.quit()
+        if failed:
+            checkpoint.pause(search)
+        elif not stop_event.is_set():
+            checkpoint.finish(search)
 
-    if not stop_event.is_set():
-        result_dir = os.path.join(project_root, '결과', '엠엘비파크')
-        os.makedirs(result_dir, exist_ok=True)
+    release_driver(wd)
+    release_driver(wd_dp1)
 
-        all_data = pd.concat([
-            result_csv_data(search, platform='엠엘비파크', subdir=f'21.엠엘비파크/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-        all_data.to_csv(os.path.join(result_dir, f'엠엘비파크_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
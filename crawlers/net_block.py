@@ -0,0 +1,171 @@
+import os
+import logging
+import threading
+
+# [설정] 차단할 리소스 종류 (콤마 구분, 빈 값이면 차단 안 함)
+BLOCK_TYPES = [t for t in os.getenv("CRAWL_BLOCK_RESOURCES", "image,media,font").split(",") if t]
+# [설정] 광고/트래커 도메인 차단 여부
+BLOCK_ADS = os.getenv("CRAWL_BLOCK_ADS", "1") == "1"
+# [설정] 기본 페이지 로드 전략 (eager: DOMContentLoaded 시점에 get() 반환)
+PAGE_LOAD_STRATEGY = os.getenv("CRAWL_PAGE_LOAD_STRATEGY", "eager")
+# [설정] N번째 페이지마다 차단 없이 열어 절감량 비교 기준을 측정 (0이면 측정 안 함)
+SAMPLE_EVERY = int(os.getenv("CRAWL_BLOCK_SAMPLE_EVERY", "50"))
+
+# 리소스 종류별 URL 패턴 (Network.setBlockedURLs는 URL 와일드카드만 지원)
+RESOURCE_PATTERNS = {
+    "image": ["*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.bmp", "*.ico",
+              "*.jpg?*", "*.jpeg?*", "*.png?*", "*.gif?*", "*.webp?*"],
+    "media": ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.mov",
+              "*.mp4?*", "*.webm?*", "*.m3u8?*"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+             "*.woff?*", "*.woff2?*", "*.ttf?*"],
+}
+
+# 광고/트래커 도메인
+AD_DOMAINS = [
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com", "adservice.google.com",
+    "google-analytics.com", "googletagmanager.com", "googletagservices.com",
+    "facebook.net", "connect.facebook.net", "criteo.com", "criteo.net", "taboola.com",
+    "outbrain.com", "adnxs.com", "amazon-adsystem.com", "mobon.net", "realclick.co.kr",
+    "dable.io", "ad.daum.net", "adfit.kakao.com", "tenping.kr", "clickmon.co.kr",
+]
+
+# 사이트별 예외 (crawl_all_sites.py의 사이트 이름 기준)
+# - 목록이 load 이후 스크립트로 채워지는 사이트는 normal 로드 유지
+SITE_OVERRIDES = {
+    "블라인드": {"page_load_strategy": "normal"},
+    "인스티즈": {"page_load_strategy": "normal"},
+}
+
+# 페이지 로드 후 전송량/시간 측정 (Resource Timing API)
+MEASURE_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+let bytes = nav ? (nav.transferSize || 0) : 0;
+for (const r of performance.getEntriesByType('resource')) { bytes += r.transferSize || 0; }
+return {bytes: bytes, ms: nav ? nav.domContentLoadedEventEnd : 0};
+"""
+
+# 크롤러 프로세스(사이트)당 설정 (run_crawler_process에서 configure)
+_site_name = None
+
+
+def configure(site_name):
+    global _site_name
+    _site_name = site_name
+
+
+def profile():
+    """현재 사이트의 드라이버 로드 설정"""
+    prof = {
+        "page_load_strategy": PAGE_LOAD_STRATEGY,
+        "block_types": list(BLOCK_TYPES),
+        "block_ads": BLOCK_ADS,
+    }
+    prof.update(SITE_OVERRIDES.get(_site_name, {}))
+    return prof
+
+
+def blocked_patterns(prof=None):
+    prof = prof or profile()
+    patterns = []
+    for resource_type in prof["block_types"]:
+        patterns.extend(RESOURCE_PATTERNS.get(resource_type, []))
+    if prof["block_ads"]:
+        patterns.extend(f"*{domain}*" for domain in AD_DOMAINS)
+    return patterns
+
+
+def apply(driver, prof=None):
+    """setup_driver에서 호출: CDP로 차단 목록 등록"""
+    patterns = blocked_patterns(prof)
+    if not patterns:
+        return
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+class BlockStats:
+    """
+    차단 적용 페이지와 비교 기준(차단 없이 연 샘플) 페이지의 전송량/로드 시간 누적
+    -> 페이지당 절감 바이트/시간 = 기준 평균 - 차단 평균
+    """
+
+    def __init__(self, sample_every=SAMPLE_EVERY):
+        self.sample_every = sample_every
+        self._lock = threading.Lock()
+        self._loads = 0
+        self._totals = {True: [0, 0, 0.0], False: [0, 0, 0.0]}  # 차단 여부 -> [페이지 수, 바이트, ms]
+
+    def next_is_sample(self):
+        with self._lock:
+            self._loads += 1
+            return self.sample_every > 0 and self._loads % self.sample_every == 0
+
+    def record(self, blocked, bytes_, ms):
+        with self._lock:
+            total = self._totals[blocked]
+            total[0] += 1
+            total[1] += bytes_
+            total[2] += ms
+
+    def summary(self):
+        with self._lock:
+            result = {}
+            for blocked, (pages, bytes_, ms) in self._totals.items():
+                key = "blocked" if blocked else "baseline"
+                result[key] = {
+                    "pages": pages,
+                    "avg_bytes": bytes_ / pages if pages else 0,
+                    "avg_ms": ms / pages if pages else 0,
+                }
+        if result["blocked"]["pages"] and result["baseline"]["pages"]:
+            result["saved_bytes_per_page"] = result["baseline"]["avg_bytes"] - result["blocked"]["avg_bytes"]
+            result["saved_ms_per_page"] = result["baseline"]["avg_ms"] - result["blocked"]["avg_ms"]
+        return result
+
+
+_stats = BlockStats()
+
+
+def load(driver, url):
+    """
+    PooledDriver.get에서 호출: 페이지를 열고 전송량/시간 기록
+    - SAMPLE_EVERY번째마다 차단을 잠시 풀고 열어 비교 기준을 측정
+    """
+    patterns = blocked_patterns()
+    sample = bool(patterns) and _stats.next_is_sample()
+    if sample:
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+    try:
+        result = driver.get(url)
+    finally:
+        if sample:
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+    try:
+        measured = driver.execute_script(MEASURE_SCRIPT) or {}
+        _stats.record(bool(patterns) and not sample, int(measured.get("bytes", 0)), float(measured.get("ms", 0)))
+    except Exception as e:
+        logging.debug(f"페이지 전송량 측정 실패: {e}")
+    return result
+
+
+def stats():
+    return _stats.summary()
+
+
+def report():
+    """사이트 실행 종료 시 절감량 요약 출력"""
+    summary = stats()
+    blocked, baseline = summary["blocked"], summary["baseline"]
+    if not blocked["pages"] and not baseline["pages"]:
+        return summary
+    line = (f"[리소스 차단] {_site_name}: 차단 {blocked['pages']}페이지 평균 {blocked['avg_bytes'] / 1024:.0f}KB/"
+            f"{blocked['avg_ms']:.0f}ms, 기준 {baseline['pages']}페이지 평균 {baseline['avg_bytes'] / 1024:.0f}KB/"
+            f"{baseline['avg_ms']:.0f}ms")
+    if "saved_bytes_per_page" in summary:
+        line += (f" -> 페이지당 {summary['saved_bytes_per_page'] / 1024:.0f}KB, "
+                 f"{summary['saved_ms_per_page']:.0f}ms 절감")
+    print(line)
+    logging.info(line)
+    return summary
@@ -1,15 +1,23 @@
 import os
 import re
-import time
 import logging
 import pandas as pd
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from datetime import datetime
 
-from .utils import setup_driver, save_to_csv, clean_title,result_csv_data
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import checkpoint
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .html_parser import parse_soup
+from . import dates
+
+# 작성일: 'YYYY-MM-DD' (<abbr title="@YYYY-MM-DD HH:MM:SS">의 날짜 부분)
+ORBI_DATE = dates.DateParser('orbi', '%Y-%m-%d')
 
 # ---------------------------------------------------------
 # [상세 페이지 수집 함수] orbi_crw
@@ -27,7 +35,7 @@ def orbi_crw(wd, url, search, target_date):
             logging.warning(f"본문 로딩 실패 또는 구조 다름: {url}")
             return None
 
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
+        soup = parse_soup(wd.page_source)
 
         # 1. 제목 추출
         try:
@@ -66,7 +74,7 @@ def orbi_crw(wd, url, search, target_date):
             date_str = soup.find('div', class_='post-meta').find('abbr')['title']
             # 형식: @YYYY-MM-DD HH:MM:SS
             date_str = date_str.replace('@', '').strip().split(' ')[0]
-            date_obj = datetime.strptime(date_str, '%Y-%m-%d')
+            date_obj = ORBI_DATE.parse(date_str)
         except:
             # 실패 시 수집 당일 날짜로 대체하거나 None
             date_obj = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
@@ -100,6 +108,9 @@ def orbi_main_crw(searchs, start_date, end_date, stop_event):
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
 
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', '오르비', f'오르비_raw data_{target_date}.csv'))
+
     logging.basicConfig(
         filename=os.path.join(log_dir, f'오르비_log_{target_date}.txt'),
         level=logging.INFO,
@@ -108,16 +119,20 @@ def orbi_main_crw(searchs, start_date, end_date, stop_event):
         force=True
     )
 
-    wd = setup_driver()     # 상세 페이지용
-    wd_dp1 = setup_driver() # 목록 페이지용
+    wd = acquire_driver(role='detail')     # 상세 페이지용
+    wd_dp1 = acquire_driver(role='list') # 목록 페이지용
     
     for search in searchs:
         if stop_event.is_set(): break
         
+        # 검색어의 게시물을 모아서 마지막에 저장하므로 검색어 단위로만 이어서 수집
+        if checkpoint.is_done(search):
+            continue
         logging.info(f"=== 검색어 크롤링 시작: {search} ===")
         page_num = 1
         results_list = [] # 데이터 모아서 저장하기 위한 리스트
 
+        failed = False
         while True:
             if stop_event.is_set(): break
             
@@ -135,7 +150,7 @@ def orbi_main_crw(searchs, start_date, end_date, stop_event):
                     logging.info("게시글 목록을 찾을 수 없음 (마지막 페이지거나 로딩 실패)")
                     break
 
-                soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
+                soup_dp1 = parse_soup(wd_dp1.page_source)
                 ul_tag = soup_dp1.find('ul', class_='post-list')
                 
                 if not ul_tag:
@@ -166,7 +181,7 @@ def orbi_main_crw(searchs, start_date, end_date, stop_event):
                             
                         date_raw = abbr['title'] # 예: @2026-01-08 ...
                         date_str = date_raw.replace('@', '').strip().split(' ')[0]
-                        post_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+                        post_date = ORBI_DATE.date(date_str)
                         
                     except Exception as e:
                         logging.warning(f"날짜 파싱 실패: {e}")
@@ -187,6 +202,15 @@ def orbi_main_crw(searchs, start_date, end_date, stop_event):
                         href = link_tag.get('href')
                         full_url = 'https://orbi.kr' + href
                         
+                        # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                        if seen_urls.should_skip(full_url, search):
+                            if seen_urls.reached_known_run(search):
+                                after_start_date = True
+                                break
+                            continue
+                        # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+                        if post_cache.reuse(full_url, search):
+                            continue
                         # 상세 수집 함수 호출
                         data = orbi_crw(wd, full_url, search, target_date)
                         if data:
@@ -209,10 +233,10 @@ def orbi_main_crw(searchs, start_date, end_date, stop_event):
                     pass
 
                 page_num += 1
-                time.sleep(1) # 페이지 넘김 매너 딜레이
 
             except Exception as e:
                 logging.error(f"메인 루프 오류: {e}")
+                failed = True
                 break
         
         # 검색어 하나 끝날 때마다 저장 (I/O 부하 감소)
@@ -227,15 +251,13 @@ def orbi_main_crw(searchs, start_date, end_date, stop_event):
         else:
             logging.info(f"== {search} 수집된 데이터 없음 ==")
 
-    wd.quit()
-    wd_dp1.quit()
+        if failed:
+            checkpoint.pause(search)
+        elif not stop_event.is_set():
+            checkpoint.finish(search)
 
-    if not stop_event.is_set():
-        result_dir = os.path.join(project_root, '결과', '오르비')
-        os.makedirs(result_dir, exist_ok=True)
+    release_driver(wd)
+    release_driver(wd_dp1)
 
-        all_data = pd.concat([
-            result_csv_data(search, platform='오르비', subdir=f'13.오르비/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-        all_data.to_csv(os.path.join(result_dir, f'오르비_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
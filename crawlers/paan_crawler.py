@@ -3,14 +3,23 @@ import re
 import time
 import logging
 import pandas as pd
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from datetime import datetime
 
-from .utils import setup_driver, save_to_csv, clean_title, result_csv_data
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import checkpoint
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .html_parser import parse_soup
+from . import dates
+
+# 작성일: 상세 'YYYY.MM.DD' / 목록 'YY.MM.DD HH:MM'
+PAAN_DATE = dates.DateParser('paan', '%Y.%m.%d', '%y.%m.%d %H:%M')
 
 
 def pann_crw(wd, url, search, target_date):
@@ -19,9 +28,8 @@ def pann_crw(wd, url, search, target_date):
         wd.set_page_load_timeout(10)
         wd.get(url)
         logging.info(f"접속: {url}")
-        time.sleep(1)
         WebDriverWait(wd, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'posting')))
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
+        soup = parse_soup(wd.page_source)
 
         search_word_list = []
         search_plt_list = []
@@ -59,8 +67,8 @@ def pann_crw(wd, url, search, target_date):
 
         try:
             date_str = soup.find('div', class_='post-tit-info').find('span', class_='date').get_text()
-            date = datetime.strptime(date_str, '%Y.%m.%d ')
-            date_list.append(date.strftime('%Y-%m-%d '))
+            date = PAAN_DATE.parse(date_str)
+            date_list.append(date)
             logging.info(f"날짜 추출 성공: {date_str}")
         except Exception as e:
             date_list.append('')
@@ -116,6 +124,9 @@ def paan_main_crw(searchs, start_date, end_date, stop_event):
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
 
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', '네이트판', f'네이트판_raw data_{target_date}.csv'))
+
     logging.basicConfig(
         filename=os.path.join(log_dir, f'네이트판_log_{target_date}.txt'),
         level=logging.INFO,
@@ -128,18 +139,22 @@ def paan_main_crw(searchs, start_date, end_date, stop_event):
     logging.info(f"            네이트판 크롤링 시작 (Date: {target_date})")
     logging.info(f"========================================================")
     
-    wd = setup_driver()
-    wd_dp1 = setup_driver()
+    wd = acquire_driver(role='detail')
+    wd_dp1 = acquire_driver(role='list')
     
     for search in searchs:
         if stop_event.is_set():
             print("🛑 크롤링 중단됨")
             break
-        page_num = 1
+        if checkpoint.is_done(search):
+            continue
+        page_num = checkpoint.resume_page(search)
 
+        failed = False
         while True:
             if stop_event.is_set():
                 break
+            checkpoint.advance(search, page_num)
             try:
                 logging.info(f"검색어: {search}")
                 url_dp1 = f'https://pann.nate.com/search/talk?q={search}&sort=DD&page={page_num}'
@@ -152,7 +167,7 @@ def paan_main_crw(searchs, start_date, end_date, stop_event):
                     break
 
                 time.sleep(1)
-                soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
+                soup_dp1 = parse_soup(wd_dp1.page_source)
                 tr_tags = soup_dp1.find('ul', class_='s_list').find_all('li')
                 
                 for tr in tr_tags:
@@ -161,8 +176,7 @@ def paan_main_crw(searchs, start_date, end_date, stop_event):
                     after_start_date = False
 
                     date_str = tr.find('span', class_='date').text
-                    date_str = '20' + date_str
-                    date = datetime.strptime(date_str, '%Y.%m.%d %H:%M').date()
+                    date = PAAN_DATE.date(date_str)
                     logging.info(f"날짜 찾음: {date}")
 
                     if date > end_date:
@@ -173,6 +187,15 @@ def paan_main_crw(searchs, start_date, end_date, stop_event):
 
                     url = 'https://pann.nate.com' + tr.find('div', class_='tit').find('a').get('href')
                     logging.info(f"url 찾음.")
+                    # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                    if seen_urls.should_skip(url, search):
+                        if seen_urls.reached_known_run(search):
+                            after_start_date = True
+                            break
+                        continue
+                    # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+                    if post_cache.reuse(url, search):
+                        continue
                     pann_crw(wd, url, search, target_date)
 
                 if after_start_date:
@@ -182,17 +205,16 @@ def paan_main_crw(searchs, start_date, end_date, stop_event):
 
             except Exception as e:
                 logging.error(f"오류 발생: {e}")
+                failed = True
                 break
 
-    wd.quit()
-    wd_dp1.quit()
-    
-    if not stop_event.is_set():
-        result_dir = os.path.join(project_root, '결과', '네이트판')
-        os.makedirs(result_dir, exist_ok=True)
-
-        all_data = pd.concat([
-            result_csv_data(search, platform='네이트판', subdir=f'6.네이트판/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-        all_data.to_csv(os.path.join(result_dir, f'네이트판_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+        if failed:
+            checkpoint.pause(search)
+        elif not stop_event.is_set():
+            checkpoint.finish(search)
+
+    release_driver(wd)
+    release_driver(wd_dp1)
+
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
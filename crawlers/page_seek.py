@@ -0,0 +1,95 @@
+import os
+import logging
+
+# [설정] 최신순 목록에서 날짜 구간 페이지를 먼저 찾아 그 구간만 순회 (0이면 1페이지부터 순차 순회)
+ENABLED = os.getenv("CRAWL_PAGE_SEEK", "1") == "1"
+# 탐색과 순회 사이에 새 글이 올라와 게시물이 뒤로 밀리는 경우를 위한 여유 페이지 수
+SLACK_PAGES = 1
+
+
+class PageSeeker:
+    """
+    최신순으로 정렬된 목록에서 [start_date, end_date]가 걸친 페이지 범위 찾기
+    - probe(page_num): 그 페이지 게시물들의 날짜 목록 (빈 목록이면 목록 끝)
+    - 1, 2, 4, 8 ... 페이지씩 건너뛰며 경계를 넘는 페이지를 찾고, 직전 탐색 페이지와의 사이를 이분 탐색
+    - 페이지별 (최신, 최오래된) 날짜는 캐시해서 같은 페이지를 두 번 열지 않음
+    """
+
+    def __init__(self, probe, max_page):
+        self.probe = probe
+        self.max_page = max_page
+        self.probes = 0
+        self._spans = {}
+
+    def span(self, page_num):
+        """(가장 최근 날짜, 가장 오래된 날짜) / 게시물이 없으면 None"""
+        if page_num not in self._spans:
+            self.probes += 1
+            dates = [d for d in self.probe(page_num) if d]
+            self._spans[page_num] = (max(dates), min(dates)) if dates else None
+        return self._spans[page_num]
+
+    def _first_page(self, lo, reached):
+        """lo 이후 reached(page)가 처음 True가 되는 페이지 (뒤 페이지로 갈수록 False -> True), 없으면 None"""
+        if reached(lo):
+            return lo
+        prev, step = lo, 1
+        while True:
+            cur = min(lo + step, self.max_page)
+            if reached(cur):
+                break
+            if cur == self.max_page:
+                return None
+            prev, step = cur, step * 2
+
+        while cur - prev > 1:
+            mid = (prev + cur) // 2
+            if reached(mid):
+                cur = mid
+            else:
+                prev = mid
+        return cur
+
+    def window(self, start_date, end_date, first_page=1):
+        """구간에 걸친 (첫 페이지, 마지막 페이지) / 구간에 해당하는 게시물이 없으면 None"""
+        def reached_end(page_num):
+            span = self.span(page_num)
+            return span is None or span[1] <= end_date
+
+        def before_start(page_num):
+            span = self.span(page_num)
+            return span is None or span[0] < start_date
+
+        first = self._first_page(first_page, reached_end)
+        if first is None or self.span(first) is None:
+            return None
+        past = self._first_page(first, before_start)
+        last = self.max_page if past is None else past - 1
+        if last < first:
+            return None
+        return first, last
+
+
+def seek_window(probe, start_date, end_date, max_page, label=''):
+    """
+    크롤러용 진입점: 순회할 (첫 페이지, 마지막 페이지) 반환
+    - 설정이 꺼져 있거나 탐색 중 오류가 나면 (1, max_page)로 기존 순차 순회
+    - 구간에 게시물이 없으면 None
+    - 마지막 페이지는 SLACK_PAGES만큼 여유를 둠 (순회 중 날짜 조건으로 먼저 멈춤)
+    """
+    if not ENABLED:
+        return 1, max_page
+    seeker = PageSeeker(probe, max_page)
+    try:
+        window = seeker.window(start_date, end_date)
+    except Exception as e:
+        logging.error(f"[페이지 탐색] {label} 실패 -> 1페이지부터 순회: {e}")
+        return 1, max_page
+
+    if window is None:
+        logging.info(f"[페이지 탐색] {label} {start_date}~{end_date} 게시물 없음 (탐색 {seeker.probes}페이지)")
+    else:
+        logging.info(f"[페이지 탐색] {label} {start_date}~{end_date} -> {window[0]}~{window[1]}페이지 "
+                     f"(탐색 {seeker.probes}페이지)")
+        window = (window[0], min(max_page, window[1] + SLACK_PAGES))
+    return window
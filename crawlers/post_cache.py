@@ -0,0 +1,87 @@
+import os
+import logging
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# [설정] 프로세스(사이트)당 기억할 최대 게시물 수 (오래된 것부터 제거)
+MAX_POSTS = int(os.getenv("CRAWL_POST_CACHE_SIZE", "20000"))
+
+
+class PostCache:
+    """
+    크롤링 1회(사이트) 동안 유지되는 게시물 URL -> 파싱 결과 캐시
+    - 여러 검색어에 걸리는 같은 게시물은 상세 페이지를 한 번만 열고,
+      이후 검색어에는 저장된 행을 복사해 해당 검색어 파일에 기록
+    """
+
+    def __init__(self, max_posts=MAX_POSTS):
+        self.max_posts = max_posts
+        self._posts = OrderedDict()  # url -> (row dict, 저장 폴더, 파일명 접두어, 매칭 검색어 set)
+        self._lock = threading.Lock()
+
+    def remember(self, df, file_name):
+        if df.empty or "게시물 URL" not in df or "검색어" not in df:
+            return
+        save_dir = os.path.dirname(file_name)
+        base = os.path.basename(file_name)
+        with self._lock:
+            for row in df.to_dict('records'):
+                url = row["게시물 URL"]
+                search = str(row["검색어"])
+                suffix = f'{search}.csv'
+                # 파일명 규칙: <사이트>_<검색어>.csv
+                if not base.endswith(suffix):
+                    continue
+                if url in self._posts:
+                    self._posts[url][3].add(search)
+                    self._posts.move_to_end(url)
+                    continue
+                self._posts[url] = (row, save_dir, base[:-len(suffix)], {search})
+                if len(self._posts) > self.max_posts:
+                    self._posts.popitem(last=False)
+
+    def lookup(self, url, search):
+        """
+        캐시에 없으면 None, 이미 이 검색어로 기록했으면 (None, None),
+        그 외에는 (해당 검색어용 행, 저장 파일 경로)
+        """
+        with self._lock:
+            cached = self._posts.get(url)
+            if cached is None:
+                return None
+            row, save_dir, prefix, searchs = cached
+            if search in searchs:
+                return None, None
+            searchs.add(search)
+            new_row = dict(row)
+            new_row["검색어"] = search
+            return new_row, os.path.join(save_dir, f'{prefix}{search}.csv')
+
+
+# 프로세스(사이트)당 하나의 캐시
+_cache = PostCache()
+
+
+def remember(df, file_name):
+    _cache.remember(df, file_name)
+
+
+def reuse(url, search):
+    """
+    다른 검색어로 이미 수집한 게시물이면 상세 페이지를 다시 열지 않고
+    저장된 결과를 현재 검색어 파일에 기록한 뒤 True 반환
+    """
+    hit = _cache.lookup(url, search)
+    if hit is None:
+        return False
+    row, file_name = hit
+    if row is None:
+        return True
+
+    # save_to_csv가 remember를 다시 호출하므로 함수 안에서 가져옴 (순환 import 방지)
+    from .utils import save_to_csv
+    save_to_csv(pd.DataFrame([row]), file_name)
+    logging.info(f"[{search}] 다른 검색어로 수집한 게시물 재사용 (상세 페이지 재방문 없음): {url}")
+    return True
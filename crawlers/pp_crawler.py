@@ -7,23 +7,31 @@ from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 from datetime import datetime
 
-from .utils import setup_driver, save_to_csv, clean_title, result_csv_data
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import checkpoint
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .http_fetch import load_page
+from . import dates
+
+# 검색 목록 작성일: 'YYYY.MM.DD'
+PP_DATE = dates.DateParser('pp', '%Y.%m.%d')
 
 # 한페이지 크롤링
 def pp_crw(wd, url, search, target_date):
     try:
         logging.info(f"크롤링 시작: {url}")
         try:
-            wd.get(f'{url}')
+            soup = load_page(wd, url, '.board-contents', timeout=5)
         except TimeoutException:
             logging.warning(f"⏰ 접속 타임아웃 (30초 초과): {url} -> 스킵합니다.")
             return pd.DataFrame() # 빈 데이터프레임 반환하고 종료
         logging.info(f"접속: {url}")
-        time.sleep(1)
-        WebDriverWait(wd, 5).until(EC.presence_of_element_located((By.CLASS_NAME, 'board-contents')))
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
 
         writer_list = []
         title_list = []
@@ -131,6 +139,9 @@ def pp_main_crw(searchs, start_date, end_date, stop_event):
     # 로그 폴더 생성
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
+
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', '뽐뿌', f'뽐뿌_raw data_{target_date}.csv'))
     
     logging.basicConfig(
         filename=os.path.join(log_dir, f'뽐뿌_log_{target_date}.txt'),
@@ -148,22 +159,23 @@ def pp_main_crw(searchs, start_date, end_date, stop_event):
     logging.info(f"             뽐뿌 크롤링 시작 (Date: {target_date})")
     logging.info(f"========================================================")
     
-    wd = setup_driver()
-    wd_dp1 = setup_driver()
+    wd = acquire_driver(role='detail')
+    wd_dp1 = acquire_driver(role='list')
 
     for search in searchs:
         if stop_event.is_set():
             print("🛑 크롤링 중단됨")
             break
-        page_num = 1
+        if checkpoint.is_done(search):
+            continue
+        page_num = checkpoint.resume_page(search)
 
+        failed = False
         while True:
+            checkpoint.advance(search, page_num)
             try:
                 url_dp1 = f'https://www.ppomppu.co.kr/search_bbs.php?search_type=sub_memo&page_no={page_num}&keyword={search}&page_size=50&bbs_id=&order_type=date&bbs_cate=2'
-                wd_dp1.get(url_dp1)
-                WebDriverWait(wd_dp1, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'results_board')))
-                time.sleep(1)
-                soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
+                soup_dp1 = load_page(wd_dp1, url_dp1, '.results_board')
 
                 li_tags = soup_dp1.find('div', class_='results_board').find_all('div', class_="content")
 
@@ -173,7 +185,7 @@ def pp_main_crw(searchs, start_date, end_date, stop_event):
                 for li in li_tags:
                     try:
                         date_str = li.find('p', class_='desc').find_all('span')[2].get_text()
-                        date = datetime.strptime(date_str, '%Y.%m.%d').date()
+                        date = PP_DATE.date(date_str)
                     except Exception as e:
                         logging.error(f"날짜 오류 발생: {e}")
                         continue
@@ -190,6 +202,15 @@ def pp_main_crw(searchs, start_date, end_date, stop_event):
                     url = 'https://www.ppomppu.co.kr' + url_dp2_num
                     logging.info(f"url 찾음: {url}")
                     
+                    # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                    if seen_urls.should_skip(url, search):
+                        if seen_urls.reached_known_run(search):
+                            after_start_date = True
+                            break
+                        continue
+                    # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+                    if post_cache.reuse(url, search):
+                        continue
                     pp_crw(wd, url, search, target_date)
 
                 if after_start_date:
@@ -199,19 +220,18 @@ def pp_main_crw(searchs, start_date, end_date, stop_event):
 
             except Exception as e:
                 print(f"오류 발생: {e}")
+                failed = True
                 break
 
             page_num += 1
 
-    wd.quit()
-    wd_dp1.quit()
+        if failed:
+            checkpoint.pause(search)
+        elif not stop_event.is_set():
+            checkpoint.finish(search)
 
-    if not stop_event.is_set():
-        result_dir = os.path.join(project_root, '결과', '뽐뿌')
-        os.makedirs(result_dir, exist_ok=True)
+    release_driver(wd)
+    release_driver(wd_dp1)
 
-        all_data = pd.concat([
-            result_csv_data(search, platform='뽐뿌', subdir=f'1.뽐뿌/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-        all_data.to_csv(os.path.join(result_dir, f'뽐뿌_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
@@ -0,0 +1,88 @@
+import time
+import logging
+
+from . import metrics
+
+# 공유 메모리(multiprocessing.Array('d', 5)) 슬롯 위치
+HEARTBEAT = 0
+PAGES_LISTED = 1
+POSTS_FETCHED = 2
+POSTS_SAVED = 3
+ERRORS = 4
+SLOT_COUNT = 5
+
+COUNTER_NAMES = {
+    PAGES_LISTED: "pages_listed",
+    POSTS_FETCHED: "posts_fetched",
+    POSTS_SAVED: "posts_saved",
+    ERRORS: "errors",
+}
+
+# 드라이버 역할별로 증가시킬 카운터
+ROLE_COUNTERS = {
+    "list": PAGES_LISTED,
+    "detail": POSTS_FETCHED,
+}
+
+# 크롤러 프로세스 안에서 supervisor가 넘겨준 공유 배열 (없으면 보고하지 않음)
+_shared = None
+
+
+class _ErrorCounter(logging.Handler):
+    """ERROR 이상 로그를 errors 카운터로 집계 (supervisor 공유 배열 + 실행 지표)"""
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+
+    def emit(self, record):
+        metrics.count('errors')
+        _add(ERRORS, 1, attach=False)
+
+
+_error_handler = _ErrorCounter()
+
+
+def init(shared):
+    global _shared
+    _shared = shared
+
+
+def _attach_error_handler():
+    # 크롤러가 logging.basicConfig(force=True)로 핸들러를 초기화하므로 매번 다시 붙임
+    root = logging.getLogger()
+    if _error_handler not in root.handlers:
+        root.addHandler(_error_handler)
+
+
+def _add(slot, n, attach=True):
+    if _shared is None:
+        return
+    if attach:
+        _attach_error_handler()
+    with _shared.get_lock():
+        _shared[slot] += n
+        _shared[HEARTBEAT] = time.time()
+
+
+def heartbeat():
+    _add(HEARTBEAT, 0)
+
+
+def page_loaded(role):
+    slot = ROLE_COUNTERS.get(role)
+    if slot is None:
+        heartbeat()
+    else:
+        _add(slot, 1)
+
+
+def posts_saved(n):
+    _add(POSTS_SAVED, n)
+
+
+def snapshot(shared):
+    """supervisor 쪽에서 현재 카운터 읽기"""
+    with shared.get_lock():
+        values = list(shared[:])
+    counters = {name: int(values[slot]) for slot, name in COUNTER_NAMES.items()}
+    return values[HEARTBEAT], counters
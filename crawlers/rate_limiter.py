@@ -0,0 +1,144 @@
+import os
+import time
+import logging
+import threading
+from urllib.parse import urlparse
+
+from . import metrics
+
+# [설정] 도메인별 요청 간격 기본값 (초): 시작값 / 최소(가장 빠름) / 최대(가장 느림)
+START_INTERVAL = float(os.getenv("CRAWL_RATE_START_INTERVAL", "1.5"))
+MIN_INTERVAL = float(os.getenv("CRAWL_RATE_MIN_INTERVAL", "0.3"))
+MAX_INTERVAL = float(os.getenv("CRAWL_RATE_MAX_INTERVAL", "30"))
+# [설정] 연속으로 몰아서 보낼 수 있는 요청 수 (토큰 버킷 크기)
+BURST = float(os.getenv("CRAWL_RATE_BURST", "2"))
+# [설정] 정상 응답마다 늘리는 초당 요청 수 (additive increase)
+INCREASE_STEP = float(os.getenv("CRAWL_RATE_INCREASE_STEP", "0.02"))
+# 차단 신호 시 초당 요청 수에 곱하는 값 (multiplicative decrease)
+DECREASE_FACTOR = 0.5
+
+# 차단 신호별 추가 대기 (초)
+PENALTY = {
+    "429": 30,
+    "captcha": 60,
+    "empty": 0,
+}
+
+# 도메인별 예외 (차단이 잦은 사이트는 느리게 시작하고 최소 간격도 크게)
+DOMAIN_LIMITS = {
+    "mlbpark.donga.com": {"start": 3.0, "min": 2.0},
+    "search.dcinside.com": {"start": 3.0, "min": 1.0},
+    "gall.dcinside.com": {"start": 3.0, "min": 1.0},
+    "www.inven.co.kr": {"start": 2.0, "min": 1.0},
+    "www.teamblind.com": {"start": 2.0, "min": 1.0},
+    "theqoo.net": {"start": 2.0, "min": 0.5},
+    "www.soccerline.co.kr": {"start": 3.0, "min": 1.0},
+}
+
+
+def domain_of(url):
+    return urlparse(url).netloc or url
+
+
+class DomainBucket:
+    """
+    도메인 1개의 토큰 버킷 + AIMD 속도 조절
+    - 정상 응답: 초당 요청 수를 조금씩 올림 (최소 간격까지)
+    - 429/캡차/셀렉터 없음: 초당 요청 수를 절반으로 내리고 신호별 추가 대기
+    """
+
+    def __init__(self, domain, start=START_INTERVAL, min_interval=MIN_INTERVAL,
+                 max_interval=MAX_INTERVAL, burst=BURST):
+        self.domain = domain
+        self.max_rate = 1.0 / min_interval
+        self.min_rate = 1.0 / max_interval
+        self.rate = 1.0 / start
+        self.burst = burst
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._cooldown_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait(self):
+        """토큰 1개 예약 후 필요한 만큼 대기 (예약 방식이라 여러 스레드가 동시에 불러도 간격 유지)"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            delay = max(0.0, -self._tokens / self.rate, self._cooldown_until - now)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + INCREASE_STEP)
+
+    def backoff(self, reason):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * DECREASE_FACTOR)
+            self._tokens = min(self._tokens, 0.0)
+            penalty = PENALTY.get(reason, 0)
+            if penalty:
+                self._cooldown_until = max(self._cooldown_until, now + penalty)
+            interval = 1.0 / self.rate
+        logging.warning(f"[속도 조절] {self.domain}: {reason} 감지 -> 요청 간격 {interval:.1f}초"
+                        + (f", {penalty}초 대기" if penalty else ""))
+
+
+class RateLimiter:
+    """도메인별 DomainBucket 모음 (프로세스 안의 모든 드라이버/HTTP 요청이 공유)"""
+
+    def __init__(self, domain_limits=None):
+        self.domain_limits = dict(DOMAIN_LIMITS)
+        if domain_limits:
+            self.domain_limits.update(domain_limits)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url):
+        domain = domain_of(url)
+        with self._lock:
+            if domain not in self._buckets:
+                limits = self.domain_limits.get(domain, {})
+                self._buckets[domain] = DomainBucket(
+                    domain,
+                    start=limits.get("start", START_INTERVAL),
+                    min_interval=limits.get("min", MIN_INTERVAL),
+                    max_interval=limits.get("max", MAX_INTERVAL),
+                )
+            return self._buckets[domain]
+
+    def intervals(self):
+        """도메인별 현재 요청 간격 (초)"""
+        with self._lock:
+            return {domain: 1.0 / b.rate for domain, b in self._buckets.items()}
+
+
+# 크롤러 프로세스(사이트)당 하나의 리미터
+_limiter = RateLimiter()
+
+
+def wait(url):
+    """요청 직전 호출: 해당 도메인의 현재 속도에 맞춰 대기"""
+    return _limiter.bucket(url).wait()
+
+
+def success(url):
+    _limiter.bucket(url).success()
+
+
+def backoff(url, reason):
+    """차단 신호: '429' / 'captcha' / 'empty'(기다린 셀렉터가 끝내 나타나지 않음)"""
+    metrics.block(reason)
+    _limiter.bucket(url).backoff(reason)
+
+
+def intervals():
+    return _limiter.intervals()
@@ -0,0 +1,182 @@
+import os
+import json
+import uuid
+import logging
+
+import pandas as pd
+
+# pyarrow가 없으면 Parquet 기록/읽기를 건너뛰고 기존 CSV만 사용
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# 원본 수집 데이터 Parquet 저장 위치: data/lake/site=<n.사이트>/date=<yymmdd>/part-*.parquet
+LAKE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'lake'))
+
+# 파티션마다 기록기가 CSV에 쓴 행 수를 남기는 파일 ('_'로 시작하므로 pyarrow 데이터셋에서 제외됨)
+MANIFEST_NAME = '_manifest.json'
+
+# 크롤러 출력 고정 컬럼 (모든 사이트 공통, 문자열로 저장)
+COLUMNS = ["검색어", "플랫폼", "게시물 URL", "게시물 제목", "게시물 내용", "게시물 등록일자", "계정명", "수집시간"]
+
+if pa is not None:
+    SCHEMA = pa.schema([(name, pa.string()) for name in COLUMNS])
+    # 파티션 값은 문자열로 고정 (date=251222가 정수로 추론되지 않도록)
+    PARTITIONING = ds.partitioning(pa.schema([("site", pa.string()), ("date", pa.string())]), flavor="hive")
+
+
+def available():
+    return pa is not None
+
+
+def partition_of(file_name):
+    """data/raw/<n.사이트>/<yymmdd>/<사이트>_<검색어>.csv 경로에서 (사이트 폴더, 날짜) 추출"""
+    date_dir = os.path.dirname(os.path.abspath(file_name))
+    return os.path.basename(os.path.dirname(date_dir)), os.path.basename(date_dir)
+
+
+def _to_table(df):
+    df = df.reindex(columns=COLUMNS)
+    data = {
+        name: [None if pd.isna(v) else str(v) for v in df[name]]
+        for name in COLUMNS
+    }
+    return pa.Table.from_pydict(data, schema=SCHEMA)
+
+
+def write_batch(df, file_name, lake_dir=LAKE_DIR):
+    """
+    save_to_csv 배치 하나를 해당 사이트/날짜 파티션에 Parquet 파일 하나로 기록
+    (임시 파일에 쓴 뒤 이름을 바꾸므로 읽는 쪽에서 반쯤 쓴 파일이 보이지 않음)
+    """
+    if pa is None or df.empty:
+        return None
+    site, date = partition_of(file_name)
+    part_dir = _partition_dir(site, date, lake_dir)
+    os.makedirs(part_dir, exist_ok=True)
+
+    part_name = f'part-{os.getpid()}-{uuid.uuid4().hex[:12]}.parquet'
+    tmp_path = os.path.join(part_dir, f'.{part_name}.tmp')
+    pq.write_table(_to_table(df), tmp_path, compression='zstd')
+    path = os.path.join(part_dir, part_name)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _partition_dir(site, date, lake_dir):
+    return os.path.join(lake_dir, f'site={site}', f'date={date}')
+
+
+def record_csv_rows(file_name, rows, lake_dir=LAKE_DIR):
+    """
+    CSV 파일에 기록한 행 수를 그 사이트/날짜 파티션의 manifest에 누적 ({"csv_rows": {파일 이름: 행 수}})
+    - 병합 시 CSV를 다시 읽지 않고 파티션 행 수와 비교 (Parquet 기록이 실패한 배치가 있으면 파티션 행이 모자람)
+    - 사이트 프로세스 하나의 기록기만 호출 (flush 잠금 안에서)
+    """
+    if pa is None or not rows:
+        return
+    site, date = partition_of(file_name)
+    part_dir = _partition_dir(site, date, lake_dir)
+    os.makedirs(part_dir, exist_ok=True)
+    manifest = read_manifest(site, date, lake_dir) or {"csv_rows": {}}
+    csv_rows = manifest.setdefault("csv_rows", {})
+    name = os.path.basename(file_name)
+    csv_rows[name] = csv_rows.get(name, 0) + int(rows)
+
+    path = os.path.join(part_dir, MANIFEST_NAME)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def read_manifest(site, date, lake_dir=LAKE_DIR):
+    """파티션 manifest (없거나 읽을 수 없으면 None)"""
+    path = os.path.join(_partition_dir(site, date, lake_dir), MANIFEST_NAME)
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logging.warning(f"manifest 읽기 실패 ({path}): {e}")
+        return None
+
+
+def first_write_time(site, date, lake_dir=LAKE_DIR):
+    """파티션에 가장 먼저 기록된 Parquet 파일의 수정 시각 (manifest 도입 이전 파티션 판단용, 없으면 None)"""
+    part_dir = _partition_dir(site, date, lake_dir)
+    if not os.path.isdir(part_dir):
+        return None
+    times = [os.path.getmtime(os.path.join(part_dir, name)) for name in os.listdir(part_dir)
+             if name.startswith('part-') and name.endswith('.parquet')]
+    return min(times) if times else None
+
+
+def _dataset(lake_dir):
+    # '.'으로 시작하는 기록 중 임시 파일은 pyarrow가 기본으로 무시함
+    return ds.dataset(lake_dir, format="parquet", partitioning=PARTITIONING)
+
+
+def _date_filter(target_date, sites=None):
+    expr = ds.field("date") == target_date
+    if sites is not None:
+        expr = expr & ds.field("site").isin(list(sites))
+    return expr
+
+
+def site_counts(target_date, lake_dir=LAKE_DIR):
+    """
+    날짜 파티션의 사이트별 행 수 {사이트 폴더명: 행 수} (Parquet 메타데이터만 읽음)
+    - pyarrow가 없거나 파티션이 없으면 빈 dict
+    """
+    if pa is None or not os.path.isdir(lake_dir):
+        return {}
+    counts = {}
+    for fragment in _dataset(lake_dir).get_fragments(filter=_date_filter(target_date)):
+        site = ds.get_partition_keys(fragment.partition_expression).get("site")
+        counts[site] = counts.get(site, 0) + fragment.count_rows()
+    return counts
+
+
+def read_date(target_date, columns=None, lake_dir=LAKE_DIR, sites=None):
+    """
+    날짜 파티션 전체를 하나의 데이터셋으로 읽어 DataFrame 반환 (필요한 컬럼만 읽음)
+    - 'site' 컬럼에 사이트 폴더명(예: 1.뽐뿌)이 함께 들어감
+    - sites: 이 사이트 파티션만 읽음 (None이면 전체)
+    - pyarrow가 없거나 해당 날짜 파티션이 없으면 None
+    """
+    if pa is None or not os.path.isdir(lake_dir):
+        return None
+    if columns is None:
+        columns = COLUMNS
+    table = _dataset(lake_dir).to_table(
+        columns=list(columns) + ["site"],
+        filter=_date_filter(target_date, sites),
+    )
+    if table.num_rows == 0:
+        return None
+    logging.info(f"Parquet 파티션 읽기: date={target_date} ({table.num_rows}건)")
+    return table.to_pandas()
+
+
+def iter_date(target_date, columns=None, lake_dir=LAKE_DIR, sites=None, batch_size=10000):
+    """
+    read_date와 같은 데이터를 batch_size 행씩 DataFrame으로 차례로 반환 (날짜 전체를 메모리에 올리지 않음)
+    - pyarrow가 없거나 해당 날짜 파티션이 없으면 아무것도 반환하지 않음
+    """
+    if pa is None or not os.path.isdir(lake_dir):
+        return
+    if columns is None:
+        columns = COLUMNS
+    batches = _dataset(lake_dir).to_batches(
+        columns=list(columns) + ["site"],
+        filter=_date_filter(target_date, sites),
+        batch_size=batch_size,
+    )
+    for batch in batches:
+        if batch.num_rows:
+            yield batch.to_pandas()
@@ -2,15 +2,23 @@ import re
 import os
 import time
 import logging
-import random
 import pandas as pd
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from datetime import datetime
 
-from .utils import setup_driver, save_to_csv, clean_title, result_csv_data
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import checkpoint
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .html_parser import parse_soup
+from . import dates
+
+# 검색 목록 작성일: 'YYYY.MM.DD'
+RW_DATE = dates.DateParser('rw', '%Y.%m.%d')
 
 
 def rw_crw(wd, url, search, target_date):
@@ -19,9 +27,8 @@ def rw_crw(wd, url, search, target_date):
         wd.set_page_load_timeout(10)
         wd.get(f'{url}')
         logging.info(f"접속: {url}")
-        time.sleep(random.uniform(1, 4))
         WebDriverWait(wd, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'view_content.autolink')))
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
+        soup = parse_soup(wd.page_source)
 
         writer_list = []
         title_list = []
@@ -94,6 +101,9 @@ def rw_main_crw(searchs, start_date, end_date, stop_event):
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
 
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', '루리웹', f'루리웹_raw data_{target_date}.csv'))
+
     logging.basicConfig(
         filename=os.path.join(log_dir, f'루리웹_log_{target_date}.txt'),
         level=logging.INFO,
@@ -106,18 +116,22 @@ def rw_main_crw(searchs, start_date, end_date, stop_event):
     logging.info(f"            루리웹 크롤링 시작 (Date: {target_date})")
     logging.info(f"========================================================")
     
-    wd = setup_driver()
-    wd_dp1 = setup_driver()
+    wd = acquire_driver(role='detail')
+    wd_dp1 = acquire_driver(role='list')
 
     for search in searchs:
         if stop_event.is_set():
             print("🛑 크롤링 중단됨")
             break
-        page_num = 1
+        if checkpoint.is_done(search):
+            continue
+        page_num = checkpoint.resume_page(search)
 
+        failed = False
         while True:
             if stop_event.is_set():
                 break
+            checkpoint.advance(search, page_num)
             try:
                 url_dp1 = f'https://bbs.ruliweb.com/search?q={search}&page={page_num}#board_search&gsc.tab=0&gsc.q={search}&gsc.page=1'
                 wd_dp1.get(url_dp1)
@@ -126,7 +140,7 @@ def rw_main_crw(searchs, start_date, end_date, stop_event):
                 WebDriverWait(wd_dp1, 10).until(EC.presence_of_element_located((By.ID, 'board_search')))
                 time.sleep(1)
 
-                soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
+                soup_dp1 = parse_soup(wd_dp1.page_source)
                 li_tags = soup_dp1.find('div', id='board_search').find_all('li', class_="search_result_item")
 
                 for li in li_tags:
@@ -136,7 +150,7 @@ def rw_main_crw(searchs, start_date, end_date, stop_event):
 
                     try:
                         date_str = li.find('span', class_='time').get_text()
-                        date = datetime.strptime(date_str, '%Y.%m.%d').date()
+                        date = RW_DATE.date(date_str)
                         logging.info(f"날짜 찾음")
                     except Exception as e:
                         logging.error(f"날짜 오류 발생: {e}")
@@ -150,6 +164,15 @@ def rw_main_crw(searchs, start_date, end_date, stop_event):
 
                     url = li.find('a', class_='title text_over').get('href')
                     logging.info(f"url 찾음.")
+                    # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                    if seen_urls.should_skip(url, search):
+                        if seen_urls.reached_known_run(search):
+                            after_start_date = True
+                            break
+                        continue
+                    # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+                    if post_cache.reuse(url, search):
+                        continue
                     rw_crw(wd, url, search, target_date)
 
                 if after_start_date:
@@ -159,17 +182,16 @@ def rw_main_crw(searchs, start_date, end_date, stop_event):
 
             except Exception as e:
                 logging.error(f"오류 발생: {e}")
+                failed = True
                 break
+
+        if failed:
+            checkpoint.pause(search)
+        elif not stop_event.is_set():
+            checkpoint.finish(search)
                 
-    wd.quit()
-    wd_dp1.quit()
-    
-    if not stop_event.is_set():
-        result_dir = os.path.join(project_root, '결과', '루리웹')
-        os.makedirs(result_dir, exist_ok=True)
-
-        all_data = pd.concat([
-            result_csv_data(search, platform='루리웹', subdir=f'4.루리웹/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-        all_data.to_csv(os.path.join(result_dir, f'루리웹_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+    release_driver(wd)
+    release_driver(wd_dp1)
+
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
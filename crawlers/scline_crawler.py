@@ -3,14 +3,23 @@ import re
 import time
 import logging
 import pandas as pd
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from datetime import datetime
 
-from .utils import setup_driver, save_to_csv, clean_title, result_csv_data
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import checkpoint
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .html_parser import parse_soup
+from . import dates
+
+# 작성일: 'YYYY-MM-DD'
+SCLINE_DATE = dates.DateParser('scline', '%Y-%m-%d')
 
 
 def scline_crw(wd, url, search, target_date):
@@ -22,7 +31,7 @@ def scline_crw(wd, url, search, target_date):
 
         WebDriverWait(wd, 20).until(EC.presence_of_element_located((By.CLASS_NAME, 'txtBox')))
         time.sleep(2)
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
+        soup = parse_soup(wd.page_source)
 
         search_word_list = []
         search_plt_list = []
@@ -54,7 +63,7 @@ def scline_crw(wd, url, search, target_date):
 
         if date_match:
             date_str = date_match.group(0)
-            date = datetime.strptime(date_str.split()[0], '%Y-%m-%d')
+            date = SCLINE_DATE.parse(date_str.split()[0])
             date_list.append(date)
             logging.info(f"날짜 추출 성공: {date_str}")
         else:
@@ -104,6 +113,9 @@ def scline_main_crw(searchs, start_date, end_date, stop_event):
     log_dir = os.path.join(project_root, 'log')
     os.makedirs(log_dir, exist_ok=True)
 
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(project_root, '결과', '사커라인', f'사커라인_raw data_{target_date}.csv'))
+
     logging.basicConfig(
         filename=os.path.join(log_dir, f'사커라인_log_{target_date}.txt'),
         level=logging.INFO,
@@ -116,27 +128,31 @@ def scline_main_crw(searchs, start_date, end_date, stop_event):
     logging.info(f"            사커라인 크롤링 시작 (Date: {target_date})")
     logging.info(f"========================================================")
     
-    wd = setup_driver()
-    wd_dp1 = setup_driver()
+    wd = acquire_driver(role='detail')
+    wd_dp1 = acquire_driver(role='list')
     
     for search in searchs:
         if stop_event.is_set():
             print("🛑 크롤링 중단됨")
             break
-        page_num = 0
+        if checkpoint.is_done(search):
+            continue
+        page_num = checkpoint.resume_page(search, 0)
         no_search_flag = True
         
+        failed = False
         while True:
             if stop_event.is_set():
                 break
+            checkpoint.advance(search, page_num)
             try:
                 logging.info(f"크롤링 시작-검색어: {search}")
                 url = f'https://soccerline.kr/board?page={page_num}&categoryDepth01=0&searchWindow=&searchType=0&searchText={search}'
                 wd_dp1.get(url)
 
                 WebDriverWait(wd_dp1, 20).until(EC.presence_of_element_located((By.CLASS_NAME, 'brdList')))
-                time.sleep(5)
-                soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
+                time.sleep(1)
+                soup_dp1 = parse_soup(wd_dp1.page_source)
                 td_tags = soup_dp1.find('div', id='boardListContainer').find_all('tr')[2:]
                 
                 no_search_flag = False
@@ -150,7 +166,7 @@ def scline_main_crw(searchs, start_date, end_date, stop_event):
 
                     try:
                         date_str = td.find_all('td')[3].text
-                        date = datetime.strptime(date_str, '%Y-%m-%d').date()
+                        date = SCLINE_DATE.date(date_str)
                         logging.info(f"날짜 찾음")
                     except Exception as e:
                         logging.error(f"날짜 오류 발생: {e}")
@@ -164,6 +180,15 @@ def scline_main_crw(searchs, start_date, end_date, stop_event):
 
                     url = 'https://soccerline.kr' + td.find('td', class_='desc').find('a').get('href')
                     logging.info(f"url 찾음.")
+                    # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                    if seen_urls.should_skip(url, search):
+                        if seen_urls.reached_known_run(search):
+                            after_start_date = True
+                            break
+                        continue
+                    # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+                    if post_cache.reuse(url, search):
+                        continue
                     scline_crw(wd, url, search, target_date)
 
                 if no_search_flag:
@@ -177,17 +202,16 @@ def scline_main_crw(searchs, start_date, end_date, stop_event):
 
             except Exception as e:
                 logging.error(f"오류 발생: {e}")
+                failed = True
                 break
 
-    wd.quit()
-    wd_dp1.quit()
+        if failed:
+            checkpoint.pause(search)
+        elif not stop_event.is_set():
+            checkpoint.finish(search)
 
-    if not stop_event.is_set():
-        result_dir = os.path.join(project_root, '결과', '사커라인')
-        os.makedirs(result_dir, exist_ok=True)
+    release_driver(wd)
+    release_driver(wd_dp1)
 
-        all_data = pd.concat([
-            result_csv_data(search, platform='사커라인', subdir=f'16.사커라인/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-        all_data.to_csv(os.path.join(result_dir, f'사커라인_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
\ No newline at end of file
@@ -0,0 +1,151 @@
+import os
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+
+# 사이트별 수집 URL 인덱스 저장 위치: data/seen/<사이트>.sqlite
+SEEN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'seen'))
+# [설정] 이미 수집한 게시물이 이 개수만큼 연속으로 나오면 해당 검색어 목록 탐색 중단
+STOP_RUN = int(os.getenv("CRAWL_SEEN_STOP_RUN", "20"))
+# 검색어 구분 없이 게시판 전체를 훑는 사이트(더쿠)용 검색어 키
+ALL_KEYWORDS = '*'
+
+
+class SeenUrlStore:
+    """
+    실행 간에 유지되는 사이트별 수집 URL 인덱스 (SQLite)
+    - seen: (게시물 URL, 검색어) 단위로 저장 완료 기록
+    - completed: 검색어별로 목록 탐색을 끝까지 마친 실행의 시작 날짜
+      (이전 실행이 더 과거까지 훑었을 때만 '연속 중복 시 조기 종료'를 허용하기 위함)
+    """
+
+    def __init__(self, site_name, start_date, base_dir=SEEN_DIR):
+        os.makedirs(base_dir, exist_ok=True)
+        self.path = os.path.join(base_dir, f'{site_name}.sqlite')
+        self.start_date = start_date.isoformat()
+        self._lock = threading.Lock()
+        self._runs = {}
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            "url TEXT NOT NULL, search TEXT NOT NULL, saved_at TEXT, "
+            "PRIMARY KEY (url, search)) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS completed ("
+            "search TEXT PRIMARY KEY, start_date TEXT NOT NULL, finished_at TEXT)"
+        )
+        self._conn.commit()
+        self._completed = dict(self._conn.execute("SELECT search, start_date FROM completed"))
+
+    def is_seen(self, url, search):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM seen WHERE url = ? AND search = ?", (url, search)
+            ).fetchone()
+            if row:
+                self._runs[search] = self._runs.get(search, 0) + 1
+            else:
+                self._runs[search] = 0
+        return row is not None
+
+    def reached_known_run(self, search):
+        covered_from = self._completed.get(search)
+        if covered_from is None or covered_from > self.start_date:
+            return False
+        return self._runs.get(search, 0) >= STOP_RUN
+
+    def mark(self, urls_and_searchs):
+        now = datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen (url, search, saved_at) VALUES (?, ?, ?)",
+                [(str(url), str(search), now) for url, search in urls_and_searchs],
+            )
+            self._conn.commit()
+
+    def mark_completed(self, searchs):
+        now = datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            for search in searchs:
+                prev = self._completed.get(search)
+                start = self.start_date if prev is None else min(prev, self.start_date)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO completed (search, start_date, finished_at) VALUES (?, ?, ?)",
+                    (str(search), start, now),
+                )
+                self._completed[search] = start
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# 크롤러 프로세스(사이트)당 하나의 인덱스 (열려있지 않으면 모든 함수가 아무것도 하지 않음)
+_store = None
+# 게시판 전체를 훑는 사이트는 저장된 게시물을 ALL_KEYWORDS로도 기록 (track_all_keywords로 켬)
+_track_all = False
+
+
+def open_store(site_name, start_date):
+    global _store
+    _store = SeenUrlStore(site_name, start_date)
+    return _store
+
+
+def close_store():
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
+
+
+def should_skip(url, search):
+    """이전 실행에서 이미 저장한 게시물이면 True"""
+    if _store is None:
+        return False
+    if _store.is_seen(url, search):
+        logging.info(f"이미 수집한 게시물 스킵: {url}")
+        return True
+    return False
+
+
+def reached_known_run(search):
+    """이미 수집한 구간에 도달했으면 True (이후 목록은 이전 실행이 수집함)"""
+    if _store is None:
+        return False
+    if _store.reached_known_run(search):
+        logging.info(f"[{search}] 이미 수집한 게시물 {STOP_RUN}개 연속 -> 목록 탐색 조기 종료")
+        return True
+    return False
+
+
+def mark(url, search):
+    if _store is not None:
+        _store.mark([(url, search)])
+
+
+def track_all_keywords():
+    """이 프로세스에서 저장된 게시물을 검색어와 함께 ALL_KEYWORDS로도 기록 (더쿠처럼 목록을 한 번만 훑는 사이트)"""
+    global _track_all
+    _track_all = True
+
+
+def mark_saved(df):
+    """save_to_csv로 저장된 행들을 수집 완료로 기록"""
+    if _store is None or df.empty or "게시물 URL" not in df or "검색어" not in df:
+        return
+    pairs = list(zip(df["게시물 URL"], df["검색어"]))
+    if _track_all:
+        pairs.extend((url, ALL_KEYWORDS) for url in df["게시물 URL"].unique())
+    _store.mark(pairs)
+
+
+def mark_completed(searchs):
+    if _store is not None:
+        _store.mark_completed(searchs)
@@ -0,0 +1,300 @@
+import os
+import re
+import time
+import logging
+import pandas as pd
+from datetime import datetime
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+from .utils import save_to_csv, clean_title
+from . import csv_writer
+from . import dates
+from . import checkpoint
+from . import progress
+from . import rate_limiter
+from .driver_pool import acquire_driver, release_driver
+from . import seen_urls
+from . import post_cache
+from .http_fetch import is_http_first, fetch_html
+from .detail_fetcher import DetailFetcher, is_driver_error
+from .html_parser import compile_selectors
+# 링크 처리 방식 상수는 사이트 모듈이 site_engine에서 가져다 씀
+from .js_extract import ExtractScript, field, STRIP_ALL_LINKS, STRIP_TEXT_LINKS, MEDIA_CSS
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def text_date(fmt, token=None):
+    """텍스트 -> datetime 변환 함수 생성 (token: 공백 기준 n번째 조각만 사용, 상대 시간 표현도 해석)"""
+    parser = dates.DateParser(fmt, fmt)
+
+    def parse(text):
+        if token is not None:
+            text = text.split()[token]
+        return parser.parse(text.strip())
+    return parse
+
+
+class SiteSpec:
+    """
+    사이트 1개의 수집 규칙 (목록 URL / 셀렉터 / 날짜 형식 / 페이지 넘김 / 종료 조건)
+    - list_url: '{search}', '{page}' 자리표시자를 가진 검색 목록 URL
+    - list_css: items(게시물 행), date(행 안의 작성일), link(행 안의 상세 링크)
+    - detail_css: title, content, date, writer (+ 선택: 본문에서 뺄 요소 remove)
+    - list_date / detail_date: 텍스트 -> date/datetime
+    - detail_extract: 셀렉터 하나로 뽑기 어려운 필드를 page에서 직접 뽑는 함수 {필드명: func(page)}
+    - detail_js: 드라이버로 연 상세 페이지에서 브라우저 추출에 쓸 필드 규칙 {필드명: js_extract.field(...)}
+      (detail_extract를 쓰는 필드는 detail_js도 있어야 브라우저 추출, 없으면 page_source 파싱)
+    """
+
+    def __init__(self, name, save_dir, platform, list_url, list_wait, list_css, list_date,
+                 link_prefix, detail_wait, detail_css, detail_date,
+                 strip_links=None, writer_text=None, detail_extract=None, detail_js=None,
+                 max_pages=None, collected_format='%Y-%m-%d'):
+        self.name = name
+        self.save_dir = save_dir
+        self.platform = platform
+        self.list_url = list_url
+        self.list_date = list_date
+        self.link_prefix = link_prefix
+        self.detail_date = detail_date
+        self.strip_links = strip_links
+        self.writer_text = writer_text or (lambda text: text.strip())
+        self.detail_extract = detail_extract or {}
+        self.max_pages = max_pages
+        self.collected_format = collected_format
+
+        # 대기 셀렉터까지 포함해 import 시 한 번만 컴파일
+        self.list_selectors = compile_selectors(f'{name}_list', wait=list_wait, **list_css)
+        detail_css = dict(detail_css, wait=detail_wait)
+        if strip_links:
+            detail_css.setdefault('links', 'a')
+            detail_css.setdefault('media', MEDIA_CSS)
+        self.detail_selectors = compile_selectors(f'{name}_detail', **detail_css)
+        self.detail_script = self._detail_script(detail_css, detail_js or {})
+
+    def _detail_script(self, detail_css, detail_js):
+        """detail_css로 브라우저 추출 규칙 생성 (옮길 수 없는 detail_extract 필드가 있으면 None)"""
+        fields = {}
+        for name in ('title', 'date', 'writer'):
+            if name in detail_js:
+                fields[name] = detail_js[name]
+            elif name in self.detail_extract:
+                return None
+            else:
+                fields[name] = field(detail_css[name])
+        fields['content'] = detail_js.get('content') or field(
+            detail_css['content'], separator=' ', strip=True,
+            remove=[detail_css['remove']] if 'remove' in detail_css else (),
+            strip_links=self.strip_links,
+        )
+        return ExtractScript(f'{self.name}_detail', **fields)
+
+    def save_file(self, search, target_date):
+        save_path = os.path.join(PROJECT_ROOT, 'data', 'raw', self.save_dir, target_date)
+        os.makedirs(save_path, exist_ok=True)
+        return os.path.join(save_path, f'{self.name}_{search}.csv')
+
+
+def _load(wd, url, selectors, timeout=10, render_wait=1, parse=True):
+    """
+    HTTP 우선 모드면 requests로, 아니면(또는 실패 시) 드라이버로 열어 파싱된 Page 반환
+    (http_fetch.load_page와 같은 폴백 규칙, 대기 셀렉터는 'wait')
+    - parse=False: 드라이버로 연 경우 page_source를 가져오지 않고 None 반환 (브라우저 안에서 추출)
+    """
+    if is_http_first():
+        html = fetch_html(url, timeout=timeout, role=getattr(wd, 'role', None))
+        if html is not None:
+            page = selectors.parse(html)
+            if page.select_one('wait') is not None:
+                progress.page_loaded(getattr(wd, 'role', None))
+                return page
+            logging.info(f"HTTP 응답에 '{selectors.css['wait']}' 없음 -> 드라이버로 재시도: {url}")
+
+    wd.set_page_load_timeout(timeout)
+    wd.get(url)
+    # 대기 시간 초과 시 속도 조절은 호출한 쪽에서 (목록: _crawl_keyword, 상세: DetailFetcher)
+    WebDriverWait(wd, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, selectors.css['wait'])))
+    if render_wait:
+        time.sleep(render_wait)
+    if not parse:
+        return None
+    return selectors.parse(wd.page_source)
+
+
+def _field(spec, page, name):
+    extract = spec.detail_extract.get(name)
+    if extract is not None:
+        return extract(page)
+    return page.text(page.select_one(name))
+
+
+def _page_fields(spec, page):
+    """파싱된 Page에서 상세 필드 추출 (브라우저 추출과 같은 결과)"""
+    fields = {name: _field(spec, page, name) for name in ('title', 'date', 'writer')}
+    try:
+        content_div = page.select_one('content')
+        if 'remove' in spec.detail_selectors.css:
+            for tag in page.select('remove', content_div):
+                page.remove(tag)
+        if spec.strip_links:
+            for a_tag in page.select('links', content_div):
+                if spec.strip_links == STRIP_ALL_LINKS or page.select_one('media', a_tag) is None:
+                    page.remove(a_tag)
+        fields['content'] = page.text(content_div, separator=' ', strip=True)
+    except Exception as e:
+        fields['content'] = None
+        logging.error(f"본문 추출 실패: {e}")
+    return fields
+
+
+def crawl_detail(wd, url, spec, search, target_date):
+    """상세 페이지 1개 수집 -> save_to_csv (DetailFetcher 작업 함수)"""
+    try:
+        logging.info(f"크롤링 시작: {url}")
+        # 드라이버로 연 페이지는 브라우저 안에서 필드만 JSON으로 받음 (HTTP 응답은 그대로 파싱)
+        page = _load(wd, url, spec.detail_selectors, parse=spec.detail_script is None)
+        logging.info(f"접속: {url}")
+        fields = spec.detail_script.extract(wd) if page is None else _page_fields(spec, page)
+
+        cleaned_title = clean_title(fields['title'])
+        logging.info(f"제목 추출 성공: {cleaned_title}")
+
+        if fields['content'] is None:
+            post_content = ''
+            logging.error("본문 추출 실패")
+        else:
+            post_content = re.sub(r'https?://[^\s]+', '', fields['content']).strip()
+            logging.info("내용 추출 성공 (URL 제거됨)")
+
+        date = spec.detail_date(fields['date'])
+        writer = spec.writer_text(fields['writer'])
+
+        main_temp = pd.DataFrame({
+            "검색어": [search],
+            "플랫폼": [spec.platform],
+            "게시물 URL": [url],
+            "게시물 제목": [cleaned_title],
+            "게시물 내용": [post_content],
+            "게시물 등록일자": [date],
+            "계정명": [writer],
+            "수집시간": [datetime.now().strftime(spec.collected_format)],
+        })
+        file_name = spec.save_file(search, target_date)
+        save_to_csv(main_temp, file_name)
+        logging.info(f"저장완료: {file_name}")
+
+    except Exception as e:
+        if is_driver_error(e):
+            raise
+        logging.error(f"오류 발생: {url} ({e})")
+
+
+def _crawl_keyword(spec, wd_dp1, fetcher, search, start_date, end_date, target_date, stop_event):
+    """검색어 하나의 목록 페이지 순회 (목록 페이지 오류로 멈췄으면 False)"""
+    page_num = checkpoint.resume_page(search)
+    last_url = None
+    while not stop_event.is_set():
+        if spec.max_pages and page_num > spec.max_pages:
+            break
+        checkpoint.advance(search, page_num, last_url)
+        try:
+            logging.info(f"크롤링 시작-검색어: {search} ({page_num}페이지)")
+            url_dp1 = spec.list_url.format(search=search, page=page_num)
+            page = _load(wd_dp1, url_dp1, spec.list_selectors)
+            items = [item for item in page.select('items') if page.select_one('link', item) is not None]
+            # 상세 링크가 있는 행이 하나도 없으면 검색 결과 끝
+            if not items:
+                break
+
+            after_start_date = False
+            page_urls = []
+            for item in items:
+                if stop_event.is_set():
+                    break
+                try:
+                    date = spec.list_date(page.text(page.select_one('date', item))).date()
+                except Exception as e:
+                    logging.error(f"날짜 오류 발생: {e}")
+                    continue
+
+                if date > end_date:
+                    continue
+                if date < start_date:
+                    after_start_date = True
+                    break
+
+                url = spec.link_prefix + page.attr(page.select_one('link', item), 'href')
+                # 이전 실행에서 이미 저장한 게시물은 건너뜀
+                if seen_urls.should_skip(url, search):
+                    if seen_urls.reached_known_run(search):
+                        after_start_date = True
+                        break
+                    continue
+                # 다른 검색어로 이미 수집한 게시물은 상세 페이지를 다시 열지 않음
+                if post_cache.reuse(url, search):
+                    continue
+                page_urls.append(url)
+
+            # 목록 페이지에서 찾은 상세 페이지들을 동시 수집
+            fetcher.run(page_urls, crawl_detail, spec, search, target_date, stop_event=stop_event)
+            if page_urls:
+                last_url = page_urls[-1]
+
+            if after_start_date:
+                break
+            page_num += 1
+
+        except TimeoutException as e:
+            rate_limiter.backoff(url_dp1, 'empty')
+            logging.error(f"목록 페이지 대기 시간 초과: {url_dp1} ({e})")
+            return False
+        except Exception as e:
+            logging.error(f"오류 발생: {e}")
+            return False
+    return True
+
+
+def run_site(spec, searchs, start_date, end_date, stop_event):
+    """SiteSpec 하나로 검색어 목록 전체를 수집 (기존 *_main_crw와 같은 인자)"""
+    target_date = start_date.strftime("%y%m%d")
+
+    log_dir = os.path.join(PROJECT_ROOT, 'log')
+    os.makedirs(log_dir, exist_ok=True)
+
+    # 사이트 통합 결과 파일: 검색어별 파일과 같은 배치로 이어서 기록
+    csv_writer.open_result(os.path.join(PROJECT_ROOT, '결과', spec.name, f'{spec.name}_raw data_{target_date}.csv'))
+
+    logging.basicConfig(
+        filename=os.path.join(log_dir, f'{spec.name}_log_{target_date}.txt'),
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        encoding='utf-8',
+        force=True
+    )
+
+    logging.info(f"========================================================")
+    logging.info(f"            {spec.name} 크롤링 시작 (Date: {target_date})")
+    logging.info(f"========================================================")
+
+    wd_dp1 = acquire_driver(role='list')
+    fetcher = DetailFetcher()
+
+    for search in searchs:
+        if stop_event.is_set():
+            print("🛑 크롤링 중단됨")
+            break
+        if checkpoint.is_done(search):
+            continue
+        if not _crawl_keyword(spec, wd_dp1, fetcher, search, start_date, end_date, target_date, stop_event):
+            checkpoint.pause(search)
+        elif not stop_event.is_set():
+            checkpoint.finish(search)
+
+    release_driver(wd_dp1)
+
+    # 결과/<사이트> 통합 파일은 저장할 때마다 함께 기록되므로 남은 버퍼만 비움
+    csv_writer.flush()
@@ -1,178 +1,48 @@
-import os
-import re
-import time
-import logging
-import pandas as pd
-from bs4 import BeautifulSoup
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.common.exceptions import TimeoutException, WebDriverException
-from datetime import datetime
-
-from .utils import setup_driver, save_to_csv, clean_title, result_csv_data
-
-
-def todayhumor_crw(wd, url, search, target_date):
-    try:
-        logging.info(f"크롤링 시작: {url}")
-        wd.set_page_load_timeout(10)
-        wd.get(f'{url}')
-        logging.info(f"접속: {url}")
-        time.sleep(1)
-        WebDriverWait(wd, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'viewContent')))
-        soup = BeautifulSoup(wd.page_source, 'html.parser')
-
-        search_word_list = []
-        search_plt_list = []
-        writer_list = []
-        url_list = []
-        title_list = []
-        content_list = []
-        date_list = []
-        current_date_list = []
-
-        content_div = soup.find('div', class_='viewContent')
-        raw_title = soup.find('div', class_='viewSubjectDiv').find('div').get_text()
-        cleaned_title = clean_title(raw_title)
-        title_list.append(cleaned_title)
-        logging.info(f"제목 추출 성공: {cleaned_title}")
-
-        for a_tag in content_div.find_all('a'):
-            if (not a_tag.find('img') and not a_tag.find('span', class_='scrap_img') and
-                not a_tag.find('video') and not (a_tag.find('iframe') and 'youtube.com' in a_tag.decode_contents())):
-                a_tag.decompose()
-
-        post_content = content_div.get_text(separator=' ', strip=True)
-        post_content = re.sub(r'https?://[^\s]+', '', post_content)
-        content_list.append(post_content)
-        logging.info(f"내용 추출 성공 (URL 제거 및 띄어쓰기 유지)")
-
-        search_plt_list.append('웹페이지(오늘의유머)')
-        url_list.append(url)
-        search_word_list.append(search)
-
-        date_div = soup.find('div', class_='writerInfoContents')
-        date_str = date_div.find_all('div')[6].text.split(' ')[0]
-        date = datetime.strptime(date_str, '%Y/%m/%d')
-        date_list.append(date)
-        logging.info(f"날짜 추출 성공: {date_str}")
-
-        writer_list.append(soup.find('div', class_='writerInfoContents').find('div').find('a').get_text())
-        current_date_list.append(datetime.now().strftime('%Y-%m-%d'))
-
-        main_temp = pd.DataFrame({
-            "검색어": search_word_list,
-            "플랫폼": search_plt_list,
-            "게시물 URL": url_list,
-            "게시물 제목": title_list,
-            "게시물 내용": content_list,
-            "게시물 등록일자": date_list,
-            "계정명": writer_list,
-            "수집시간": current_date_list,
-        })
-
-        # [수정] 절대 경로 및 target_date 사용
-        current_dir = os.path.dirname(__file__)
-        save_path = os.path.join(current_dir, '..', 'data', 'raw', '5.오늘의유머', target_date)
-        os.makedirs(save_path, exist_ok=True)
-        
-        file_name = os.path.join(save_path, f'오늘의유머_{search}.csv')
-        save_to_csv(main_temp, file_name)
-        logging.info(f'저장 완료: {file_name}')
-
-    except Exception as e:
-        logging.error(f"오류 발생: {e}")
-        return pd.DataFrame()
+from .site_engine import SiteSpec, run_site, text_date, STRIP_TEXT_LINKS
+from .js_extract import field
+
+
+def _writer(page):
+    # 작성자 정보 첫 줄의 링크 텍스트
+    first_row = page.select_one('info_rows')
+    return page.text(page.select_one('writer_link', first_row))
+
+
+# 오늘의유머 수집 규칙 (목록/상세 루프는 site_engine 공통)
+TODAYHUMOR = SiteSpec(
+    name='오늘의유머',
+    save_dir='5.오늘의유머',
+    platform='웹페이지(오늘의유머)',
+    list_url='https://www.todayhumor.co.kr/board/list.php?table=total&page={page}&kind=search&keyfield=subject&keyword={search}',
+    list_wait='.table_list',
+    list_css={
+        'items': 'table.table_list tbody tr',
+        'date': 'td.date',
+        'link': 'td.subject a',
+    },
+    # 목록 날짜는 'YY/MM/DD HH:MM'
+    list_date=text_date('%y/%m/%d %H:%M'),
+    link_prefix='https://www.todayhumor.co.kr',
+    detail_wait='.viewContent',
+    detail_css={
+        'title': 'div.viewSubjectDiv div',
+        'content': 'div.viewContent',
+        'info_rows': 'div.writerInfoContents div',
+        'writer_link': 'a',
+    },
+    detail_extract={
+        # 작성자 정보 7번째 줄: 'YYYY/MM/DD HH:MM:SS'
+        'date': lambda page: page.text(page.select('info_rows')[6]),
+        'writer': _writer,
+    },
+    detail_js={
+        'date': field('div.writerInfoContents div', index=6),
+        'writer': field('a', within='div.writerInfoContents div'),
+    },
+    detail_date=text_date('%Y/%m/%d', token=0),
+    strip_links=STRIP_TEXT_LINKS,
+)
 
 
 def todayhumor_main_crw(searchs, start_date, end_date, stop_event):
-    target_date = start_date.strftime("%y%m%d")
-    
-    current_dir = os.path.dirname(__file__)
-    project_root = os.path.abspath(os.path.join(current_dir, '..'))
-    
-    log_dir = os.path.join(project_root, 'log')
-    os.makedirs(log_dir, exist_ok=True)
-
-    logging.basicConfig(
-        filename=os.path.join(log_dir, f'오늘의유머_log_{target_date}.txt'),
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        encoding='utf-8',
-        force=True
-    )
-
-    logging.info(f"========================================================")
-    logging.info(f"             오늘의유머 크롤링 시작 (Date: {target_date})")
-    logging.info(f"========================================================")
-    
-    wd = setup_driver()
-    wd_dp1 = setup_driver()
-    
-    for search in searchs:
-        if stop_event.is_set():
-            print("🛑 크롤링 중단됨")
-            break
-        page_num = 1
-        while True:
-            if stop_event.is_set():
-                break
-            try:
-                logging.info(f"크롤링 시작-검색어: {search}")
-                url = f'https://www.todayhumor.co.kr/board/list.php?table=total&page={page_num}&kind=search&keyfield=subject&keyword={search}'
-                wd_dp1.get(url)
-                WebDriverWait(wd_dp1, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'table_list')))
-                time.sleep(1)
-
-                soup_dp1 = BeautifulSoup(wd_dp1.page_source, 'html.parser')
-                tr_tags = soup_dp1.find('table', class_='table_list').find('tbody').find_all('tr')
-                
-                if not tr_tags:
-                    break
-
-                for tr in tr_tags:
-                    if stop_event.is_set():
-                        break
-                    after_start_date = False
-
-                    try:
-                        date_str = tr.find('td', class_='date').text
-                        date_str = '20' + date_str
-                        date = datetime.strptime(date_str, '%Y/%m/%d %H:%M').date()
-                        logging.info(f"날짜 찾음")
-                    except Exception as e:
-                        logging.error(f"날짜 오류 발생: {e}")
-                        continue
-
-                    if date > end_date:
-                        continue
-                    if date < start_date:
-                        after_start_date = True
-                        break
-
-                    url = 'https://www.todayhumor.co.kr' + tr.find('td', class_='subject').find('a').get('href')
-                    logging.info(f"url 찾음.")
-                    todayhumor_crw(wd, url, search, target_date)
-
-                if after_start_date:
-                    break
-                else:
-                    page_num += 1
-
-            except Exception as e:
-                print(f"오류 발생: {e}")
-                logging.error(f"오류 발생: {e}")
-                break
-    wd.quit()
-    wd_dp1.quit()
-
-    if not stop_event.is_set():
-        result_dir = os.path.join(project_root, '결과', '오늘의유머')
-        os.makedirs(result_dir, exist_ok=True)
-
-        all_data = pd.concat([
-            result_csv_data(search, platform='오늘의유머', subdir=f'5.오늘의유머/{target_date}', base_path='data/raw')
-            for search in searchs
-        ])
-        all_data.to_csv(os.path.join(result_dir, f'오늘의유머_raw data_{target_date}.csv'), encoding='utf-8', index=False)
\ No newline at end of file
+    run_site(TODAYHUMOR, searchs, start_date, end_date, stop_event)
@@ -12,6 +12,9 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 
+from . import csv_writer
+from . import net_block
+
 # 실행날짜 변수 및 폴더 생성
 today = datetime.now().strftime("%y%m%d")
 if not os.path.exists(f'log'):
@@ -46,6 +49,11 @@ def setup_driver():
     options.add_argument('--disable-blink-features=AutomationControlled')
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option('useAutomationExtension', False)
+
+    # 리소스 차단/로드 전략 (사이트별 예외는 net_block.SITE_OVERRIDES)
+    # - 이미지도 CDP(Network.setBlockedURLs)로만 차단: 브라우저 설정으로 끄면 비교 기준 샘플에서 다시 켤 수 없음
+    load_profile = net_block.profile()
+    options.page_load_strategy = load_profile["page_load_strategy"]
     try:
         
         options.binary_location = "/usr/bin/chromium"
@@ -71,6 +79,9 @@ def setup_driver():
                 });
             """
         })
+
+        # 이미지/영상/폰트/광고 요청 차단 (CDP)
+        net_block.apply(driver, load_profile)
         
         return driver
         
@@ -78,24 +89,10 @@ def setup_driver():
         logging.error(f"❌ 웹드라이버 실행 실패: {e}")
         raise e
     
-def result_csv_data(search, platform, subdir, base_path='csv'):
-    file_path = os.path.join(base_path, subdir, today, f'{platform}_{search}.csv')
-    if not os.path.isfile(file_path):
-        return pd.DataFrame()
-    try:
-        df = pd.read_csv(file_path, encoding='utf-8')
-        return df
-    except Exception as e:
-        print(f"[오류] CSV 읽기 실패 ({file_path}): {e}")
-        return pd.DataFrame()
-
 def save_to_csv(df, file_name):
+    # 바로 쓰지 않고 사이트별 배치 기록기에 넣음 (행 수/시간 기준으로 결과 파일과 함께 기록)
     try:
-        if os.path.isfile(file_name):
-            df.to_csv(file_name, mode='a', header=False, index=False, encoding='utf-8')
-        else:
-            df.to_csv(file_name, index=False, encoding='utf-8')
-        print(f"저장완료 : {file_name}")
+        csv_writer.add(df, file_name)
     except Exception as e:
         print(f"파일 저장 오류: {e}")
 
@@ -74,7 +74,8 @@ with DAG(
         bash_command=f'export PYTHONUNBUFFERED=1; '
                      f'PYTHONPATH=/opt/airflow '
                      f'python3 /opt/airflow/scripts/merge_all_raw_csv.py '
-                     f'--date "{{{{ data_interval_end.strftime("%y%m%d") }}}}"'
+                     f'--date "{{{{ data_interval_end.strftime("%y%m%d") }}}}" '
+                     f'--stream'
     )
     
 
@@ -0,0 +1,124 @@
+# keyword_match.py
+import logging
+from collections import deque
+
+import pandas as pd
+
+# pyahocorasick(C 구현)이 있으면 사용, 없으면 아래 파이썬 오토마톤으로 동작
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class _Automaton:
+    """
+    Aho-Corasick 오토마톤 (pyahocorasick이 없을 때 사용)
+    - 상태마다 다음 글자 -> 상태, 실패 링크, 이 상태에서 끝나는 패턴 번호 목록
+    """
+
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(index)
+
+        # 너비 우선으로 실패 링크 연결 (실패 상태의 출력도 합쳐 두어 매칭 시 링크를 다시 따라가지 않음)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter(self, text):
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                yield from out[state]
+
+
+class KeywordMatcher:
+    """
+    검색어 목록으로 오토마톤을 한 번 만들고 게시물마다 제목/본문을 한 번씩만 훑어 일치하는 검색어를 찾음
+    - ignore_case=True: 대소문자 구분 없음 (검색어는 만들 때, 본문은 게시물마다 한 번 소문자로 변환)
+    - 결과는 검색어 목록 순서의 원래 검색어 (소문자가 같은 검색어는 함께 반환)
+    """
+
+    def __init__(self, keywords, ignore_case=True):
+        self.keywords = [str(k) for k in keywords if pd.notna(k) and str(k)]
+        self.ignore_case = ignore_case
+        patterns = list(dict.fromkeys(self._fold(k) for k in self.keywords))
+        # 패턴 번호 -> 해당 패턴을 가진 검색어 번호들
+        self._owners = [[i for i, k in enumerate(self.keywords) if self._fold(k) == p] for p in patterns]
+
+        if ahocorasick is not None:
+            self.backend = "pyahocorasick"
+            self._automaton = ahocorasick.Automaton()
+            for index, pattern in enumerate(patterns):
+                self._automaton.add_word(pattern, index)
+            if patterns:
+                self._automaton.make_automaton()
+        else:
+            self.backend = "python"
+            logging.info("pyahocorasick이 없어 파이썬 Aho-Corasick으로 검색어를 찾습니다.")
+            self._automaton = _Automaton(patterns)
+        self._empty = not patterns
+
+    def _fold(self, text):
+        return text.lower() if self.ignore_case else text
+
+    def _pattern_ids(self, text):
+        if self._empty or not text:
+            return set()
+        text = self._fold(text)
+        if self.backend == "pyahocorasick":
+            return {index for _, index in self._automaton.iter(text)}
+        return set(self._automaton.iter(text))
+
+    def contains(self, *texts):
+        """하나라도 일치하면 True (첫 일치에서 멈춤)"""
+        if self._empty:
+            return False
+        for text in texts:
+            if text:
+                for _ in self._automaton.iter(self._fold(text)):
+                    return True
+        return False
+
+    def find(self, *texts):
+        """여러 텍스트(제목, 본문 등)에서 일치한 검색어 목록"""
+        ids = set()
+        for text in texts:
+            ids |= self._pattern_ids(text)
+        owners = sorted(i for pattern in ids for i in self._owners[pattern])
+        return [self.keywords[i] for i in owners]
+
+    def contains_columns(self, *columns):
+        """행마다 검색어가 하나라도 있으면 True인 Series (검색어 목록을 만들지 않고 첫 일치에서 멈춤)"""
+        texts = zip(*(column.fillna("").astype(str) for column in columns))
+        return pd.Series([self.contains(*row) for row in texts], index=columns[0].index, dtype=bool)
+
+    def match_columns(self, *columns):
+        """행마다 일치한 검색어 목록 Series (columns: 같은 인덱스의 문자열 Series들)"""
+        texts = zip(*(column.fillna("").astype(str) for column in columns))
+        return pd.Series([self.find(*row) for row in texts], index=columns[0].index, dtype=object)
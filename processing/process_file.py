@@ -1,8 +1,56 @@
 # process_file.py
 import re
 import pandas as pd
+from processing.keyword_match import KeywordMatcher
 
-def filter_untrusted_posts(all_data, untrusted_file, trusted_file):
+# 본문 속 호스트명 (URL, 이메일, 'chosun.com' 같은 표기 모두)
+HOST_PATTERN = re.compile(r'(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z]{2,}', re.IGNORECASE | re.ASCII)
+
+
+def _host_of(domain):
+    """엑셀의 도메인 표기 -> 호스트명 (스킴/경로/www. 제거, 소문자)"""
+    domain = str(domain).strip().lower()
+    domain = re.sub(r'^[a-z]+://', '', domain).split('/')[0]
+    return domain[4:] if domain.startswith('www.') else domain
+
+
+class DomainSet:
+    """
+    도메인 목록을 호스트명 해시 집합으로 보관
+    - 본문에서 추출한 호스트의 상위 도메인까지 확인 (news.chosun.com -> chosun.com)
+    - 호스트명 형태가 아닌 항목('natv.go.k'처럼 잘린 값 등)은 기존처럼 부분 문자열로 찾음
+    """
+
+    def __init__(self, domains):
+        self.hosts = set()
+        partial = []
+        for domain in domains:
+            host = _host_of(domain)
+            if HOST_PATTERN.fullmatch(host):
+                self.hosts.add(host)
+            elif host:
+                partial.append(str(domain).strip())
+        self._partial = KeywordMatcher(partial, ignore_case=False)
+
+    def matches(self, hosts, text):
+        for host in hosts:
+            labels = host.split('.')
+            if any('.'.join(labels[i:]) in self.hosts for i in range(len(labels) - 1)):
+                return True
+        return self._partial.contains(text)
+
+
+def extract_hosts(text):
+    """본문에 나온 호스트명 집합 (소문자)"""
+    return {m.group(0).lower() for m in HOST_PATTERN.finditer(text)}
+
+
+def filter_untrusted_posts(all_data, untrusted_file, trusted_file, use_index=True):
+    """
+    비신탁사 저작권 문구나 도메인이 있고 매체사(신탁사) 도메인은 없는 게시물 제거
+    - use_index=True: 본문 호스트명을 한 번 추출해 도메인 해시 집합으로 확인, 저작권 문구는 오토마톤 한 번으로 확인
+    - use_index=False: 기존 방식 (문구/도메인마다 본문 전체에서 부분 문자열 검색)
+    """
     # 비신탁사 및 매체사 도메인 불러오기
     df_untrusted = pd.read_excel(untrusted_file)
     df_trusted = pd.read_excel(trusted_file)
@@ -11,12 +59,24 @@ def filter_untrusted_posts(all_data, untrusted_file, trusted_file):
     untrusted_domains = df_untrusted["도메인"].dropna().tolist()
     trusted_domains = df_trusted["도메인"].dropna().tolist()
 
-    def should_remove(post_content):
-        post_content = str(post_content)
-        contains_untrusted_copyright = any(c in post_content for c in untrusted_copyrights)
-        contains_untrusted_domain = any(d in post_content for d in untrusted_domains)
-        contains_trusted_domain = any(t in post_content for t in trusted_domains)
-        return (contains_untrusted_copyright or contains_untrusted_domain) and not contains_trusted_domain
+    if use_index:
+        copyright_matcher = KeywordMatcher(untrusted_copyrights, ignore_case=False)
+        untrusted_set = DomainSet(untrusted_domains)
+        trusted_set = DomainSet(trusted_domains)
+
+        def should_remove(post_content):
+            post_content = str(post_content)
+            hosts = extract_hosts(post_content)
+            if not (copyright_matcher.contains(post_content) or untrusted_set.matches(hosts, post_content)):
+                return False
+            return not trusted_set.matches(hosts, post_content)
+    else:
+        def should_remove(post_content):
+            post_content = str(post_content)
+            contains_untrusted_copyright = any(c in post_content for c in untrusted_copyrights)
+            contains_untrusted_domain = any(d in post_content for d in untrusted_domains)
+            contains_trusted_domain = any(t in post_content for t in trusted_domains)
+            return (contains_untrusted_copyright or contains_untrusted_domain) and not contains_trusted_domain
 
     # 결측값 방지
     content_series = all_data["게시물 내용"].fillna("")
@@ -30,52 +90,45 @@ def filter_untrusted_posts(all_data, untrusted_file, trusted_file):
     return df_filtered
 
 
+# '~다.' 형태: '다' 뒤에 공백이 있거나 붙어서 점(.)이 나오는 경우
+# - '니다.'는 보통 존댓말/댓글이므로 기사체로 보지 않음 (포함하려면 (?<!니)를 지우세요)
+DA_PATTERN = re.compile(r'(?<!니)다\s*\.')
+
+
+def has_valid_da(df):
+    """제목이나 본문에 '~다.'가 있는 행 (행마다 정규식을 돌리지 않고 str 접근자로 한 번에 판정)"""
+    title = df["게시물 제목"].fillna("").astype(str)
+    content = df["게시물 내용"].fillna("").astype(str)
+    return title.str.contains(DA_PATTERN, regex=True) | content.str.contains(DA_PATTERN, regex=True)
+
+
 def filter_da(df_filtered):
-    def has_valid_da(text):
-        """
-        본문에 '~다.' 형태가 포함되어 있는지 확인하는 함수
-        """
-        text = str(text)
-        # '다' 뒤에 공백이 있거나 붙어서 점(.)이 나오는 경우 찾기
-        matches = list(re.finditer(r"다\s*\.", text))
-        
-        for match in matches:
-            start = match.start()
-            
-            # [예외] '니다.'는 보통 존댓말/댓글이므로 기사체로 보지 않고 패스
-            # (만약 '니다.'도 포함해서 수집하고 싶으면 이 if문을 지우세요)
-            if start >= 1 and text[start - 1] == "니":
-                continue  
-            
-            # '~다.' 발견됨 -> 이 글은 우리가 원하는 글임!
-            return True
-            
-        # 끝까지 뒤졌는데 '~다.'가 없음 -> 우리가 원하는 글이 아님
-        return False
-
-    def should_remove(title, content):
-        """
-        삭제 여부를 결정하는 함수 (True면 삭제, False면 유지)
-        """
-        # 1. 제목이나 내용에 '다.'가 포함되어 있으면 -> 삭제하지 않음(False)
-        if has_valid_da(title) or has_valid_da(content):
-            return False 
-        
-        # 2. '다.'가 없으면 -> 삭제함(True)
-        return True
-
-    # 결측값 처리
-    content_series = df_filtered["게시물 내용"].fillna("")
-    title_series = df_filtered["게시물 제목"].fillna("")
-
-    # apply 함수로 각 행 검사
-    mask = df_filtered.apply(lambda row: should_remove(row['게시물 제목'], row['게시물 내용']), axis=1)
-    
-    # mask가 True인(삭제해야 할) 애들을 제외(~)하고 남김
-    df_result = df_filtered[~mask]
+    """'~다.' 형태가 제목이나 본문에 없는 게시물 제거"""
+    df_result = df_filtered[has_valid_da(df_filtered)]
 
     # 데이터가 없으면 빈 DataFrame 반환
     if df_result.empty:
         df_result = df_filtered.iloc[0:0]
 
-    return df_result
\ No newline at end of file
+    return df_result
+
+
+def post_filter_mask(df, has_keyword, target_year, target_month, require_da=True):
+    """
+    전처리 필터를 하나의 불리언 마스크로 계산 (중간 DataFrame을 만들지 않음)
+    - 검색어 포함(has_keyword) / 신춘문예(제목, 본문) / 뽐뿌뉴스(계정명) 제외 / 등록일자 연월
+    - 위 조건을 통과한 행 중 게시물 URL이 처음 나온 행만 (drop_duplicates(keep='first')와 같음)
+    - require_da: 남은 행만 '~다.' 판정
+    """
+    keep = (
+        has_keyword &
+        ~df['게시물 내용'].str.contains('신춘문예', na=False, case=False) &
+        ~df['게시물 제목'].str.contains('신춘문예', na=False, case=False) &
+        ~df['계정명'].fillna('').astype(str).str.contains('뽐뿌뉴스', case=False) &
+        (df['게시물 등록일자'].dt.year == target_year) &
+        (df['게시물 등록일자'].dt.month == target_month)
+    )
+    keep.loc[keep] = ~df.loc[keep, '게시물 URL'].duplicated()
+    if require_da and keep.any():
+        keep.loc[keep] = has_valid_da(df.loc[keep])
+    return keep
@@ -0,0 +1,121 @@
+# url_index.py
+import json
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import pandas as pd
+
+# 목록(검색 결과) 페이지가 상세 링크에 붙이는 검색어/페이지 파라미터와 유입 추적 파라미터
+# - 같은 게시물이 검색어나 목록 페이지마다 다른 URL로 수집되므로 중복 판단에서 제외
+DROP_PARAMS = {
+    'page', 'p', 'po', 'od',
+    'q', 'query', 'keyword', 'keys', 'keyfield', 'search', 'search1', 'searchtype', 'search_type',
+    's_keyword', 'search_keyword', 'search_head', 'search_pos', 'stx', 'sfl', 'sop', 'sca',
+    'fbclid', 'gclid', 'ref',
+}
+DROP_PREFIXES = ('utm_',)
+DEFAULT_PORTS = {80, 443}
+
+
+def normalize_url(url):
+    """
+    중복 판단용 URL 정규화
+    - http/https 구분 없음, 호스트 소문자, 기본 포트/#fragment 제거
+    - 검색/페이지/추적 파라미터 제거 후 나머지 파라미터를 이름순 정렬
+    """
+    text = str(url).strip()
+    parts = urlsplit(text)
+    if not parts.netloc:
+        return text
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port not in DEFAULT_PORTS:
+        host = f'{host}:{parts.port}'
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=False)
+        if key.lower() not in DROP_PARAMS and not key.lower().startswith(DROP_PREFIXES)
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def url_hash(url):
+    """정규화한 URL의 64비트 해시 (URL 문자열 대신 정수만 기억)"""
+    digest = hashlib.blake2b(normalize_url(url).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class UrlIndex:
+    """
+    병합 중 이미 나온 게시물 URL을 64비트 해시로 기억하고 중복 행을 제거
+    - 먼저 들어온 행을 남김 (process_data의 drop_duplicates(keep='first')와 같음)
+    - URL이 비어 있는 행은 중복 판단 없이 남김
+    - stats: (플랫폼, 검색어) -> [입력 행 수, 제거한 중복 수]
+    - 스트리밍 병합의 기록 스레드 하나에서만 호출 (잠금 없음)
+    """
+
+    def __init__(self):
+        self._hashes = set()
+        self.stats = {}
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def filter(self, df):
+        if df.empty or "게시물 URL" not in df:
+            return df
+        keep = []
+        for url in df["게시물 URL"]:
+            if pd.isna(url) or not str(url).strip():
+                keep.append(True)
+                continue
+            h = url_hash(url)
+            if h in self._hashes:
+                keep.append(False)
+                continue
+            self._hashes.add(h)
+            keep.append(True)
+        keep = pd.Series(keep, index=df.index)
+        self._count(df, keep)
+        return df[keep]
+
+    def _count(self, df, keep):
+        platform = df["플랫폼"] if "플랫폼" in df else pd.Series('', index=df.index)
+        search = df["검색어"] if "검색어" in df else pd.Series('', index=df.index)
+        groups = pd.DataFrame({
+            "플랫폼": platform.fillna('').astype(str),
+            "검색어": search.fillna('').astype(str),
+            "dropped": ~keep,
+        }).groupby(["플랫폼", "검색어"], sort=False)["dropped"].agg(['size', 'sum'])
+        for (p, s), (rows, dropped) in groups.iterrows():
+            counts = self.stats.setdefault((p, s), [0, 0])
+            counts[0] += int(rows)
+            counts[1] += int(dropped)
+
+    def summary(self):
+        """플랫폼별 합계와 검색어별 상세 (JSON 저장용)"""
+        platforms = {}
+        keywords = []
+        for (platform, search), (rows, dropped) in sorted(self.stats.items()):
+            total = platforms.setdefault(platform, {"rows": 0, "duplicates": 0})
+            total["rows"] += rows
+            total["duplicates"] += dropped
+            keywords.append({"플랫폼": platform, "검색어": search, "rows": rows, "duplicates": dropped})
+        return {
+            "unique_urls": len(self._hashes),
+            "rows": sum(rows for rows, _ in self.stats.values()),
+            "duplicates": sum(dropped for _, dropped in self.stats.values()),
+            "platforms": platforms,
+            "keywords": keywords,
+        }
+
+    def report(self, stats_path=None):
+        summary = self.summary()
+        print(f"🧹 URL 중복 제거: {summary['rows']}건 중 {summary['duplicates']}건 제거 (고유 URL {summary['unique_urls']}개)")
+        for platform, total in summary["platforms"].items():
+            if total["duplicates"]:
+                print(f"   {platform}: {total['rows']}건 중 {total['duplicates']}건 중복")
+        if stats_path:
+            with open(stats_path, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+            print(f"   (검색어별 통계: {stats_path})")
+        return summary
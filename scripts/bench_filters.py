@@ -0,0 +1,105 @@
+import os
+import re
+import sys
+import time
+import argparse
+
+import pandas as pd
+
+# 프로젝트 루트 경로 설정
+SCRIPT_PATH = os.path.abspath(__file__)
+PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(SCRIPT_PATH))
+sys.path.append(PROJECT_ROOT_DIR)
+
+from processing.keyword_match import KeywordMatcher
+from processing.process_file import post_filter_mask, filter_da
+from scripts.process_data import parse_post_dates
+
+
+def legacy_filter_da(df_filtered):
+    """기존 filter_da: 행마다 re.finditer 루프 (df.apply(axis=1))"""
+    def has_valid_da(text):
+        text = str(text)
+        for match in re.finditer(r"다\s*\.", text):
+            start = match.start()
+            if start >= 1 and text[start - 1] == "니":
+                continue
+            return True
+        return False
+
+    mask = df_filtered.apply(lambda row: not (has_valid_da(row['게시물 제목']) or has_valid_da(row['게시물 내용'])), axis=1)
+    df_result = df_filtered[~mask]
+    if df_result.empty:
+        df_result = df_filtered.iloc[0:0]
+    return df_result
+
+
+def legacy_filter(df, searchs, target_year, target_month):
+    """기존 process_data 필터: 검색어 apply -> df1 -> df2(날짜) -> df3(URL 중복) -> DA"""
+    df1 = df[
+        (df.apply(
+            lambda x: any(s.lower() in str(x['게시물 제목']).lower() or s.lower() in str(x['게시물 내용']).lower() for s in searchs),
+            axis=1
+        )) &
+        (~df['게시물 내용'].str.contains('신춘문예', na=False, case=False)) &
+        (~df['게시물 제목'].str.contains('신춘문예', na=False, case=False)) &
+        (~df['계정명'].fillna('').str.contains('뽐뿌뉴스', case=False))
+    ]
+    df2 = df1[
+        (df1['게시물 등록일자'].dt.year == target_year) &
+        (df1['게시물 등록일자'].dt.month == target_month)
+    ]
+    df3 = df2.drop_duplicates(subset=['게시물 URL'])
+    return legacy_filter_da(df3)
+
+
+def current_filter(df, searchs, target_year, target_month):
+    """지금 process_data 필터: 검색어 오토마톤 + 마스크 하나"""
+    matcher = KeywordMatcher(searchs)
+    has_keyword = matcher.contains_columns(df['게시물 제목'], df['게시물 내용'])
+    return df[post_filter_mask(df, has_keyword, target_year, target_month)]
+
+
+def timed(func, repeat, *args):
+    result = None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(*args)
+    return (time.perf_counter() - start) / repeat, result
+
+
+def bench(input_csv, search_excel, target_year, target_month, repeat):
+    searchs = pd.read_excel(search_excel, sheet_name='검색어 목록')['검색어명']
+    df = pd.read_csv(input_csv, encoding="utf-8")
+    df['게시물 등록일자'] = parse_post_dates(df['게시물 등록일자'])
+    df["게시물 제목"] = df["게시물 제목"].fillna("").astype(str)
+    df["게시물 내용"] = df["게시물 내용"].fillna("").astype(str)
+    print(f"📂 {input_csv}: {len(df)}행, 검색어 {len(searchs)}개, {target_year}-{target_month:02d} x {repeat}회")
+
+    legacy_sec, legacy_df = timed(legacy_filter, repeat, df, searchs, target_year, target_month)
+    current_sec, current_df = timed(current_filter, repeat, df, searchs, target_year, target_month)
+    da_legacy_sec, da_legacy = timed(legacy_filter_da, repeat, df)
+    da_current_sec, da_current = timed(filter_da, repeat, df)
+
+    print(f"   기존 (apply + df1/df2/df3 + filter_da): {legacy_sec:.2f}초 -> {len(legacy_df)}행")
+    print(f"   현재 (오토마톤 + 마스크 하나)          : {current_sec:.2f}초 -> {len(current_df)}행 "
+          f"(x{legacy_sec / max(current_sec, 1e-9):.1f})")
+    print(f"   DA만 (전체 행): finditer 루프 {da_legacy_sec:.2f}초 ({len(da_legacy)}행) / "
+          f"str.contains {da_current_sec:.2f}초 ({len(da_current)}행, x{da_legacy_sec / max(da_current_sec, 1e-9):.1f})")
+    if not legacy_df.index.equals(current_df.index):
+        only_legacy = legacy_df.index.difference(current_df.index)
+        only_current = current_df.index.difference(legacy_df.index)
+        print(f"   ⚠️ 결과 불일치: 기존에만 {len(only_legacy)}행, 현재에만 {len(only_current)}행")
+    else:
+        print("   ✅ 결과 동일")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="process_data 필터 단계: 기존 행별 apply 방식과 현재 방식 비교")
+    parser.add_argument("--input_csv", required=True, help="병합 CSV (예: data/merged/merged_raw_<날짜>.csv)")
+    parser.add_argument("--search_excel", default=os.path.join(PROJECT_ROOT_DIR, "config", "search_keywords_2025.xlsx"))
+    parser.add_argument("--year", required=True, type=int)
+    parser.add_argument("--month", required=True, type=int)
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (평균 시간)")
+    args = parser.parse_args()
+    bench(args.input_csv, args.search_excel, args.year, args.month, max(1, args.repeat))
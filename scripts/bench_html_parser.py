@@ -0,0 +1,69 @@
+import os
+import sys
+import glob
+import time
+import argparse
+
+# 프로젝트 루트 경로 설정
+SCRIPT_PATH = os.path.abspath(__file__)
+PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(SCRIPT_PATH))
+sys.path.append(PROJECT_ROOT_DIR)
+
+from crawlers import html_parser
+# 셀렉터 묶음은 크롤러 모듈 import 시 등록됨
+import crawlers.dc_crawler  # noqa: F401
+import crawlers.dq_crawler  # noqa: F401
+
+DEFAULT_PAGES_DIR = os.path.join(PROJECT_ROOT_DIR, "data", "fixtures", "html")
+
+
+def run_backend(selector_set, pages, repeat):
+    """페이지 파싱 + 모든 셀렉터 실행 시간(초)과 셀렉터별 매칭 수 반환"""
+    counts = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        counts = []
+        for html in pages:
+            page = selector_set.parse(html)
+            counts.append(tuple(len(page.select(key)) for key in selector_set.css))
+    return time.perf_counter() - start, counts
+
+
+def bench(pages_dir, repeat):
+    print(f"🔍 저장된 페이지 위치: {pages_dir}/<셀렉터 묶음>/*.html")
+    if html_parser.lxml is None:
+        print("❌ lxml/cssselect가 설치되어 있지 않아 비교할 수 없습니다. 'pip install lxml cssselect'")
+        return
+
+    for name, compiled in sorted(html_parser.REGISTRY.items()):
+        files = sorted(glob.glob(os.path.join(pages_dir, name, "*.html")))
+        if not files:
+            print(f"⚠️ {name}: 저장된 페이지 없음")
+            continue
+        pages = []
+        for file in files:
+            with open(file, encoding="utf-8", errors="replace") as f:
+                pages.append(f.read())
+
+        # 기존 방식: BeautifulSoup(html, 'html.parser') + soupsieve 셀렉터
+        bs4_set = html_parser.SelectorSet(name, backend="bs4", **compiled.css)
+        lxml_set = html_parser.SelectorSet(name, backend="lxml", **compiled.css)
+
+        bs4_sec, bs4_counts = run_backend(bs4_set, pages, repeat)
+        lxml_sec, lxml_counts = run_backend(lxml_set, pages, repeat)
+
+        n = len(pages) * repeat
+        mismatch = sum(1 for a, b in zip(bs4_counts, lxml_counts) if a != b)
+        print(f"📄 {name}: 페이지 {len(pages)}개 x {repeat}회")
+        print(f"   bs4(html.parser): {bs4_sec / n * 1000:.2f} ms/페이지")
+        print(f"   lxml(cssselect) : {lxml_sec / n * 1000:.2f} ms/페이지 (x{bs4_sec / max(lxml_sec, 1e-9):.1f})")
+        if mismatch:
+            print(f"   ⚠️ 셀렉터 매칭 수가 다른 페이지 {mismatch}개 (셀렉터 확인 필요)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages_dir", type=str, default=DEFAULT_PAGES_DIR, help="저장된 HTML 페이지 폴더 (하위 폴더명 = 셀렉터 묶음 이름, 예: dc_list)")
+    parser.add_argument("--repeat", type=int, default=5, help="페이지당 반복 횟수")
+    args = parser.parse_args()
+    bench(args.pages_dir, args.repeat)
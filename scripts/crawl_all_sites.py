@@ -5,7 +5,8 @@ import pandas as pd
 from datetime import datetime
 import multiprocessing
 import time
-import glob
+import signal
+import psutil
 
 #  경로 설정
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -35,68 +36,130 @@ from crawlers.mlb_crawler import mlb_main_crw
 from crawlers.dc_crawler import dc_main_crw
 from crawlers.fm_crawler import fm_main_crw
 from crawlers.dq_crawler import dq_main_crw
+from crawlers.driver_pool import get_pool
+from crawlers.http_fetch import set_http_first
+from crawlers import progress
+from crawlers import seen_urls
+from crawlers import csv_writer
+from crawlers import net_block
+from crawlers import checkpoint
+from crawlers import metrics
+from crawlers import fixtures
+
+# [설정] 사이트 프로세스 1개가 쓰는 예상 메모리 (Chromium 풀 포함, MB)
+SITE_MEMORY_MB = int(os.getenv("CRAWL_SITE_MEMORY_MB", "1500"))
+# [설정] 사이트 프로세스 실행 간 최소 간격 (초)
+LAUNCH_INTERVAL = 5
+# [설정] 진행 상황(처리량) 출력 간격 (초)
+REPORT_INTERVAL = 60
 
 # 크롤러 매핑
+# - http_first: 서버 렌더링 사이트는 requests로 먼저 수집하고, 셀렉터 실패/봇 차단 시에만 드라이버 사용
 crawlers = {
-    "뽐뿌": pp_main_crw,
-    "클리앙": clien_main_crw,
-    "인벤": inven_main_crw,
-    "오늘의유머": todayhumor_main_crw,
-    "네이트판": paan_main_crw,
-    "인스티즈": instiz_main_crw,
-    "보배드림": bobaedream_main_crw,
-    "루리웹": rw_main_crw,
-    "아카라이브": arca_main_crw,
-    "일간베스트": ilbe_main_crw,
-    "웃긴대학": humoruniv_main_crw,
-    "82쿡": cook82_main_crw,
-    "오르비": orbi_main_crw,
-    "개드립": dogdrip_main_crw,
-    "DVD프라임": dp_main_crw,
-    "동사로마닷컴": dongsaroma_main_crw,
-    "사커라인": scline_main_crw,
-    "포모스": fomos_main_crw,
-    "짱공유닷컴": jjang0u_main_crw,
-    "블라인드": blind_main_crw,
-    "엠엘비파크": mlb_main_crw,
-    "디시인사이드": dc_main_crw,
-    "에펨코리아": fm_main_crw,
-    "더쿠": dq_main_crw
+    "뽐뿌": {"func": pp_main_crw, "http_first": True},
+    "클리앙": {"func": clien_main_crw, "http_first": True},
+    "인벤": {"func": inven_main_crw, "http_first": False},
+    "오늘의유머": {"func": todayhumor_main_crw, "http_first": True},
+    "네이트판": {"func": paan_main_crw, "http_first": False},
+    "인스티즈": {"func": instiz_main_crw, "http_first": False},
+    "보배드림": {"func": bobaedream_main_crw, "http_first": False},
+    "루리웹": {"func": rw_main_crw, "http_first": False},
+    "아카라이브": {"func": arca_main_crw, "http_first": False},
+    "일간베스트": {"func": ilbe_main_crw, "http_first": True},
+    "웃긴대학": {"func": humoruniv_main_crw, "http_first": False},
+    "82쿡": {"func": cook82_main_crw, "http_first": True},
+    "오르비": {"func": orbi_main_crw, "http_first": False},
+    "개드립": {"func": dogdrip_main_crw, "http_first": False},
+    "DVD프라임": {"func": dp_main_crw, "http_first": False},
+    "동사로마닷컴": {"func": dongsaroma_main_crw, "http_first": False},
+    "사커라인": {"func": scline_main_crw, "http_first": False},
+    "포모스": {"func": fomos_main_crw, "http_first": False},
+    "짱공유닷컴": {"func": jjang0u_main_crw, "http_first": False},
+    "블라인드": {"func": blind_main_crw, "http_first": False},
+    "엠엘비파크": {"func": mlb_main_crw, "http_first": True},
+    "디시인사이드": {"func": dc_main_crw, "http_first": False},
+    "에펨코리아": {"func": fm_main_crw, "http_first": False},
+    "더쿠": {"func": dq_main_crw, "http_first": False}
 }
 
 # 프로세스 실행 래퍼 함수
-def run_crawler_process(crawler_func, searchs, start_date, end_date, stop_event):
+def run_crawler_process(site_name, crawler_func, searchs, start_date, end_date, stop_event, http_first=False, progress_shared=None):
+    set_http_first(http_first)
+    # 사이트별 리소스 차단/로드 전략 예외 적용 (드라이버 기동 전에 설정)
+    net_block.configure(site_name)
+    # CRAWL_RECORD_FIXTURES=1이면 목록/상세 HTML을 녹화 (scripts/replay_parsers.py 리플레이용)
+    fixtures.configure(site_name)
+    # 크롤러 -> supervisor 진행 상황 보고 채널 (heartbeat + 카운터)
+    progress.init(progress_shared)
+    # 실행 간 유지되는 수집 URL 인덱스 (재실행 시 이미 저장한 게시물 스킵)
+    seen_urls.open_store(site_name, start_date)
+    # 같은 기간 재실행(무응답 종료/재시도) 시 마지막 검색어/페이지부터 이어서 수집
+    checkpoint.open_store(site_name, start_date, end_date, searchs)
+    # 구간별 시간/이벤트 지표 (종료 시 data/metrics에 JSON + Prometheus textfile로 기록)
+    metrics.start(site_name, start_date)
+
+    # 크롤러가 로그/폴더를 준비하는 동안 Chromium을 병렬로 미리 기동 (HTTP 우선 사이트는 폴백 시에만 기동)
+    pool = get_pool()
+    if not http_first:
+        pool.warm_up()
+    completed = False
+
+    # supervisor의 terminate(SIGTERM)에도 아래 finally가 실행되도록 종료를 예외로 바꿈
+    # - 기본 동작은 즉시 종료라 버퍼에 남은 행/seen_urls/지표가 기록되지 않음
+    # - stop_event는 모든 사이트가 공유하므로 여기서 set하지 않음
+    def on_sigterm(signum, frame):
+        raise SystemExit(128 + signum)
+
+    signal.signal(signal.SIGTERM, on_sigterm)
     try:
         crawler_func(searchs, start_date, end_date, stop_event)
+        if not stop_event.is_set():
+            seen_urls.mark_completed(list(searchs) + [seen_urls.ALL_KEYWORDS])
+            completed = True
     except Exception as e:
         print(f"Error inside process: {e}")
+    finally:
+        # 정리 도중 다시 온 SIGTERM으로 기록이 끊기지 않도록 무시
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        # 자식 프로세스는 atexit이 실행되지 않으므로 직접 정리 (버퍼에 남은 행을 먼저 기록해야 수집 완료로 표시됨)
+        csv_writer.close()
+        pool.close_all()
+        seen_urls.close_store()
+        checkpoint.close_store(completed)
+        net_block.report()
+        metrics.report(completed)
 
-# [핵심] 해당 사이트의 데이터 저장 폴더 찾기
-def find_data_folder(site_name, target_date_str):
-    # 프로젝트 루트의 data/raw 경로
-    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'raw'))
-    
-    # 1.뽐뿌, 5.오늘의유머 등 폴더명이 숫자와 섞여있으므로 검색
-    if not os.path.exists(base_dir):
-        return None
-        
-    for folder in os.listdir(base_dir):
-        if site_name in folder: 
-            full_path = os.path.join(base_dir, folder, target_date_str)
-            return full_path
-    return None
-
-# [핵심] 폴더 내에서 가장 최신 파일의 수정 시간 가져오기
-def get_latest_file_mtime(folder_path):
-    if not folder_path or not os.path.exists(folder_path):
-        return 0
-    
-    list_of_files = glob.glob(os.path.join(folder_path, '*.csv'))
-    if not list_of_files:
-        return 0
-    
-    latest_file = max(list_of_files, key=os.path.getmtime)
-    return os.path.getmtime(latest_file)
+# 동시 실행 사이트 수 계산 (코어 2개당 1사이트, 사용 가능 메모리 한도 내)
+def compute_max_parallel():
+    cpu_slots = max(1, (os.cpu_count() or 1) // 2)
+    available_mb = psutil.virtual_memory().available / (1024 * 1024)
+    mem_slots = max(1, int(available_mb // SITE_MEMORY_MB))
+    return min(cpu_slots, mem_slots)
+
+# 크롤러 프로세스와 그 자식(chromedriver, chromium)까지 함께 종료
+def terminate_process_tree(p):
+    try:
+        children = psutil.Process(p.pid).children(recursive=True)
+    except psutil.Error:
+        children = []
+    p.terminate()
+    for child in children:
+        try:
+            child.kill()
+        except psutil.Error:
+            pass
+    p.join(timeout=10)
+    # 정리(버퍼 기록)가 끝나지 않으면 강제 종료
+    if p.is_alive():
+        p.kill()
+        p.join(timeout=5)
+
+# 진행 상황 한 줄 요약 (누적 카운터 + 분당 처리량)
+def format_progress(counters, elapsed):
+    minutes = max(elapsed / 60, 1 / 60)
+    return (f"목록 {counters['pages_listed']} / 상세 {counters['posts_fetched']} / "
+            f"저장 {counters['posts_saved']} / 오류 {counters['errors']} "
+            f"({counters['posts_fetched'] / minutes:.1f} 상세/분)")
 
 if __name__ == "__main__":
     multiprocessing.freeze_support()
@@ -106,6 +169,7 @@ if __name__ == "__main__":
     parser.add_argument("--start_date", type=str, required=True, help="시작 날짜 (YYYY-MM-DD)")
     parser.add_argument("--end_date", type=str, required=True, help="종료 날짜 (YYYY-MM-DD)")
     parser.add_argument("--search_excel", type=str, required=True, help="검색어 엑셀 파일 경로")
+    parser.add_argument("--max_parallel", type=int, default=0, help="동시에 실행할 사이트 수 (0이면 CPU/메모리 여유로 자동 계산)")
     
     args = parser.parse_args()
 
@@ -113,7 +177,6 @@ if __name__ == "__main__":
     try:
         start_date_obj = datetime.strptime(args.start_date, "%Y-%m-%d").date()
         end_date_obj = datetime.strptime(args.end_date, "%Y-%m-%d").date()
-        target_date_str = start_date_obj.strftime("%y%m%d") # 폴더명용 (251222)
     except ValueError:
         print("❌ 날짜 형식이 올바르지 않습니다.")
         sys.exit(1)
@@ -152,63 +215,82 @@ if __name__ == "__main__":
     # [설정] 전체 최대 제한 시간 (6시간)
     MAX_TOTAL_TIMEOUT = 6 * 60 * 60
 
+    max_parallel = args.max_parallel if args.max_parallel > 0 else compute_max_parallel()
+    print(f"⚙️ 동시 실행 사이트 수: {max_parallel}")
+
     stop_event = multiprocessing.Event()
 
-    for site_name in sites_to_crawl:
+    pending = list(sites_to_crawl)
+    running = {}  # site_name -> 감시 상태
+    last_launch_time = 0
+
+    while pending or running:
+        current_time = time.time()
+
+        # 1. 빈 슬롯이 있으면 다음 사이트 실행 (Chromium 동시 기동 폭주 방지를 위해 간격 유지)
+        if pending and len(running) < max_parallel and current_time - last_launch_time >= LAUNCH_INTERVAL:
+            site_name = pending.pop(0)
+            crawler_func = crawlers[site_name]["func"]
+            http_first = crawlers[site_name]["http_first"]
+            print(f"\n🚀 [{site_name}] 크롤링 시작... ({IDLE_TIMEOUT}초 무응답 시 종료, 실행 중 {len(running) + 1}/{max_parallel})")
+
+            # 사이트별 공유 메모리 [heartbeat, 목록, 상세, 저장, 오류]
+            progress_shared = multiprocessing.Array('d', progress.SLOT_COUNT)
+
+            p = multiprocessing.Process(
+                target=run_crawler_process, 
+                args=(site_name, crawler_func, searchs, start_date_obj, end_date_obj, stop_event, http_first, progress_shared)
+            )
+            p.start()
+            last_launch_time = current_time
+
+            running[site_name] = {
+                "process": p,
+                "start_time": current_time,
+                "last_activity_time": current_time,
+                "last_report_time": current_time,
+                "progress": progress_shared,
+            }
+
+        # 2. 실행 중인 사이트별 감시 (사이트마다 독립된 무응답/전체 제한 시간)
+        for site_name, state in list(running.items()):
+            p = state["process"]
+
+            if p.is_alive():
+                # 2-1. 전체 시간 초과 체크 (안전장치)
+                if current_time - state["start_time"] > MAX_TOTAL_TIMEOUT:
+                    print(f"🛑 [{site_name}] 전체 제한 시간({MAX_TOTAL_TIMEOUT}초) 초과! 강제 종료.")
+                    terminate_process_tree(p)
+
+                else:
+                    # 2-2. 크롤러 heartbeat 확인 (페이지 로드/저장 시마다 갱신됨)
+                    last_heartbeat, counters = progress.snapshot(state["progress"])
+                    if last_heartbeat > state["last_activity_time"]:
+                        state["last_activity_time"] = last_heartbeat
+
+                    # 2-3. 처리량 출력
+                    if current_time - state["last_report_time"] >= REPORT_INTERVAL:
+                        state["last_report_time"] = current_time
+                        print(f"📈 [{site_name}] {format_progress(counters, current_time - state['start_time'])}")
+
+                    # 2-4. 무응답 시간 체크
+                    idle_duration = current_time - state["last_activity_time"]
+                    if idle_duration > IDLE_TIMEOUT:
+                        print(f"⏰ [{site_name}] {IDLE_TIMEOUT/60:.1f}분 동안 진행 없음! (정체됨) -> 강제 종료.")
+                        terminate_process_tree(p)
+
+            if not p.is_alive():
+                p.join() # 좀비 프로세스 방지
+                del running[site_name]
+
+                _, counters = progress.snapshot(state["progress"])
+                summary = format_progress(counters, time.time() - state["start_time"])
+                if p.exitcode == 0:
+                    print(f"✅ [{site_name}] 작업 완료 - {summary}")
+                else:
+                    print(f"⚠️ [{site_name}] 작업 종료됨 (Exit Code: {p.exitcode}) - {summary}")
+
+        # 5초마다 검사
         time.sleep(5)
-        crawler_func = crawlers[site_name]
-        print(f"\n🚀 [{site_name}] 크롤링 시작... ({IDLE_TIMEOUT}초 무응답 시 종료)")
-        
-        p = multiprocessing.Process(
-            target=run_crawler_process, 
-            args=(crawler_func, searchs, start_date_obj, end_date_obj, stop_event)
-        )
-        
-        p.start()
-        
-        process_start_time = time.time()
-        last_activity_time = time.time()
-        
-        # 감시할 폴더 경로 찾기 (초기엔 없을 수 있음)
-        target_folder = None
-        
-        while p.is_alive():
-            current_time = time.time()
-            
-            # 1. 전체 시간 초과 체크 (안전장치)
-            if current_time - process_start_time > MAX_TOTAL_TIMEOUT:
-                print(f"🛑 [{site_name}] 전체 제한 시간({MAX_TOTAL_TIMEOUT}초) 초과! 강제 종료.")
-                p.terminate()
-                break
-
-            # 2. 폴더 찾기 (아직 안 만들어졌을 수 있으므로 반복 시도)
-            if target_folder is None:
-                target_folder = find_data_folder(site_name, target_date_str)
-            
-            # 3. 파일 변경 시간 확인 (Idle Check)
-            latest_file_time = get_latest_file_mtime(target_folder)
-            
-            # 만약 파일이 수정되었거나 새로 생겼으면 -> 활동 중! 시간 갱신
-            if latest_file_time > last_activity_time:
-                last_activity_time = latest_file_time
-                # print(f"   [{site_name}] 새 데이터 감지됨! 타이머 리셋.") 
-
-            # 4. 무응답 시간 체크
-            idle_duration = current_time - last_activity_time
-            if idle_duration > IDLE_TIMEOUT:
-                print(f"⏰ [{site_name}] {IDLE_TIMEOUT/60:.1f}분 동안 새 데이터 없음! (정체됨) -> 다음 사이트로 이동.")
-                p.terminate()
-                p.join()
-                break
-            
-            # 5초마다 검사
-            time.sleep(5)
-
-        p.join() # 좀비 프로세스 방지
-
-        if p.exitcode == 0:
-            print(f"✅ [{site_name}] 작업 완료")
-        else:
-            print(f"⚠️ [{site_name}] 작업 종료됨 (Exit Code: {p.exitcode})")
-
-    print("\n🎉 지정된 모든 사이트 크롤링 작업 종료")
\ No newline at end of file
+
+    print("\n🎉 지정된 모든 사이트 크롤링 작업 종료")
@@ -1,31 +1,178 @@
 import os
 import glob
+import queue
+import threading
 import pandas as pd
+import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 
 # 1. 프로젝트 루트 경로 계산 (어디서 실행하든 scripts 상위 폴더를 찾음)
 SCRIPT_PATH = os.path.abspath(__file__)
 PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(SCRIPT_PATH))
+sys.path.append(PROJECT_ROOT_DIR)
 
-def merge_daily_raw_csv(target_date, raw_data_dir=None, output_dir=None):
+from crawlers import raw_lake
+from processing.url_index import UrlIndex
+
+# [설정] 스트리밍 병합 시 동시에 읽는 CSV 파일 수
+MERGE_WORKERS = int(os.getenv("MERGE_WORKERS", "4"))
+# [설정] 한 번에 읽어 출력 파일에 쓰는 행 수 (메모리 사용량 ≈ (MERGE_WORKERS + MERGE_QUEUE_CHUNKS) x 이 행 수)
+MERGE_CHUNK_ROWS = int(os.getenv("MERGE_CHUNK_ROWS", "20000"))
+# [설정] 읽기 스레드가 먼저 읽어 둘 수 있는 청크 수 (기록이 밀리면 읽기 스레드가 대기)
+MERGE_QUEUE_CHUNKS = int(os.getenv("MERGE_QUEUE_CHUNKS", "8"))
+
+def platform_of(file):
+    """
+    파일 경로 -> 플랫폼(사이트 폴더명)
+    - .../data/raw/1.뽐뿌/251222/뽐뿌_검색어.csv -> 1.뽐뿌
+    - 구버전 구조(.../data/raw/1.뽐뿌/뽐뿌_251222.csv)면 파일 바로 위 폴더
+    """
+    platform = os.path.basename(os.path.dirname(os.path.dirname(file)))
+    if platform == 'raw':
+        platform = os.path.basename(os.path.dirname(file))
+    return platform
+
+def print_platform_counts(counts):
+    print("📊 플랫폼별 행 수")
+    for platform, count in sorted(counts.items()):
+        print(f"   {platform}: {count}건")
+
+def pre_lake_files(site, target_date, files, lake_dir):
+    """
+    파티션에 담겨 있지 않을 수 있는 CSV 파일 (CSV 내용은 읽지 않음)
+    - manifest가 있으면: 기록기가 행 수를 남기지 않은 파일
+    - manifest 도입 이전 파티션: 첫 Parquet 파일보다 먼저 수정된 파일
+    """
+    manifest = raw_lake.read_manifest(site, target_date, lake_dir)
+    if manifest is not None:
+        recorded = manifest.get("csv_rows", {})
+        return [file for file in files if os.path.basename(file) not in recorded]
+    started = raw_lake.first_write_time(site, target_date, lake_dir)
+    if started is None:
+        return list(files)
+    return [file for file in files if os.path.getmtime(file) < started]
+
+def choose_lake_sites(target_date, files_by_site, lake_dir=raw_lake.LAKE_DIR):
+    """
+    사이트별로 Parquet 파티션(site=<사이트>/date=<날짜>)을 쓸지 결정 (나머지 사이트는 CSV로 병합)
+    - 레이크 도입 이전 CSV가 있거나, 파티션 행 수가 manifest의 CSV 기록 행 수보다 적으면
+      (Parquet 기록 실패는 경고만 남기고 CSV에는 기록됨) 그 사이트는 CSV 사용
+    - 파티션 행 수는 Parquet 메타데이터, CSV 행 수는 manifest에서 읽으므로 CSV를 파싱하지 않음
+    """
+    try:
+        lake_counts = raw_lake.site_counts(target_date, lake_dir=lake_dir)
+    except Exception as e:
+        print(f"⚠️ Parquet 파티션 확인 실패, CSV로 병합합니다: {e}")
+        return set()
+
+    lake_sites = set()
+    for site, lake_rows in sorted(lake_counts.items()):
+        files = files_by_site.get(site, [])
+        try:
+            missing = pre_lake_files(site, target_date, files, lake_dir)
+        except OSError as e:
+            print(f"⚠️ site={site}: 파일 확인 실패 ({e}) -> CSV로 병합")
+            continue
+        if missing:
+            print(f"⚠️ site={site}: 파티션에 없는 CSV {len(missing)}개 -> CSV로 병합")
+            continue
+        manifest = raw_lake.read_manifest(site, target_date, lake_dir)
+        csv_rows = sum(manifest.get("csv_rows", {}).values()) if manifest else 0
+        if lake_rows >= csv_rows:
+            lake_sites.add(site)
+        else:
+            print(f"⚠️ site={site}: Parquet {lake_rows}건 < CSV {csv_rows}건 -> CSV로 병합")
+    return lake_sites
+
+def merge_daily_lake(target_date, lake_dir=raw_lake.LAKE_DIR, sites=None):
+    """
+    Parquet 파티션(data/lake/site=*/date=<target_date>)을 하나의 데이터셋으로 읽기
+    - sites: 이 사이트 파티션만 읽음
+    - pyarrow가 없거나 해당 날짜 파티션이 없으면 None (CSV 병합으로 진행)
+    """
+    try:
+        df = raw_lake.read_date(target_date, lake_dir=lake_dir, sites=sites)
+    except Exception as e:
+        print(f"⚠️ Parquet 읽기 실패, CSV로 병합합니다: {e}")
+        return None
+    if df is None:
+        return None
+
+    # CSV 병합과 동일하게 플랫폼 컬럼을 사이트 폴더명으로 표시
+    df["플랫폼"] = df.pop("site")
+    for platform, count in df["플랫폼"].value_counts(sort=False).items():
+        print(f"✅ 병합됨: site={platform} ({count}건, Parquet)")
+    return df
+
+class LakeReadError(Exception):
+    """스트리밍 병합 중 Parquet 파티션 읽기 실패 (CSV로 다시 병합)"""
+
+def iter_lake(target_date, lake_dir, sites):
+    """Parquet 파티션을 MERGE_CHUNK_ROWS 행씩 읽어 '플랫폼' 컬럼을 붙인 DataFrame으로 반환"""
+    try:
+        for df in raw_lake.iter_date(target_date, lake_dir=lake_dir, sites=sites, batch_size=MERGE_CHUNK_ROWS):
+            df["플랫폼"] = df.pop("site")
+            yield df
+    except Exception as e:
+        raise LakeReadError(e) from e
+
+def merge_daily_raw_csv(target_date, raw_data_dir=None, output_dir=None, lake_dir=None, stream=False, dedup=True):
+    """
+    날짜별 raw CSV(또는 Parquet 파티션)를 merged_raw_<날짜>.csv 하나로 병합
+    - 사이트마다 Parquet 파티션이 CSV 행을 모두 담고 있으면 Parquet, 아니면 그 사이트의 CSV를 읽음
+    - stream=True: 파일을 동시에 읽어 청크 단위로 바로 기록하고 DataFrame 대신 플랫폼별 행 수 dict 반환
+    - dedup=True: 정규화한 게시물 URL 기준으로 중복 행을 병합하면서 제거
+      (통계: merged_raw_<날짜>_dedup.json, 플랫폼/검색어별 입력 행 수와 제거한 중복 수)
+    """
     # 2. 경로가 안 들어오면 기본값 설정 (절대 경로)
     if raw_data_dir is None:
         raw_data_dir = os.path.join(PROJECT_ROOT_DIR, "data", "raw")
     if output_dir is None:
         output_dir = os.path.join(PROJECT_ROOT_DIR, "data", "merged")
+    if lake_dir is None:
+        lake_dir = raw_lake.LAKE_DIR
     
     os.makedirs(output_dir, exist_ok=True)
     output_path = os.path.join(output_dir, f"merged_raw_{target_date}.csv")
+    stats_path = os.path.join(output_dir, f"merged_raw_{target_date}_dedup.json")
+    url_index = UrlIndex() if dedup else None
 
     # [핵심 수정 1] 파일 찾는 패턴 변경
     # 수정 전: os.path.join(raw_data_dir, "*", f"*{target_date}*.csv")
     # 수정 후: raw_data_dir / 모든플랫폼(*) / 날짜폴더(target_date) / 모든csv(*)
     search_pattern = os.path.join(raw_data_dir, "*", target_date, "*.csv")
-    
     print(f"🔍 검색 패턴: {search_pattern}")
-    raw_files = glob.glob(search_pattern)
+    all_files = glob.glob(search_pattern)
+    files_by_site = {}
+    for file in all_files:
+        files_by_site.setdefault(platform_of(file), []).append(file)
+
+    # Parquet 파티션이 CSV 행을 모두 담고 있는 사이트만 CSV를 다시 파싱하지 않고 Parquet 사용
+    lake_sites = choose_lake_sites(target_date, files_by_site, lake_dir)
+
+    if stream:
+        if not all_files and not lake_sites:
+            print(f"❌ 대상 파일 없음: {search_pattern}")
+            return
+        raw_files = [file for file in all_files if platform_of(file) not in lake_sites]
+        lake_frames = iter_lake(target_date, lake_dir, sorted(lake_sites)) if lake_sites else ()
+        try:
+            counts = stream_raw_csv(raw_files, output_path, url_index=url_index, lake_frames=lake_frames)
+        except LakeReadError as e:
+            print(f"⚠️ Parquet 읽기 실패, CSV로 다시 병합합니다: {e}")
+            url_index = UrlIndex() if dedup else None
+            counts = stream_raw_csv(all_files, output_path, url_index=url_index)
+        if url_index is not None:
+            url_index.report(stats_path)
+        return counts
+
+    lake_df = merge_daily_lake(target_date, lake_dir, sorted(lake_sites)) if lake_sites else None
+    if lake_df is None:
+        lake_sites = set()
+    raw_files = [file for file in all_files if platform_of(file) not in lake_sites]
 
-    if not raw_files:
+    if not raw_files and lake_df is None:
         print(f"❌ 대상 파일 없음: {search_pattern}")
         # 혹시 구버전 구조(플랫폼 폴더 안에 바로 파일)일 수도 있으니 예비 검색 (안전장치)
         fallback_pattern = os.path.join(raw_data_dir, "*", f"*{target_date}*.csv")
@@ -33,42 +180,163 @@ def merge_daily_raw_csv(target_date, raw_data_dir=None, output_dir=None):
              print(f"⚠️ 경고: 구버전 폴더 구조의 파일이 발견되었습니다. 크롤러가 업데이트되었는지 확인하세요.")
         return
 
-    merged_df = pd.DataFrame()
+    frames = []
+    counts = {}
+    if lake_df is not None:
+        if url_index is not None:
+            lake_df = url_index.filter(lake_df)
+        frames.append(lake_df)
+        counts.update(lake_df["플랫폼"].value_counts(sort=False).to_dict())
     for file in raw_files:
         try:
-            # [핵심 수정 2] 플랫폼 이름 추출 방식 변경
-            # 파일 경로: .../data/raw/1.뽐뿌/251222/뽐뿌_검색어.csv
-            
-            # dirname(file) -> .../data/raw/1.뽐뿌/251222
-            # dirname(dirname(file)) -> .../data/raw/1.뽐뿌
-            # basename(...) -> 1.뽐뿌
-            platform = os.path.basename(os.path.dirname(os.path.dirname(file)))
-            
-            # (만약 구버전 구조라면 예외 처리)
-            if platform == 'raw': 
-                platform = os.path.basename(os.path.dirname(file))
-
+            platform = platform_of(file)
             df = pd.read_csv(file, encoding="utf-8")
             df["플랫폼"] = platform # 데이터에 출처 표시
+            if url_index is not None:
+                df = url_index.filter(df)
             
-            merged_df = pd.concat([merged_df, df], ignore_index=True)
+            # 파일마다 concat하면 누적 행을 매번 다시 복사하므로 모아서 한 번에 합침
+            frames.append(df)
+            counts[platform] = counts.get(platform, 0) + len(df)
             print(f"✅ 병합됨: {os.path.basename(file)} (플랫폼: {platform})")
             
         except Exception as e:
             print(f"❌ 병합 실패: {file} ({e})")
     
+    merged_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if url_index is not None:
+        url_index.report(stats_path)
     if not merged_df.empty:
         merged_df.to_csv(output_path, index=False, encoding='utf-8-sig') # 엑셀 깨짐 방지 utf-8-sig
         print(f"📦 저장 완료: {output_path}")
         print(f"   (총 {len(merged_df)}개 데이터)")
+        print_platform_counts(counts)
     else:
         print("결과 파일이 비어있어 저장하지 않습니다.")
         
     return merged_df
 
+def _read_columns(raw_files, columns=()):
+    """모든 파일의 헤더만 읽어 출력 컬럼 순서 결정 (pd.concat과 같은 합집합, 처음 나온 순서)"""
+    columns = list(columns)
+    readable = []
+    for file in raw_files:
+        try:
+            header = pd.read_csv(file, encoding="utf-8", nrows=0).columns
+        except Exception as e:
+            print(f"❌ 병합 실패: {file} ({e})")
+            continue
+        columns += [c for c in header if c not in columns]
+        readable.append(file)
+    if "플랫폼" not in columns:
+        columns.append("플랫폼")
+    return columns, readable
+
+def _put(chunks, item, stop_event):
+    # 기록이 중단되면 큐가 찬 채로 남으므로 주기적으로 중단 여부를 확인
+    while not stop_event.is_set():
+        try:
+            chunks.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _read_chunks(file, columns, chunks, stop_event):
+    """읽기 스레드: 파일을 청크 단위로 읽어 큐에 넣음 (끝나면 (file, None), 실패하면 (file, 예외))"""
+    platform = platform_of(file)
+    try:
+        for chunk in pd.read_csv(file, encoding="utf-8", chunksize=MERGE_CHUNK_ROWS):
+            chunk["플랫폼"] = platform
+            if not _put(chunks, (file, chunk.reindex(columns=columns)), stop_event):
+                return
+        _put(chunks, (file, None), stop_event)
+    except Exception as e:
+        _put(chunks, (file, e), stop_event)
+
+def stream_raw_csv(raw_files, output_path, workers=MERGE_WORKERS, url_index=None, lake_frames=()):
+    """
+    검색어별 CSV들을 스레드로 동시에 읽어 청크 단위로 출력 파일에 바로 기록 (전체를 메모리에 모으지 않음)
+    - 행 순서는 파일 간에 섞일 수 있음 (같은 파일 안의 순서는 유지)
+    - 임시 파일에 쓴 뒤 교체하므로 중간에 실패해도 이전 병합 결과가 반쯤 덮이지 않음
+    - url_index: 청크를 기록하기 전에 이미 나온 URL의 행을 제거 (UrlIndex)
+    - lake_frames: CSV보다 먼저 기록할 Parquet 파티션 DataFrame들 ('플랫폼' 컬럼 포함, iter_lake의 배치)
+    - 반환: 플랫폼별 행 수 {플랫폼: 행 수}
+    """
+    columns, raw_files = _read_columns(raw_files, raw_lake.COLUMNS if lake_frames else ())
+    counts = {}
+    if not raw_files and not lake_frames:
+        print("결과 파일이 비어있어 저장하지 않습니다.")
+        return counts
+
+    def write(f, chunk, header):
+        """중복 제거 후 기록하고 기록한 행 반환"""
+        if url_index is not None:
+            chunk = url_index.filter(chunk)
+        if not chunk.empty:
+            chunk.to_csv(f, index=False, header=header)
+        return chunk
+
+    chunks = queue.Queue(maxsize=MERGE_QUEUE_CHUNKS)
+    stop_event = threading.Event()
+    file_rows = {}
+    remaining = len(raw_files)
+    tmp_path = f"{output_path}.tmp"
+    executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(raw_files))))
+    try:
+        for file in raw_files:
+            executor.submit(_read_chunks, file, columns, chunks, stop_event)
+
+        # utf-8-sig 스트림은 BOM을 파일 맨 앞에 한 번만 씀 (엑셀 깨짐 방지)
+        with open(tmp_path, 'w', encoding='utf-8-sig', newline='') as f:
+            header = True
+            # Parquet 파티션 먼저 (먼저 기록된 행이 중복 제거에서 남음)
+            lake_rows = {}
+            for lake_df in lake_frames:
+                written = write(f, lake_df.reindex(columns=columns), header)
+                header = header and written.empty
+                for platform, n in written["플랫폼"].value_counts(sort=False).items():
+                    counts[platform] = counts.get(platform, 0) + n
+                for platform, n in lake_df["플랫폼"].value_counts(sort=False).items():
+                    lake_rows[platform] = lake_rows.get(platform, 0) + n
+            for platform, n in lake_rows.items():
+                print(f"✅ 병합됨: site={platform} ({n}건, Parquet)")
+            while remaining:
+                file, chunk = chunks.get()
+                if isinstance(chunk, pd.DataFrame):
+                    written = len(write(f, chunk, header))
+                    header = header and not written
+                    file_rows[file] = file_rows.get(file, 0) + written
+                    platform = platform_of(file)
+                    counts[platform] = counts.get(platform, 0) + written
+                    continue
+                remaining -= 1
+                if chunk is None:
+                    print(f"✅ 병합됨: {os.path.basename(file)} (플랫폼: {platform_of(file)}, {file_rows.get(file, 0)}건)")
+                elif file_rows.get(file):
+                    print(f"❌ 병합 실패: {file} ({chunk}) - 앞부분 {file_rows[file]}건만 병합됨")
+                else:
+                    print(f"❌ 병합 실패: {file} ({chunk})")
+    finally:
+        # 기록 중 오류가 나도 읽기 스레드가 큐 앞에서 멈춰 있지 않도록 중단 신호 후 종료 대기
+        stop_event.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    total = sum(counts.values())
+    if not total:
+        os.remove(tmp_path)
+        print("결과 파일이 비어있어 저장하지 않습니다.")
+        return counts
+    os.replace(tmp_path, output_path)
+    print(f"📦 저장 완료 (스트리밍): {output_path}")
+    print(f"   (총 {total}개 데이터)")
+    print_platform_counts(counts)
+    return counts
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--date", type=str, required=True, help="날짜 (형식: yymmdd)")
+    parser.add_argument("--stream", action="store_true", help="파일을 동시에 읽어 청크 단위로 기록 (메모리를 청크 크기만큼만 사용)")
+    parser.add_argument("--keep_duplicates", action="store_true", help="게시물 URL 중복 제거를 하지 않음")
     args = parser.parse_args()
-    merge_daily_raw_csv(args.date)
\ No newline at end of file
+    merge_daily_raw_csv(args.date, stream=args.stream, dedup=not args.keep_duplicates)
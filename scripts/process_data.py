@@ -3,18 +3,34 @@ import re
 import pandas as pd
 from datetime import datetime
 import argparse
-from processing.process_file import filter_untrusted_posts, filter_da
+from processing.process_file import filter_untrusted_posts, post_filter_mask
+from processing.keyword_match import KeywordMatcher
+from crawlers.dates import ISO_FORMAT
 
 # 1. 프로젝트 루트 절대 경로 설정
 SCRIPT_PATH = os.path.abspath(__file__)
 PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(SCRIPT_PATH))
 
+def parse_post_dates(series):
+    """
+    게시물 등록일자 -> datetime
+    - 크롤러가 저장한 ISO 형식(YYYY-MM-DDTHH:MM:SS)은 고정 포맷으로 한 번에 변환
+    - 나머지(형식 통일 이전 수집분)만 format='mixed'로 행마다 형식을 추론
+    """
+    parsed = pd.to_datetime(series, errors='coerce', format=ISO_FORMAT)
+    rest = parsed.isna() & series.notna()
+    if rest.any():
+        parsed[rest] = pd.to_datetime(series[rest], errors='coerce', format='mixed')
+    return parsed
+
 def process_data(
     input_csv_path,
     output_excel_path,
     search_excel_path,
     target_year,
-    target_month
+    target_month,
+    untrusted_excel_path=None,
+    trusted_excel_path=None
 ):
     # 출력 폴더 자동 생성
     os.makedirs(os.path.dirname(output_excel_path), exist_ok=True)
@@ -22,6 +38,8 @@ def process_data(
     print(f"📂 설정 파일 로드: {search_excel_path}")
     pd_search = pd.read_excel(search_excel_path, sheet_name='검색어 목록')
     searchs = pd_search['검색어명']
+    # 검색어 오토마톤은 한 번만 만들고 게시물마다 제목/본문을 한 번씩만 훑음
+    matcher = KeywordMatcher(searchs)
 
     print(f"📂 데이터 로드: {input_csv_path}")
     try:
@@ -33,35 +51,24 @@ def process_data(
         print(f"❌ 파일을 찾을 수 없습니다: {input_csv_path}")
         return None
 
-    # 👇 [수정] format='mixed'를 추가하여 다양한 날짜 형식을 모두 인식하도록 변경
-    df['게시물 등록일자'] = pd.to_datetime(df['게시물 등록일자'], errors='coerce', format='mixed')
+    # ISO 형식은 고정 포맷으로 빠르게, 이전 형식만 format='mixed'로 인식
+    df['게시물 등록일자'] = parse_post_dates(df['게시물 등록일자'])
     
     df["게시물 제목"] = df["게시물 제목"].fillna("").astype(str)
     df["게시물 내용"] = df["게시물 내용"].fillna("").astype(str)
 
     # 필터링 로직
-    df1 = df[
-        (df.apply(
-            lambda x: any(s.lower() in str(x['게시물 제목']).lower() or s.lower() in str(x['게시물 내용']).lower() for s in searchs),
-            axis=1
-        )) &
-        (~df['게시물 내용'].str.contains('신춘문예', na=False, case=False)) &
-        (~df['게시물 제목'].str.contains('신춘문예', na=False, case=False)) &
-        (~df['계정명'].fillna('').str.contains('뽐뿌뉴스', case=False))
-    ]
-    
-    # 날짜 필터링
-    df2 = df1[
-        (df1['게시물 등록일자'].dt.year == target_year) &
-        (df1['게시물 등록일자'].dt.month == target_month)
-    ]
-    df3 = df2.drop_duplicates(subset=['게시물 URL'])
-
-    # 비신탁사 필터링 (현재는 통과)
-    df_filtered = df3 
+    has_keyword = matcher.contains_columns(df['게시물 제목'], df['게시물 내용'])
+    print(f"🔎 검색어 매칭: {int(has_keyword.sum())}/{len(df)}개 ({matcher.backend})")
+    # 제외 문구 / 날짜 / URL 중복 / DA('~다.') 필터를 마스크 하나로 (process_file.py에 정의됨)
+    df_filtered = df[post_filter_mask(df, has_keyword, target_year, target_month)]
 
-    # DA 필터링 (process_file.py에 정의됨)
-    filtered_df = filter_da(df_filtered)
+    # 비신탁사 필터링 (두 엑셀이 모두 지정된 경우에만, 없으면 통과)
+    if untrusted_excel_path and trusted_excel_path:
+        filtered_df = filter_untrusted_posts(df_filtered, untrusted_excel_path, trusted_excel_path)
+        print(f"🚫 비신탁사 필터링: {len(df_filtered)}개 -> {len(filtered_df)}개")
+    else:
+        filtered_df = df_filtered
     
     filtered_df.to_excel(output_excel_path, index=False)
     print(f"✅ 전처리 완료: {output_excel_path}")
@@ -77,6 +84,8 @@ if __name__ == "__main__":
     parser.add_argument("--search_excel", required=True)
     parser.add_argument("--year", required=True, type=int)
     parser.add_argument("--month", required=True, type=int)
+    parser.add_argument("--untrusted_excel", default=None, help="비신탁사 저작권 문구/도메인 엑셀 (지정 시 비신탁사 필터링)")
+    parser.add_argument("--trusted_excel", default=None, help="매체사(신탁사) 도메인 엑셀")
 
     args = parser.parse_args()
 
@@ -91,5 +100,7 @@ if __name__ == "__main__":
         output_excel_path=resolve_path(args.output_excel),
         search_excel_path=resolve_path(args.search_excel),
         target_year=args.year,
-        target_month=args.month
+        target_month=args.month,
+        untrusted_excel_path=resolve_path(args.untrusted_excel) if args.untrusted_excel else None,
+        trusted_excel_path=resolve_path(args.trusted_excel) if args.trusted_excel else None
     )
\ No newline at end of file
@@ -0,0 +1,207 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from datetime import date
+
+from selenium.common.exceptions import WebDriverException
+
+# 프로젝트 루트 경로 설정
+SCRIPT_PATH = os.path.abspath(__file__)
+PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(SCRIPT_PATH))
+sys.path.append(PROJECT_ROOT_DIR)
+
+# 파서 백엔드는 import 시 결정되므로 CRAWL_HTML_PARSER=bs4|lxml 환경 변수로 선택
+from crawlers import csv_writer
+from crawlers import fixtures
+from crawlers import html_parser
+from crawlers import metrics
+from crawlers.http_fetch import set_http_first
+from crawlers.site_engine import crawl_detail
+from crawlers.pp_crawler import pp_crw
+from crawlers.clien_crawler import CLIEN
+from crawlers.inven_crawler import inven_crw
+from crawlers.todayhumor_crawler import TODAYHUMOR
+from crawlers.paan_crawler import pann_crw
+from crawlers.instiz_crawler import instiz_crw
+from crawlers.bobaedream_crawler import bobaedream_crw
+from crawlers.rw_crawler import rw_crw
+from crawlers.arca_crawler import arca_crw
+from crawlers.ilbe_crawler import ILBE
+from crawlers.humoruniv_crawler import humoruniv_crw
+from crawlers.cook82_crawler import COOK82
+from crawlers.orbi_crawler import orbi_crw
+from crawlers.dogdrip_crawler import dogdrip_crw
+from crawlers.dp_crawler import dp_crw
+from crawlers.dongsaroma_crawler import dongsaroma_crw
+from crawlers.scline_crawler import scline_crw
+from crawlers.fomos_crawler import fomos_crw
+from crawlers.jjang0u_crawler import jjang0u_crw
+from crawlers.blind_crawler import blind_crw
+from crawlers.mlb_crawler import mlb_crw
+from crawlers.dc_crawler import dc_crw
+from crawlers.fm_crawler import fm_crw
+from crawlers.dq_crawler import dq_crw
+
+# 리플레이용 검색어/날짜 폴더 (더쿠는 검색어가 제목/본문에 있어야 저장하므로 빈 문자열 = 모든 게시물 일치)
+REPLAY_SEARCH = ''
+REPLAY_TARGET_DATE = 'replay'
+
+
+def _engine(spec):
+    def crawl(wd, url, search, target_date):
+        return crawl_detail(wd, url, spec, search, target_date)
+    return crawl
+
+
+def _instiz(wd, url, search, target_date):
+    # 목록에서 넘겨받던 작성일 대신 오늘 날짜
+    return instiz_crw(wd, url, search, date.today(), target_date)
+
+
+def _dq(wd, url, search, target_date):
+    return dq_crw(wd, url, [search], target_date)
+
+
+# 사이트 -> (상세 수집 함수 (wd, url, search, target_date), 목록 셀렉터 묶음 이름 또는 None(BeautifulSoup 파싱만))
+SITES = {
+    "뽐뿌": (pp_crw, None),
+    "클리앙": (_engine(CLIEN), '클리앙_list'),
+    "인벤": (inven_crw, None),
+    "오늘의유머": (_engine(TODAYHUMOR), '오늘의유머_list'),
+    "네이트판": (pann_crw, None),
+    "인스티즈": (_instiz, None),
+    "보배드림": (bobaedream_crw, None),
+    "루리웹": (rw_crw, None),
+    "아카라이브": (arca_crw, None),
+    "일간베스트": (_engine(ILBE), '일간베스트_list'),
+    "웃긴대학": (humoruniv_crw, None),
+    "82쿡": (_engine(COOK82), '82쿡_list'),
+    "오르비": (orbi_crw, None),
+    "개드립": (dogdrip_crw, None),
+    "DVD프라임": (dp_crw, None),
+    "동사로마닷컴": (dongsaroma_crw, None),
+    "사커라인": (scline_crw, None),
+    "포모스": (fomos_crw, None),
+    "짱공유닷컴": (jjang0u_crw, None),
+    "블라인드": (blind_crw, None),
+    "엠엘비파크": (mlb_crw, None),
+    "디시인사이드": (dc_crw, 'dc_list'),
+    "에펨코리아": (fm_crw, None),
+    "더쿠": (_dq, 'dq_list'),
+}
+
+
+def _rows(result, frames):
+    """상세 수집 함수 1회 결과 행 (저장된 DataFrame 또는 반환한 dict)"""
+    rows = [row for df in frames for row in df.to_dict('records')]
+    if not rows and isinstance(result, dict):
+        rows = [result]
+    return rows
+
+
+def replay_details(crawl_func, pages, writer, repeat):
+    """녹화한 상세 페이지마다 crawl_func 실행 -> 성공 수, 빈 제목/본문 수, 전체 시간, 파싱 시간"""
+    success = empty = 0
+    parse_before = metrics.phase_seconds('parse')
+    start = time.perf_counter()
+    for _ in range(repeat):
+        success = empty = 0
+        for url in pages:
+            wd = fixtures.ReplayDriver(pages)
+            try:
+                result = crawl_func(wd, url, REPLAY_SEARCH, REPLAY_TARGET_DATE)
+            except WebDriverException as e:
+                # 실제 수집에서는 DetailFetcher가 처리하는 오류 (녹화에 없는 요소/페이지) -> 실패로 집계
+                logging.warning(f"리플레이 실패: {url} ({e})")
+                writer.take()
+                continue
+            rows = _rows(result, writer.take())
+            if not rows:
+                continue
+            success += 1
+            if any(not str(row.get("게시물 제목") or '').strip() or not str(row.get("게시물 내용") or '').strip()
+                   for row in rows):
+                empty += 1
+    return success, empty, time.perf_counter() - start, metrics.phase_seconds('parse') - parse_before
+
+
+def replay_lists(selector_name, pages, repeat):
+    """녹화한 목록 페이지 파싱 시간 (셀렉터 묶음이 있으면 모든 셀렉터까지 실행)"""
+    selector_set = html_parser.REGISTRY.get(selector_name) if selector_name else None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages.values():
+            if selector_set is None:
+                html_parser.parse_soup(html)
+                continue
+            page = selector_set.parse(html)
+            for key in selector_set.css:
+                page.select(key)
+    return time.perf_counter() - start
+
+
+def replay(fixture_dir, site_names, repeat):
+    writer = csv_writer.capture()
+    results = []
+    for site_name in site_names:
+        if site_name not in SITES:
+            print(f"⚠️ {site_name}: 리플레이할 수집 함수가 등록되어 있지 않음")
+            continue
+        crawl_func, selector_name = SITES[site_name]
+        details = fixtures.load(site_name, 'detail', fixture_dir)
+        lists = fixtures.load(site_name, 'list', fixture_dir)
+        result = {"site": site_name, "detail_pages": len(details), "list_pages": len(lists)}
+
+        if details:
+            success, empty, wall, parse = replay_details(crawl_func, details, writer, repeat)
+            n = len(details) * repeat
+            result.update({
+                "success": success,
+                "success_rate": round(success / len(details), 4),
+                "empty_fields": empty,
+                "posts_per_sec": round(n / wall, 2) if wall else None,
+                "parse_posts_per_sec": round(n / parse, 2) if parse else None,
+            })
+            print(f"📄 {site_name}: 상세 {len(details)}개 x {repeat}회 | 성공 {success} ({success / len(details):.0%}), "
+                  f"빈 제목/본문 {empty} | {result['posts_per_sec']} 게시물/초 "
+                  f"(파싱만 {result['parse_posts_per_sec']} 게시물/초)")
+        if lists:
+            wall = replay_lists(selector_name, lists, repeat)
+            result["list_pages_per_sec"] = round(len(lists) * repeat / wall, 2) if wall else None
+            print(f"   목록 {len(lists)}개: {result['list_pages_per_sec']} 페이지/초 "
+                  f"({selector_name or 'BeautifulSoup'})")
+        if not details and not lists:
+            print(f"⚠️ {site_name}: 녹화된 페이지 없음")
+        results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="녹화한 HTML로 사이트별 상세 수집 함수를 네트워크 없이 실행")
+    parser.add_argument("--fixture_dir", type=str, default=fixtures.FIXTURE_DIR, help="녹화 페이지 폴더 (CRAWL_RECORD_FIXTURES=1로 크롤링하면 생성)")
+    parser.add_argument("--site", type=str, default="all", help="리플레이할 사이트 (콤마로 구분, 기본: 녹화된 모든 사이트)")
+    parser.add_argument("--repeat", type=int, default=1, help="페이지당 반복 횟수")
+    parser.add_argument("--min_success", type=float, default=0.0, help="사이트별 성공률이 이보다 낮으면 종료 코드 1 (CI용)")
+    parser.add_argument("--output", type=str, default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    # 수집 함수의 로그는 화면에 찍지 않음 (오류만)
+    logging.basicConfig(level=logging.ERROR, format='%(levelname)s - %(message)s')
+    set_http_first(False)
+
+    site_names = fixtures.sites(args.fixture_dir) if args.site == "all" else [s.strip() for s in args.site.split(',')]
+    print(f"🔍 녹화 페이지: {args.fixture_dir} (파서: {html_parser.BACKEND})")
+    results = replay(args.fixture_dir, site_names, max(1, args.repeat))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"backend": html_parser.BACKEND, "sites": results}, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.output}")
+
+    failed = [r["site"] for r in results if "success_rate" in r and r["success_rate"] < args.min_success]
+    if failed:
+        print(f"❌ 성공률 {args.min_success:.0%} 미만: {', '.join(failed)}")
+        sys.exit(1)